@@ -0,0 +1,221 @@
+"""
+Throughput and tail latency of the job read endpoints: WSGI vs ASGI.
+
+Starts the project under gunicorn twice, as a threaded WSGI server and with
+uvicorn workers over ASGI, then drives the job list, job detail and statistics
+endpoints at increasing concurrency with keep-alive connections:
+
+* ``wsgi``       the DRF views (``/api/...``) behind ``jobboard.wsgi``
+* ``asgi-sync``  the same DRF views behind ``jobboard.asgi``
+* ``asgi-async`` the async views (``/api/async/...``) behind ``jobboard.asgi``
+
+Usage (from the directory containing manage.py, with the database and Redis
+the settings point at running):
+
+    python benchmarks/async_vs_wsgi.py --concurrency 1,8,32,128 --duration 10
+    python benchmarks/async_vs_wsgi.py --bypass-cache --json results.json
+
+``--bypass-cache`` adds a unique query parameter to list requests so every
+request reaches the database instead of the anonymous list cache.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.parse import urlsplit
+
+
+SCENARIOS = {
+    'wsgi': ('jobboard.wsgi:application', [], '/api'),
+    'asgi-sync': ('jobboard.asgi:application', ['-k', 'uvicorn.workers.UvicornWorker'], '/api'),
+    'asgi-async': ('jobboard.asgi:application', ['-k', 'uvicorn.workers.UvicornWorker'], '/api/async'),
+}
+
+
+def start_server(app, extra_args, port, workers, threads):
+    command = [
+        sys.executable, '-m', 'gunicorn', app,
+        '--bind', f'127.0.0.1:{port}',
+        '--workers', str(workers),
+        '--threads', str(threads),
+        '--log-level', 'warning',
+    ] + extra_args
+    env = dict(os.environ, DEBUG='False')
+    process = subprocess.Popen(command, env=env)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/statistics/', timeout=1)
+            return process
+        except OSError:
+            if process.poll() is not None:
+                raise SystemExit(f'Server for {app} exited with code {process.returncode}')
+            time.sleep(0.2)
+    process.kill()
+    raise SystemExit(f'Server for {app} did not start within 30 seconds')
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+class Connection:
+    """Minimal keep-alive HTTP/1.1 client, so the load generator adds little overhead"""
+
+    def __init__(self, host, port):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def get(self, path):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            f'GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n\r\n'.encode()
+        )
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, value = line.decode('latin-1').split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+        if 'content-length' in headers:
+            await self.reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding') == 'chunked':
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        if headers.get('connection', '').lower() == 'close':
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run_level(base_url, paths, concurrency, duration):
+    """Hammer ``paths`` round-robin with ``concurrency`` clients for ``duration`` seconds"""
+    parts = urlsplit(base_url)
+    latencies, errors = [], 0
+    counter = itertools.count()
+    deadline = time.monotonic() + duration
+
+    async def client():
+        nonlocal errors
+        connection = Connection(parts.hostname, parts.port)
+        try:
+            while time.monotonic() < deadline:
+                n = next(counter)
+                path = paths[n % len(paths)].format(n=n)
+                started = time.perf_counter()
+                try:
+                    status = await connection.get(path)
+                except (OSError, ValueError, asyncio.IncompleteReadError):
+                    connection.close()
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors += 1
+        finally:
+            connection.close()
+
+    started = time.monotonic()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.monotonic() - started
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+    }
+
+
+def first_job_slug():
+    """Slug of the newest active job, read straight from the database"""
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobboard.settings')
+    import django
+    django.setup()
+    from jobs.models import Job
+
+    slug = Job.objects.filter(status='active').values_list('slug', flat=True).first()
+    if slug is None:
+        raise SystemExit('No active jobs to benchmark; load some data first')
+    return slug
+
+
+def scenario_paths(prefix, slug, bypass_cache):
+    list_path = f'{prefix}/jobs/?_bench={{n}}' if bypass_cache else f'{prefix}/jobs/'
+    return [list_path, f'{prefix}/jobs/{slug}/', f'{prefix}/statistics/']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', default='1,8,32,128', help='Comma-separated client counts')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per concurrency level')
+    parser.add_argument('--workers', type=int, default=2, help='Server worker processes')
+    parser.add_argument('--threads', type=int, default=8, help='Threads per WSGI worker')
+    parser.add_argument('--port', type=int, default=8700, help='First port to bind servers to')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help='Comma-separated scenarios to run')
+    parser.add_argument('--bypass-cache', action='store_true', help='Make list requests miss the list cache')
+    parser.add_argument('--json', help='Also write the results to this file')
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    slug = first_job_slug()
+    results = []
+    for offset, name in enumerate(args.scenarios.split(',')):
+        app, extra_args, prefix = SCENARIOS[name]
+        port = args.port + offset
+        base_url = f'http://127.0.0.1:{port}'
+        process = start_server(app, extra_args, port, args.workers, args.threads)
+        try:
+            paths = scenario_paths(prefix, slug, args.bypass_cache)
+            asyncio.run(run_level(base_url, paths, min(levels), 1.0))  # Warm up
+            for level in levels:
+                result = {'scenario': name, **asyncio.run(run_level(base_url, paths, level, args.duration))}
+                results.append(result)
+                print(
+                    f"{name:<11} c={level:<4} {result['throughput']:>8} req/s  "
+                    f"p50 {result['p50_ms']} ms  p99 {result['p99_ms']} ms  errors {result['errors']}",
+                    flush=True,
+                )
+        finally:
+            stop_server(process)
+
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump(results, output, indent=2)
+
+
+if __name__ == '__main__':
+    main()
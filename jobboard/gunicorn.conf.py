@@ -0,0 +1,25 @@
+"""
+gunicorn settings picked up from the working directory.
+
+Every worker writes its metrics to files in ``PROMETHEUS_MULTIPROC_DIR`` (see
+``jobs.metrics``). The variable is only set here, for the server processes,
+so management commands keep their metrics in memory. The master empties the
+directory when it starts, so counters from an earlier run are not merged in,
+and marks workers dead when they exit.
+"""
+import os
+import shutil
+
+
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/prometheus_multiproc')
+
+
+def on_starting(server):
+    directory = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobboard.settings')
 
 application = get_asgi_application()
+
+# Load the serialized reference data before the first request (see jobs.refdata)
+from jobs.refdata import warm_reference_data  # noqa: E402
+
+warm_reference_data()
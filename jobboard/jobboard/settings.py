@@ -39,6 +39,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'drf_yasg',
@@ -47,6 +48,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'jobs.middleware.RequestInstrumentationMiddleware',  # First, so it times everything below
+    'jobs.middleware.ReplicaRoutingMiddleware',  # Only active when DB_REPLICA_HOSTS is set
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -91,6 +94,22 @@ DATABASES = {
     }
 }
 
+# Read replicas of the default database, one alias per host (jobs.routers)
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    DATABASE_REPLICAS.append(f'replica_{index}')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'PORT': os.environ.get('DB_REPLICA_PORT', DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['jobs.routers.ReplicaRouter']
+
+# Seconds a client reads from the primary after writing; must exceed the replication lag
+PRIMARY_STICKINESS_SECONDS = int(os.environ.get('PRIMARY_STICKINESS_SECONDS', '5'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -142,6 +161,10 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'jobs.instrumentation.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -216,12 +239,71 @@ SWAGGER_SETTINGS = {
 }
 
 # Cache settings
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1')
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+        'BACKEND': 'jobs.metrics.InstrumentedRedisCache',  # RedisCache counting hits and misses
+        'LOCATION': REDIS_URL,
     }
 }
 
 # Cache timeout (in seconds)
 CACHE_TTL = 60 * 15  # 15 minutes
+
+# Job detail payloads are cached per slug and invalidated by signals
+JOB_DETAIL_CACHE_TTL = CACHE_TTL
+
+# Anonymous job list pages are cached per canonical query string and jobs generation
+JOB_LIST_CACHE_TTL = 60 * 5  # 5 minutes
+
+# Bulk job creation: items accepted per request and jobs inserted per transaction
+JOB_BULK_MAX_ITEMS = 5000
+JOB_BULK_CHUNK_SIZE = 500
+
+# Facet counts on the job list are cached per normalized filter set
+FACETS_CACHE_TTL = 60 * 5  # 5 minutes
+
+# Search suggestions (typeahead) settings
+SUGGEST_TIMEOUT_MS = int(os.environ.get('SUGGEST_TIMEOUT_MS', '100'))  # Total database budget per request
+SUGGEST_SIMILARITY_THRESHOLD = 0.3  # pg_trgm word similarity cut-off
+SUGGEST_CACHE_TTL = 60  # 1 minute
+
+# Job views are buffered in Redis and written by `manage.py flush_job_views`
+JOB_VIEW_BUFFER_URL = os.environ.get('JOB_VIEW_BUFFER_URL', REDIS_URL)
+JOB_VIEWER_SKETCH_RETENTION_DAYS = 400  # Daily unique-viewer HyperLogLog sketches
+
+# Email settings (job alert digests are sent by `manage.py send_job_alerts`)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_FILE_PATH = os.environ.get('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')  # For the file backend
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '25'))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'False').lower() == 'true'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Job Board <alerts@localhost>')
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000')  # Base of links in emails
+
+# Request instrumentation (jobs.middleware.RequestInstrumentationMiddleware)
+SERVER_TIMING_HEADER = os.environ.get('SERVER_TIMING_HEADER', 'True').lower() == 'true'
+SLOW_REQUEST_THRESHOLD_MS = int(os.environ.get('SLOW_REQUEST_THRESHOLD_MS', '500'))  # Logged to jobs.instrumentation
+
+# /metrics (jobs.metrics); set PROMETHEUS_MULTIPROC_DIR to aggregate across worker processes
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')  # Required as a Bearer token when set
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'jobs.instrumentation': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -20,6 +20,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from jobs.metrics import metrics_view
+
 # Swagger/OpenAPI configuration
 schema_view = get_schema_view(
     openapi.Info(
@@ -44,4 +46,7 @@ urlpatterns = [
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     path('api/swagger.json', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    
+    # Prometheus scrape endpoint
+    path('metrics', metrics_view, name='metrics'),
 ]
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jobboard.settings')
 
 application = get_wsgi_application()
+
+# Load the serialized reference data before the first request (see jobs.refdata)
+from jobs.refdata import warm_reference_data  # noqa: E402
+
+warm_reference_data()
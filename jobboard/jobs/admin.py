@@ -1,30 +1,40 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from .models import (
-    Category, Company, JobType, Job, Application, 
-    JobView, SavedJob, JobAlert
+    Category, Company, JobType, Tag, Job, Application, 
+    JobView, SavedJob, JobAlert, JobAlertDigest
 )
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ['name', 'description', 'created_at']
+    list_display = ['name', 'description', 'active_jobs_count', 'created_at']
     search_fields = ['name', 'description']
+    readonly_fields = ['active_jobs_count']
     ordering = ['name']
 
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
-    list_display = ['name', 'industry', 'location', 'size', 'created_at']
+    list_display = ['name', 'industry', 'location', 'size', 'active_jobs_count', 'created_at']
     search_fields = ['name', 'industry', 'location']
     list_filter = ['industry', 'size', 'created_at']
+    readonly_fields = ['active_jobs_count']
     ordering = ['name']
 
 
 @admin.register(JobType)
 class JobTypeAdmin(admin.ModelAdmin):
-    list_display = ['name', 'description']
+    list_display = ['name', 'description', 'active_jobs_count']
     search_fields = ['name', 'description']
+    readonly_fields = ['active_jobs_count']
+    ordering = ['name']
+
+
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ['name', 'created_at']
+    search_fields = ['name']
     ordering = ['name']
 
 
@@ -137,3 +147,12 @@ class JobAlertAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+
+@admin.register(JobAlertDigest)
+class JobAlertDigestAdmin(admin.ModelAdmin):
+    list_display = ['user', 'status', 'cutoff', 'created_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    search_fields = ['user__username', 'user__email']
+    readonly_fields = ['user', 'matches', 'cutoff', 'created_at', 'sent_at']
+    ordering = ['-created_at']
@@ -0,0 +1,446 @@
+"""
+Index advisor for the hot query shapes.
+
+Rather than rebuilding querysets by hand, every scenario calls the real view
+(``JobListView`` with ``JobFilter`` and ordering combinations,
+``ApplicationListCreateView`` as staff and as an applicant, ``job_statistics``)
+through a request factory and captures the SQL it executes, so the plans are
+those of production code against the current data. Each captured SELECT is run
+again under ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` and its plan tree is
+reduced to the scans, indexes and sorts it uses.
+
+The views run against a private local-memory cache (every lookup misses once,
+so nothing is served from Redis) inside a transaction that is rolled back.
+
+From the plans and the catalog the report derives:
+
+* sequential scans, with their filter and how many rows they threw away,
+* every index of the jobs tables with the scenarios that used it and its
+  ``pg_stat_user_indexes.idx_scan`` since the last statistics reset; indexes
+  that are neither unique nor used by any scenario nor scanned at all are
+  listed as unused,
+* suggested indexes for sequential scans over large tables: equality columns
+  first, then the sort key of the enclosing Sort, then one range column, made
+  partial on ``status = 'active'`` when the query pins it, and trigram GIN
+  indexes for ``LIKE '%...%'`` filters. Suggestions already covered by the
+  leading columns of an existing index are dropped.
+
+Scenario parameters (category, company, tag, ...) are picked from the data as
+the most common values, so the report is stable for a given dataset; with
+``timing=False`` it leaves out durations, buffer counts and scan statistics
+and can be diffed between runs.
+"""
+import re
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.db.models import Count, Max
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from .instrumentation import fingerprint
+from .models import Application, Job, JobTag
+
+
+# Tables smaller than this are expected to be read sequentially
+DEFAULT_MIN_ROWS = 1000
+
+PARTIAL_STATUS = 'active'
+
+PREDICATE = re.compile(
+    r"\(*(?:\w+\.)?(\w+)\)*(?:::[\w ]+)?\)*\s*(=|<>|>=|<=|>|<|~~\*?|!~~\*?)\s*(?:'([^']*)')?"
+)
+SORT_COLUMN = re.compile(r'^(?:(\w+)\.)?(\w+)(\s+DESC)?')
+
+
+@dataclass
+class Scenario:
+    """One view call whose queries are explained"""
+    name: str
+    url_name: str
+    params: dict = field(default_factory=dict)
+    user: object = None
+
+
+def common_value(queryset, column):
+    """Most frequent value of ``column`` in the queryset, or None"""
+    row = (
+        queryset.exclude(**{f'{column}__isnull': True})
+        .values(column).annotate(rows=Count('pk')).order_by('-rows', column).first()
+    )
+    return row[column] if row else None
+
+
+def build_scenarios():
+    """The view calls to explain, with filter values picked from the current data"""
+    active = Job.objects.filter(status='active')
+    if not active.exists():
+        return []
+
+    category = common_value(active, 'category')
+    company = common_value(active, 'company')
+    job_type = common_value(active, 'job_type')
+    level = common_value(active, 'experience_level')
+    location = common_value(active, 'location')
+    tag = common_value(JobTag.objects.filter(job__status='active'), 'tag__name')
+    title = active.order_by('pk').values_list('title', flat=True).first()
+    latest = active.aggregate(latest=Max('created_at'))['latest']
+    pages = max(1, active.count() // settings.REST_FRAMEWORK.get('PAGE_SIZE', 20))
+
+    scenarios = [
+        Scenario('job-list', 'job-list'),
+        Scenario('job-list:deep-page', 'job-list', {'page': min(50, pages)}),
+        Scenario('job-list:ordering=-salary_min', 'job-list', {'ordering': '-salary_min'}),
+        Scenario('job-list:ordering=-views_count', 'job-list', {'ordering': '-views_count'}),
+        Scenario('job-list:ordering=title', 'job-list', {'ordering': 'title'}),
+        Scenario('job-filter:category', 'job-list', {'category': category}),
+        Scenario('job-filter:company', 'job-list', {'company': company}),
+        Scenario('job-filter:job_type', 'job-list', {'job_type': job_type}),
+        Scenario('job-filter:is_remote', 'job-list', {'is_remote': 'true'}),
+        Scenario('job-filter:experience_level', 'job-list', {'experience_level': level}),
+        Scenario('job-filter:location', 'job-list', {'location': location}),
+        Scenario('job-filter:salary', 'job-list', {'salary_min': 50000, 'salary_max': 150000}),
+        Scenario('job-filter:created_after', 'job-list', {
+            'created_after': (latest - timedelta(days=30)).isoformat(),
+        }),
+        Scenario('job-filter:tags', 'job-list', {'tags': tag}),
+        Scenario('job-filter:search', 'job-list', {'search': title.split()[0] if title else 'developer'}),
+        Scenario('job-filter:category+is_remote+experience_level', 'job-list', {
+            'category': category, 'is_remote': 'true', 'experience_level': level,
+        }),
+        Scenario('job-filter:category+ordering=-salary_min', 'job-list', {
+            'category': category, 'ordering': '-salary_min',
+        }),
+        Scenario('job-statistics', 'job-statistics'),
+    ]
+
+    staff = User.objects.filter(is_staff=True).order_by('pk').first()
+    if staff:
+        scenarios.append(Scenario('application-list:staff', 'application-list', user=staff))
+    applicant_id = common_value(Application.objects.all(), 'applicant')
+    if applicant_id:
+        scenarios.append(Scenario(
+            'application-list:applicant', 'application-list', user=User.objects.get(pk=applicant_id),
+        ))
+    return [
+        scenario for scenario in scenarios
+        if all(value is not None for value in scenario.params.values())
+    ]
+
+
+def capture_queries(scenario):
+    """Call the scenario's view and return the SELECT statements it ran with their counts"""
+    factory = APIRequestFactory()
+    path = reverse(scenario.url_name)
+    request = factory.get(path, scenario.params)
+    if scenario.user is not None:
+        force_authenticate(request, user=scenario.user)
+
+    with transaction.atomic(), CaptureQueriesContext(connection) as captured:
+        response = resolve(path).func(request)
+        transaction.set_rollback(True)
+    statements = Counter(
+        query['sql'] for query in captured.captured_queries
+        if query['sql'].lstrip().upper().startswith(('SELECT', 'WITH'))
+    )
+    return response.status_code, statements
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}')
+        plan = cursor.fetchone()[0]
+    return plan[0] if isinstance(plan, list) else plan
+
+
+def walk(node, sort_keys=()):
+    """Yield ``(node, sort_keys)`` for every plan node; sort_keys come from the nearest Sort above it"""
+    yield node, sort_keys
+    if node['Node Type'] in ('Sort', 'Incremental Sort'):
+        sort_keys = tuple(node.get('Sort Key', ()))
+    for child in node.get('Plans', ()):
+        yield from walk(child, sort_keys)
+
+
+def summarize_plan(plan):
+    """Reduce an EXPLAIN JSON document to scans, indexes and sorts"""
+    summary = {
+        'execution_ms': plan.get('Execution Time'),
+        'shared_hit_blocks': plan['Plan'].get('Shared Hit Blocks', 0),
+        'shared_read_blocks': plan['Plan'].get('Shared Read Blocks', 0),
+        'nodes': [],
+        'seq_scans': [],
+        'indexes': [],
+        'sorts': [],
+    }
+    for node, sort_keys in walk(plan['Plan']):
+        label = node['Node Type']
+        if 'Index Name' in node:
+            label += f" using {node['Index Name']}"
+            summary['indexes'].append(node['Index Name'])
+        if 'Relation Name' in node:
+            label += f" on {node['Relation Name']}"
+        summary['nodes'].append(label)
+
+        if node['Node Type'] == 'Seq Scan':
+            summary['seq_scans'].append({
+                'table': node['Relation Name'],
+                'filter': node.get('Filter'),
+                'rows': node.get('Actual Rows', 0) * node.get('Actual Loops', 1),
+                'rows_removed': node.get('Rows Removed by Filter', 0) * node.get('Actual Loops', 1),
+                'sort_key': list(sort_keys),
+            })
+        elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+            summary['sorts'].append({
+                'sort_key': node.get('Sort Key', []),
+                'method': node.get('Sort Method'),
+            })
+    summary['indexes'] = sorted(set(summary['indexes']))
+    return summary
+
+
+def table_columns(app_label=None):
+    """``{table: {column, ...}}`` for the models of one app or of all apps, including many-to-many tables"""
+    models = (
+        apps.get_app_config(app_label).get_models(include_auto_created=True) if app_label
+        else apps.get_models(include_auto_created=True)
+    )
+    return {model._meta.db_table: {f.column for f in model._meta.concrete_fields} for model in models}
+
+
+def index_catalog(tables):
+    """Every index of the tables with its columns, predicate, uniqueness and scan count"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT t.relname, i.relname,
+                   ARRAY(
+                       SELECT pg_get_indexdef(ix.indexrelid, k.ord + 1, true)
+                       FROM generate_subscripts(ix.indkey, 1) AS k(ord)
+                       ORDER BY k.ord
+                   ),
+                   pg_get_expr(ix.indpred, ix.indrelid),
+                   ix.indisunique OR ix.indisprimary,
+                   am.amname,
+                   COALESCE(s.idx_scan, 0)
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_class t ON t.oid = ix.indrelid
+            JOIN pg_am am ON am.oid = i.relam
+            LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = ix.indexrelid
+            WHERE t.relname = ANY(%s)
+            ORDER BY t.relname, i.relname
+            """,
+            [list(tables)],
+        )
+        return [
+            {
+                'table': table, 'index': index, 'columns': list(columns), 'where': where,
+                'unique': unique, 'method': method, 'scans': scans,
+            }
+            for table, index, columns, where, unique, method, scans in cursor.fetchall()
+        ]
+
+
+def table_sizes(tables):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT relname, GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = ANY(%s)',
+            [list(tables)],
+        )
+        return dict(cursor.fetchall())
+
+
+def parse_filter(expression, columns):
+    """Split a plan filter into (equality columns, range columns, LIKE expressions, status value)"""
+    equality, ranges, like, status = [], [], [], None
+    for column, operator, literal in PREDICATE.findall(expression or ''):
+        if column not in columns:
+            continue
+        if operator == '=':
+            if column == 'status':
+                status = literal
+            elif column not in equality:
+                equality.append(column)
+        elif operator in ('>=', '<=', '>', '<'):
+            if column not in ranges:
+                ranges.append(column)
+        elif operator.startswith('~~'):
+            # icontains/istartswith compare UPPER(column), which only an expression index serves
+            upper = re.search(rf'upper\(\(?{column}\)?', expression, re.IGNORECASE)
+            target = f'upper(({column})::text)' if upper else column
+            if target not in like:
+                like.append(target)
+    return equality, ranges, like, status
+
+
+def sort_columns(sort_keys, table, columns):
+    result = []
+    for key in sort_keys:
+        match = SORT_COLUMN.match(key.strip().strip('()'))
+        if not match or match.group(1) not in (None, table) or match.group(2) not in columns:
+            return []  # Sorting on an expression or another table; an index cannot provide it
+        result.append(match.group(2) + (' DESC' if match.group(3) else ''))
+    return result
+
+
+def normalize(term):
+    """An index term without direction, quotes, parentheses or spaces"""
+    term = re.sub(r'\s+(ASC|DESC)$', '', term.strip(), flags=re.IGNORECASE)
+    return re.sub(r'[()\s"]', '', term).lower()
+
+
+def is_covered(suggestion, catalog):
+    """True if an existing index already starts with the suggested columns under the same predicate"""
+    wanted = [normalize(column) for column in suggestion['columns']]
+    for index in catalog:
+        if index['table'] != suggestion['table'] or index['method'] != suggestion['method']:
+            continue
+        predicate = f"((status)::text = '{PARTIAL_STATUS}'::text)" if suggestion['where'] else None
+        if index['where'] != predicate:
+            continue
+        existing = [normalize(column) for column in index['columns']]
+        if existing[:len(wanted)] == wanted:
+            return True
+    return False
+
+
+def suggest_indexes(seq_scans, catalog, sizes, min_rows):
+    """Index suggestions for sequential scans over tables of at least ``min_rows`` rows"""
+    columns_by_table = table_columns()
+    suggestions = {}
+    for scan, scenario in seq_scans:
+        table = scan['table']
+        if sizes.get(table, 0) < min_rows or not scan['filter']:
+            continue
+        columns = columns_by_table.get(table, set())
+        equality, ranges, like, status = parse_filter(scan['filter'], columns)
+        partial = status == PARTIAL_STATUS
+        if status and not partial:
+            equality.insert(0, 'status')
+
+        candidates = []
+        sort = sort_columns(scan['sort_key'], table, columns)
+        sorted_on = [column.split()[0] for column in sort]
+        key = equality + sort + [column for column in ranges if column not in sorted_on][:1]
+        if key:
+            candidates.append({
+                'table': table, 'columns': key, 'where': partial, 'method': 'btree',
+                'reason': 'equality columns, then sort key, then range column of a sequential scan',
+            })
+        for expression in like:
+            candidates.append({
+                'table': table, 'columns': [expression], 'where': False, 'method': 'gin',
+                'reason': "LIKE '%...%' filter; needs a trigram index (pg_trgm)",
+            })
+
+        for candidate in candidates:
+            if is_covered(candidate, catalog):
+                continue
+            signature = (table, tuple(candidate['columns']), candidate['where'], candidate['method'])
+            suggestion = suggestions.setdefault(signature, {**candidate, 'scenarios': []})
+            if scenario not in suggestion['scenarios']:
+                suggestion['scenarios'].append(scenario)
+
+    for suggestion in suggestions.values():
+        suggestion['sql'] = create_index_sql(suggestion)
+        suggestion['where'] = f"status = '{PARTIAL_STATUS}'" if suggestion['where'] else None
+    return sorted(suggestions.values(), key=lambda item: (item['table'], item['columns']))
+
+
+def create_index_sql(suggestion):
+    names = '_'.join(
+        re.sub(r'\W+', '_', re.sub(r'::\w+|\s+DESC$', '', column)).strip('_') for column in suggestion['columns']
+    )
+    kind = 'trgm' if suggestion['method'] == 'gin' else 'idx'
+    name = f"{suggestion['table']}_{names}_{'active_' if suggestion['where'] else ''}{kind}"[:63]
+    if suggestion['method'] == 'gin':
+        expression = suggestion['columns'][0]
+        if not expression.isidentifier():
+            expression = f'({expression})'
+        body = f"USING gin ({expression} gin_trgm_ops)"
+    else:
+        body = f"({', '.join(suggestion['columns'])})"
+    where = f" WHERE status = '{PARTIAL_STATUS}'" if suggestion['where'] else ''
+    return f"CREATE INDEX CONCURRENTLY {name} ON {suggestion['table']} {body}{where};"
+
+
+def analyze(min_rows=DEFAULT_MIN_ROWS, timing=True):
+    """Explain every scenario and return the report as a JSON-serializable dict"""
+    tables = table_columns('jobs')
+    isolated_cache = {'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': f'advisor-{uuid.uuid4()}',
+    }}
+
+    scenarios = []
+    seq_scans = []
+    used_by = {}
+    with override_settings(CACHES=isolated_cache):
+        for scenario in build_scenarios():
+            entry = {'name': scenario.name, 'view': scenario.url_name, 'params': scenario.params}
+            try:
+                entry['status'], statements = capture_queries(scenario)
+            except Exception as exc:
+                entry['error'] = f'{type(exc).__name__}: {exc}'.strip()
+                scenarios.append(entry)
+                continue
+
+            entry['queries'] = []
+            for sql, count in statements.items():
+                try:
+                    with transaction.atomic():
+                        summary = summarize_plan(explain(sql))
+                except Exception as exc:
+                    summary = {'error': f'{type(exc).__name__}: {exc}'.strip()}
+                summary = {'fingerprint': fingerprint(sql), 'count': count, 'sql': sql, **summary}
+                entry['queries'].append(summary)
+                for index in summary.get('indexes', ()):
+                    used_by.setdefault(index, set()).add(scenario.name)
+                seq_scans.extend((scan, scenario.name) for scan in summary.get('seq_scans', ()))
+            scenarios.append(entry)
+
+    catalog = index_catalog(tables)
+    sizes = table_sizes(set(tables).union(scan['table'] for scan, _ in seq_scans))
+    for index in catalog:
+        index['used_by'] = sorted(used_by.get(index['index'], ()))
+    unused = [
+        index['index'] for index in catalog
+        if not index['unique'] and not index['used_by'] and not index['scans']
+    ]
+
+    report = {
+        'scenarios': scenarios,
+        'seq_scans': [
+            {**scan, 'scenario': scenario, 'table_rows': sizes.get(scan['table'], 0)}
+            for scan, scenario in seq_scans
+        ],
+        'indexes': catalog,
+        'unused_indexes': unused,
+        'suggestions': suggest_indexes(seq_scans, catalog, sizes, min_rows),
+    }
+    if not timing:
+        strip_timing(report)
+    return report
+
+
+def strip_timing(report):
+    """Drop values that change from run to run"""
+    for scenario in report['scenarios']:
+        for query in scenario.get('queries', ()):
+            for key in ('execution_ms', 'shared_hit_blocks', 'shared_read_blocks'):
+                query.pop(key, None)
+            for sort in query.get('sorts', ()):
+                sort.pop('method', None)
+    for scan in report['seq_scans']:
+        for key in ('rows', 'rows_removed', 'table_rows'):
+            scan.pop(key, None)
+    for index in report['indexes']:
+        index.pop('scans', None)
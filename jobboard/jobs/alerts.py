@@ -0,0 +1,261 @@
+"""
+Job alert matching.
+
+Alerts are evaluated together in one pass instead of one query per alert. All
+active alerts are loaded as plain criteria (three queries in total, however
+many alerts exist) and indexed in memory under their most selective
+criterion:
+
+* keyword alerts under one token of every keyword phrase,
+* otherwise category alerts under each of their categories,
+* otherwise job type alerts under each of their job types,
+* and alerts without any of those in a wildcard list.
+
+Each job activated since the oldest ``last_sent`` is looked up through its
+tokens, category and job type, and only the alerts found that way are checked
+against the full criteria. An alert only receives jobs activated after its own
+``last_sent`` (or its creation, if it was never sent), and at most
+``MAX_LOOKBACK`` ago.
+
+``activated_at`` is stamped inside the saving transaction, so a job can become
+visible some time after its timestamp. The cut-off stored as ``last_sent``
+therefore trails the run by ``ALERT_COMMIT_GRACE``: jobs activated within it
+are left for the next run instead of being skipped for good once they commit.
+
+Criteria semantics: empty criteria match anything. ``keywords`` and
+``locations`` are comma-separated and match if any phrase matches (every word
+of a keyword phrase must appear in the job's title, tags or company name; a
+location matches as a case-insensitive substring). ``experience_levels`` is a
+comma-separated list of level codes. ``salary_min`` requires a job salary at
+least that high, and ``is_remote`` requires a remote job.
+"""
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import Job, JobAlert
+
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Jobs activated longer ago than this are never sent, however stale an alert is
+MAX_LOOKBACK = timedelta(days=31)
+
+# Activations this recent may still be uncommitted and are matched next run
+ALERT_COMMIT_GRACE = timedelta(minutes=5)
+
+# Number of alerts whose last_sent is updated per UPDATE statement
+UPDATE_BATCH_SIZE = 5000
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or '').lower())
+
+
+def split_list(value):
+    return [item.strip().lower() for item in (value or '').split(',') if item.strip()]
+
+
+@dataclass(frozen=True)
+class AlertCriteria:
+    """The parts of a ``JobAlert`` the matcher needs, without model instances"""
+    id: int
+    user_id: int
+    frequency: str
+    since: object
+    keyword_phrases: tuple
+    category_ids: frozenset
+    job_type_ids: frozenset
+    locations: tuple
+    experience_levels: frozenset
+    salary_min: object
+    is_remote: bool
+
+    def matches(self, job):
+        if job.activated_at is None or job.activated_at <= self.since:
+            return False
+        if self.category_ids and job.category_id not in self.category_ids:
+            return False
+        if self.job_type_ids and job.job_type_id not in self.job_type_ids:
+            return False
+        if self.experience_levels and job.experience_level not in self.experience_levels:
+            return False
+        if self.is_remote and not job.is_remote:
+            return False
+        if self.salary_min is not None:
+            salary = max(filter(None, (job.salary_min, job.salary_max)), default=None)
+            if salary is None or salary < self.salary_min:
+                return False
+        if self.locations:
+            location = job.location.lower()
+            if not any(place in location for place in self.locations):
+                return False
+        if self.keyword_phrases and not any(
+            job.tokens.issuperset(phrase) for phrase in self.keyword_phrases
+        ):
+            return False
+        return True
+
+
+@dataclass
+class CandidateJob:
+    id: int
+    activated_at: object
+    category_id: int
+    job_type_id: int
+    experience_level: str
+    is_remote: bool
+    salary_min: object
+    salary_max: object
+    location: str
+    tokens: frozenset
+
+
+def load_alerts(queryset=None):
+    """Active alerts as ``AlertCriteria``, with M2M criteria read in one query each"""
+    queryset = JobAlert.objects.filter(is_active=True) if queryset is None else queryset
+    rows = list(queryset.order_by().values(
+        'id', 'user_id', 'frequency', 'keywords', 'locations', 'experience_levels',
+        'salary_min', 'is_remote', 'last_sent', 'created_at',
+    ))
+
+    categories, job_types = defaultdict(set), defaultdict(set)
+    alert_ids = queryset.order_by().values('id')
+    for alert_id, category_id in JobAlert.categories.through.objects.filter(
+        jobalert_id__in=alert_ids
+    ).values_list('jobalert_id', 'category_id'):
+        categories[alert_id].add(category_id)
+    for alert_id, job_type_id in JobAlert.job_types.through.objects.filter(
+        jobalert_id__in=alert_ids
+    ).values_list('jobalert_id', 'jobtype_id'):
+        job_types[alert_id].add(job_type_id)
+
+    alerts = []
+    for row in rows:
+        phrases = tuple(
+            frozenset(tokens) for tokens in map(tokenize, (row['keywords'] or '').split(',')) if tokens
+        )
+        alerts.append(AlertCriteria(
+            id=row['id'],
+            user_id=row['user_id'],
+            frequency=row['frequency'],
+            since=row['last_sent'] or row['created_at'],
+            keyword_phrases=phrases,
+            category_ids=frozenset(categories[row['id']]),
+            job_type_ids=frozenset(job_types[row['id']]),
+            locations=tuple(split_list(row['locations'])),
+            experience_levels=frozenset(split_list(row['experience_levels'])),
+            salary_min=row['salary_min'],
+            is_remote=row['is_remote'],
+        ))
+    return alerts
+
+
+def load_candidate_jobs(since, until):
+    """Jobs that are active and were activated in ``(since, until]``"""
+    jobs = (
+        Job.objects.filter(status='active', activated_at__gt=since, activated_at__lte=until)
+        .order_by()
+        .values(
+            'id', 'activated_at', 'category_id', 'job_type_id', 'experience_level', 'is_remote',
+            'salary_min', 'salary_max', 'location', 'title', 'tags', 'company__name',
+        )
+    )
+    return [
+        CandidateJob(
+            id=row['id'],
+            activated_at=row['activated_at'],
+            category_id=row['category_id'],
+            job_type_id=row['job_type_id'],
+            experience_level=row['experience_level'],
+            is_remote=row['is_remote'],
+            salary_min=row['salary_min'],
+            salary_max=row['salary_max'],
+            location=row['location'],
+            tokens=frozenset(tokenize(' '.join(
+                filter(None, (row['title'], row['tags'], row['company__name']))
+            ))),
+        )
+        for row in jobs
+    ]
+
+
+class AlertIndex:
+    """Inverted index from job attributes to the alerts that could match them"""
+
+    def __init__(self, alerts):
+        self.by_token = defaultdict(list)
+        self.by_category = defaultdict(list)
+        self.by_job_type = defaultdict(list)
+        self.wildcard = []
+
+        for alert in alerts:
+            if alert.keyword_phrases:
+                # Any token of a phrase is required, so the longest one is the
+                # most selective key; every phrase needs one for OR semantics
+                for token in {max(phrase, key=len) for phrase in alert.keyword_phrases}:
+                    self.by_token[token].append(alert)
+            elif alert.category_ids:
+                for category_id in alert.category_ids:
+                    self.by_category[category_id].append(alert)
+            elif alert.job_type_ids:
+                for job_type_id in alert.job_type_ids:
+                    self.by_job_type[job_type_id].append(alert)
+            else:
+                self.wildcard.append(alert)
+
+    def candidates(self, job):
+        """Alerts that share an indexed criterion with the job, each at most once"""
+        found = {}
+        for token in job.tokens:
+            for alert in self.by_token.get(token, ()):
+                found[alert.id] = alert
+        for alert in self.by_category.get(job.category_id, ()):
+            found[alert.id] = alert
+        for alert in self.by_job_type.get(job.job_type_id, ()):
+            found[alert.id] = alert
+        for alert in self.wildcard:
+            found[alert.id] = alert
+        return found.values()
+
+
+def match_alerts(alerts=None, now=None):
+    """
+    Match recently activated jobs against alerts in one pass.
+
+    Returns ``(matches, cutoff)`` where ``matches`` is a list of
+    ``(AlertCriteria, [job ids])`` for alerts with at least one new job, in
+    alert id order, and ``cutoff`` (``ALERT_COMMIT_GRACE`` before ``now``) is
+    the time to store as ``last_sent``.
+    """
+    cutoff = (now or timezone.now()) - ALERT_COMMIT_GRACE
+    alerts = load_alerts() if alerts is None else alerts
+    if not alerts:
+        return [], cutoff
+
+    index = AlertIndex(alerts)
+    matched = defaultdict(list)
+    since = max(min(alert.since for alert in alerts), cutoff - MAX_LOOKBACK)
+    for job in load_candidate_jobs(since, cutoff):
+        for alert in index.candidates(job):
+            if alert.matches(job):
+                matched[alert.id].append(job.id)
+
+    alerts_by_id = {alert.id: alert for alert in alerts}
+    matches = [(alerts_by_id[alert_id], sorted(job_ids)) for alert_id, job_ids in sorted(matched.items())]
+    return matches, cutoff
+
+
+def mark_alerts_sent(alert_ids, sent_at, batch_size=UPDATE_BATCH_SIZE):
+    """Set ``last_sent`` for many alerts with one UPDATE per batch; returns rows updated"""
+    alert_ids = list(alert_ids)
+    updated = 0
+    for start in range(0, len(alert_ids), batch_size):
+        updated += JobAlert.objects.filter(pk__in=alert_ids[start:start + batch_size]).update(
+            last_sent=sent_at
+        )
+    return updated
+
@@ -0,0 +1,201 @@
+"""
+Async variants of the public job read endpoints, for deployments served over ASGI.
+
+``job_list``, ``job_detail`` and ``job_statistics`` mirror ``JobListView``,
+``JobDetailView`` and ``views.job_statistics`` (same filters, ordering, page
+sizes, caches and payloads) but are native coroutines. Database reads use the
+async ORM (``acount``, ``aiterator``, ``aget``) and Redis work for view
+tracking goes through ``redis.asyncio``, so a slow client holds no worker
+thread. The remaining synchronous steps (Django cache access, the reference
+data check, keyset pages and facet counts) are grouped so that each request
+makes as few ``sync_to_async`` hops as possible.
+
+Compare them with the WSGI path using ``benchmarks/async_vs_wsgi.py``.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .caching import (
+    VOLATILE_FIELDS, cache_job_detail, get_cached_job_detail, get_jobs_generation,
+    invalidate_job_detail, job_list_cache_key, record_cache_lookup
+)
+from .facets import FACETS_PARAM, get_facet_counts, parse_facets
+from .models import Application, Category, Company, Job
+from .pagination import KeysetPagination
+from .refdata import snapshot_for
+from .serializers import JobDetailSerializer, JobListSerializer
+from .tracking import abuffer_job_view, aunique_viewers
+from .views import JobDetailView, JobListView
+
+
+def _drf_request(request):
+    return Request(request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES])
+
+
+async def _get_user(drf_request):
+    """The authenticated user or None, skipping authentication when no credentials were sent"""
+    if 'HTTP_AUTHORIZATION' not in drf_request.META:
+        return None
+    try:
+        user = await sync_to_async(lambda: drf_request.user)()
+    except APIException:
+        return None
+    return user if user.is_authenticated else None
+
+
+def _error(exc):
+    return JsonResponse(
+        exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail},
+        status=exc.status_code, safe=False,
+    )
+
+
+def _serialize(serializer, tables):
+    # Hand the reference data snapshot to ReferenceDataField instead of letting
+    # it check versions synchronously; snapshot_for already holds every row, so
+    # nothing touches the database on the event loop
+    serializer._reference_tables = tables
+    return serializer.data
+
+
+def _cached_list_page(drf_request, view):
+    generation = get_jobs_generation()
+    cache_key = job_list_cache_key(drf_request, view.get_cache_defaults(drf_request), generation)
+    data = cache.get(cache_key)
+    record_cache_lookup('job_list', data is not None)
+    return cache_key, data
+
+
+def _keyset_page(queryset, drf_request, view):
+    paginator = KeysetPagination()
+    paginator.page_size = api_settings.PAGE_SIZE
+    jobs = paginator.paginate_queryset(queryset, drf_request, view)
+    return jobs, {'next': paginator.get_next_link(), 'previous': paginator.get_previous_link()}
+
+
+async def _number_page(queryset, drf_request):
+    page_size = api_settings.PAGE_SIZE
+    try:
+        page_number = int(drf_request.query_params.get('page') or 1)
+    except ValueError:
+        page_number = 0
+
+    count = await queryset.acount()
+    last_page = max(1, -(-count // page_size))
+    if not 1 <= page_number <= last_page:
+        return None, None
+
+    offset = (page_number - 1) * page_size
+    jobs = [job async for job in queryset[offset:offset + page_size].aiterator()]
+
+    url = drf_request.build_absolute_uri()
+    previous_link = None
+    if page_number > 1:
+        previous_link = (
+            remove_query_param(url, 'page') if page_number == 2
+            else replace_query_param(url, 'page', page_number - 1)
+        )
+    return jobs, {
+        'count': count,
+        'next': replace_query_param(url, 'page', page_number + 1) if page_number < last_page else None,
+        'previous': previous_link,
+    }
+
+
+@require_GET
+async def job_list(request):
+    """List all active jobs with filtering and search"""
+    drf_request = _drf_request(request)
+    view = JobListView(request=drf_request, args=(), kwargs={}, format_kwarg=None)
+    try:
+        facets = parse_facets(drf_request.query_params.get(FACETS_PARAM))
+        queryset = view.filter_queryset(view.get_queryset())
+    except APIException as exc:
+        return _error(exc)
+
+    cache_key = None
+    if await _get_user(drf_request) is None:
+        cache_key, data = await sync_to_async(_cached_list_page)(drf_request, view)
+        if data is not None:
+            return JsonResponse(data, headers={'X-Cache': 'HIT'})
+
+    try:
+        if 'cursor' in drf_request.query_params:
+            jobs, data = await sync_to_async(_keyset_page)(queryset, drf_request, view)
+        else:
+            jobs, data = await _number_page(queryset, drf_request)
+    except APIException as exc:
+        return _error(exc)
+    if jobs is None:
+        return JsonResponse({'detail': 'Invalid page.'}, status=404)
+
+    tables = await sync_to_async(snapshot_for)(jobs)
+    data['results'] = _serialize(JobListSerializer(jobs, many=True), tables)
+    if facets:
+        data['facets'] = await sync_to_async(get_facet_counts)(queryset, drf_request.query_params, facets)
+
+    if cache_key is None:
+        return JsonResponse(data)
+    await cache.aset(cache_key, data, settings.JOB_LIST_CACHE_TTL)
+    return JsonResponse(data, headers={'X-Cache': 'MISS'})
+
+
+def _cached_detail(slug):
+    data = get_cached_job_detail(slug)
+    record_cache_lookup('job_detail', data is not None)
+    return data
+
+
+@require_GET
+async def job_detail(request, slug):
+    """Retrieve a specific job"""
+    drf_request = _drf_request(request)
+    data = await sync_to_async(_cached_detail)(slug)
+
+    if data is None:
+        try:
+            job = await Job.objects.select_related('posted_by').aget(slug=slug)
+        except Job.DoesNotExist:
+            return JsonResponse({'detail': 'No Job matches the given query.'}, status=404)
+        viewers = await aunique_viewers(job.pk)
+        tables = await sync_to_async(snapshot_for)([job])
+        data = _serialize(JobDetailSerializer(job, context={'unique_viewers': viewers}), tables)
+        await sync_to_async(cache_job_detail)(job, data)
+    else:
+        # Merge the counters that change without invalidating the cached body
+        counters = await Job.objects.filter(pk=data['id']).values(*VOLATILE_FIELDS).afirst()
+        if counters is None:
+            await sync_to_async(invalidate_job_detail)(slug)
+            return JsonResponse({'detail': 'No Job matches the given query.'}, status=404)
+        data = {**data, **counters, 'unique_viewers': await aunique_viewers(data['id'])}
+
+    await abuffer_job_view(
+        data['id'], await _get_user(drf_request), JobDetailView().get_client_ip(request),
+        request.META.get('HTTP_USER_AGENT', ''),
+    )
+    return JsonResponse(data)
+
+
+@require_GET
+async def job_statistics(request):
+    """Get job board statistics"""
+    cache_key = 'job_statistics'
+    stats = await cache.aget(cache_key)
+
+    if not stats:
+        stats = {
+            'total_jobs': await Job.objects.filter(status='active').acount(),
+            'total_companies': await Company.objects.acount(),
+            'total_applications': await Application.objects.acount(),
+            'total_categories': await Category.objects.acount(),
+        }
+        await cache.aset(cache_key, stats, 300)  # Cache for 5 minutes
+
+    return JsonResponse(stats)
@@ -0,0 +1,243 @@
+"""
+Bulk job creation.
+
+``create_jobs`` takes any iterable of raw items (a parsed JSON array or the
+lazy NDJSON generator) and works through it in chunks, so an upload of
+thousands of jobs costs a fixed number of queries per chunk instead of a few
+per job:
+
+1. every item is validated with ``JobBulkCreateSerializer``;
+2. company, category and job type ids are resolved with one query per table;
+3. slugs are made unique with one query for the candidates and, only when some
+   are taken, one more for their numbered variants;
+4. the jobs are inserted with ``bulk_create`` and the active-job counters and
+   tag links are updated in bulk, all in one transaction per chunk.
+
+An invalid item is reported by its position and skipped; it never prevents
+the rest of its chunk from being created. Slugs taken by a concurrent request
+between steps 3 and 4 are picked again; if the insert fails for any other
+reason (e.g. a referenced row was deleted meanwhile) the chunk is inserted job
+by job, each in its own savepoint, and only the failing jobs are reported.
+Foreign keys are checked immediately rather than at commit for that.
+``bulk_create`` bypasses
+``Job.save`` and the model signals, so their side effects (``activated_at``,
+counters, tags, cache generation) are applied here explicitly.
+"""
+from functools import lru_cache
+from itertools import islice
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+
+from .caching import bump_jobs_generation
+from .counters import count_inserted_jobs
+from .metrics import JOBS_CREATED
+from .models import Category, Company, Job, JobType
+from .serializers import JobBulkCreateSerializer
+from .tags import sync_job_tags
+
+
+DEFAULT_CHUNK_SIZE = 500
+
+# Inserts tried before giving up on slugs that keep being taken concurrently
+SLUG_ATTEMPTS = 3
+
+SLUG_MAX_LENGTH = Job._meta.get_field('slug').max_length
+
+# Job field -> model its id is resolved against
+RELATED_MODELS = {
+    'company': Company,
+    'category': Category,
+    'job_type': JobType,
+}
+
+
+def base_slug(title, company_name):
+    """The slug ``Job.save`` would give a job, before making it unique"""
+    return f"{title}-{company_name}".lower().replace(' ', '-')[:SLUG_MAX_LENGTH]
+
+
+def numbered_slug(base, number):
+    suffix = f'-{number}'
+    return base[:SLUG_MAX_LENGTH - len(suffix)] + suffix
+
+
+def assign_unique_slugs(jobs, company_names):
+    """Give each unsaved job a slug not used in the database or elsewhere in the list"""
+    bases = [base_slug(job.title, company_names[job.company_id]) for job in jobs]
+    taken = set(Job.objects.filter(slug__in=set(bases)).values_list('slug', flat=True))
+
+    # Numbered variants are only read for bases that collide
+    seen, colliding = set(), set()
+    for base in bases:
+        if base in taken or base in seen:
+            colliding.add(base)
+        seen.add(base)
+    if colliding:
+        numbered = Q()
+        for base in colliding:
+            # Long bases are cut to make room for the suffix
+            numbered |= Q(slug__startswith=base[:SLUG_MAX_LENGTH - len('-99999')])
+        taken.update(Job.objects.filter(numbered).values_list('slug', flat=True))
+
+    for job, base in zip(jobs, bases):
+        slug, number = base, 2
+        while slug in taken:
+            slug = numbered_slug(base, number)
+            number += 1
+        taken.add(slug)
+        job.slug = slug
+
+
+def resolve_related(items):
+    """Look up the referenced rows of a chunk with one query per table"""
+    found = {}
+    for name, model in RELATED_MODELS.items():
+        ids = {data[name] for _, data in items}
+        queryset = model.objects.filter(pk__in=ids)
+        if model is Company:
+            found[name] = dict(queryset.values_list('pk', 'name'))
+        else:
+            found[name] = dict.fromkeys(queryset.values_list('pk', flat=True))
+    return found
+
+
+@lru_cache(maxsize=None)
+def slug_constraints():
+    """Names of the unique constraints and indexes on ``Job.slug`` alone"""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, Job._meta.db_table)
+    return frozenset(
+        name for name, info in constraints.items() if info['unique'] and info['columns'] == ['slug']
+    )
+
+
+def violated_constraint(exc):
+    return getattr(getattr(exc.__cause__, 'diag', None), 'constraint_name', None)
+
+
+def bulk_insert(jobs, company_names):
+    """``bulk_create`` in a savepoint, picking new slugs when a concurrent insert took one"""
+    for attempt in range(1, SLUG_ATTEMPTS + 1):
+        try:
+            with transaction.atomic():
+                return Job.objects.bulk_create(jobs)
+        except IntegrityError as exc:
+            if attempt == SLUG_ATTEMPTS or violated_constraint(exc) not in slug_constraints():
+                raise
+            assign_unique_slugs(jobs, company_names)
+
+
+def insert_jobs(jobs, company_names):
+    """
+    Insert jobs and apply what ``Job.save`` and the signals would have done.
+
+    Returns ``{position in jobs: errors}`` for the jobs that could not be inserted.
+    """
+    assign_unique_slugs(jobs, company_names)
+    failed = {}
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Report a missing referenced row on the insert, not at commit
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        try:
+            bulk_insert(jobs, company_names)
+            inserted = jobs
+        except IntegrityError:
+            inserted = []
+            for position, job in enumerate(jobs):
+                try:
+                    bulk_insert([job], company_names)
+                    inserted.append(job)
+                except IntegrityError as exc:
+                    job.pk = None
+                    constraint = violated_constraint(exc) or 'unknown'
+                    failed[position] = {
+                        'non_field_errors': [f'Could not be created, violates constraint "{constraint}".'],
+                    }
+        count_inserted_jobs(inserted)
+        sync_job_tags(inserted)
+        transaction.on_commit(bump_jobs_generation)
+        transaction.on_commit(lambda: JOBS_CREATED.inc(len(inserted)))
+    return failed
+
+
+def create_chunk(chunk, posted_by, now):
+    """Validate and insert one chunk of ``(index, item)``; returns per-item results"""
+    results = {}
+    valid = []
+    for index, item in chunk:
+        if isinstance(item, ParseError):
+            results[index] = {'non_field_errors': [str(item.detail)]}
+            continue
+        if not isinstance(item, dict):
+            results[index] = {'non_field_errors': ['Each item must be a JSON object.']}
+            continue
+        serializer = JobBulkCreateSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = serializer.errors
+
+    related = resolve_related(valid)
+    created = []
+    for index, data in valid:
+        errors = {
+            name: [f'Invalid pk "{data[name]}" - object does not exist.']
+            for name in RELATED_MODELS if data[name] not in related[name]
+        }
+        if errors:
+            results[index] = errors
+            continue
+
+        fields = dict(data)
+        for name in RELATED_MODELS:
+            fields[f'{name}_id'] = fields.pop(name)
+        job = Job(posted_by=posted_by, **fields)
+        if job.status == 'active':
+            job.activated_at = now
+        created.append((index, job))
+
+    if created:
+        failed = insert_jobs([job for _, job in created], related['company'])
+        results.update(
+            (index, failed.get(position, job)) for position, (index, job) in enumerate(created)
+        )
+
+    return [
+        {'index': index, 'status': 'created', 'id': result.pk, 'slug': result.slug}
+        if isinstance(result, Job) else
+        {'index': index, 'status': 'error', 'errors': result}
+        for index, result in sorted(results.items())
+    ]
+
+
+def create_jobs(items, posted_by, chunk_size=DEFAULT_CHUNK_SIZE, limit=None):
+    """
+    Create jobs from an iterable of raw items, ``chunk_size`` at a time.
+
+    Returns one result per item, in input order: ``{'index', 'status':
+    'created', 'id', 'slug'}`` or ``{'index', 'status': 'error', 'errors'}``.
+    Items past ``limit`` are not read; the first of them gets an error.
+    """
+    if limit is not None:
+        items = islice(items, limit + 1)
+    numbered = enumerate(items)
+    results = []
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        overflow = limit is not None and bool(chunk) and chunk[-1][0] == limit
+        if overflow:
+            chunk.pop()
+        if chunk:
+            results.extend(create_chunk(chunk, posted_by, timezone.now()))
+        if overflow:
+            results.append({
+                'index': limit,
+                'status': 'error',
+                'errors': {'non_field_errors': [f'Too many items; at most {limit} are accepted per request.']},
+            })
+        if overflow or len(chunk) < chunk_size:
+            return results
@@ -0,0 +1,182 @@
+"""
+Response caching for the job read endpoints.
+
+Job detail payloads are cached per slug. A payload is dropped when its job is
+saved or deleted, and each payload also records a version stamp for the
+company, category and job type it embeds: saving or deleting one of those
+bumps its stamp, which invalidates every payload embedding it in O(1) without
+enumerating jobs. Counters that change on every view or application are not
+trusted from the cache and are merged in at read time.
+
+Anonymous job list pages are cached per canonical query string (parameters
+sorted, blanks dropped, defaults filled in) under a global "jobs generation"
+number. Any job, company, category or job type write bumps the generation, so
+every list page cached before it stops matching at once: nothing is scanned or
+deleted, and the orphaned entries simply expire. View and application counters
+on list pages may lag by up to ``JOB_LIST_CACHE_TTL``.
+
+The same version data (generation, its change time and the reference stamps,
+which are timestamps) also drives the ETag / Last-Modified validators of
+``jobs.conditional``.
+
+Hits and misses are counted per cache in Redis; see ``cache_hit_ratios``.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+DETAIL_KEY = 'job_detail:{slug}'
+REF_VERSION_KEY = 'job_detail_ref:{model}:{pk}'
+
+# Nested objects embedded in the detail payload, keyed by payload field
+DETAIL_REFS = ('company', 'category', 'job_type')
+
+# Job columns that change without a save() and so are read fresh on every hit
+VOLATILE_FIELDS = ('views_count', 'applications_count')
+
+JOBS_GENERATION_KEY = 'jobs_generation'
+JOBS_MODIFIED_KEY = 'jobs_generation_modified'
+LIST_KEY = 'job_list:{generation}:{digest}'
+STATS_KEY = 'cache_stats:{name}:{outcome}'
+
+# Caches whose lookups are counted
+TRACKED_CACHES = ('job_list', 'job_detail')
+
+
+def _ref_version_key(model_name, pk):
+    return REF_VERSION_KEY.format(model=model_name, pk=pk)
+
+
+def get_cached_job_detail(slug):
+    """Return the cached detail payload for a slug, or None if missing or stale"""
+    payload = cache.get(DETAIL_KEY.format(slug=slug))
+    if payload is None:
+        return None
+
+    versions = cache.get_many(list(payload['refs']))
+    if any(versions.get(key) != version for key, version in payload['refs'].items()):
+        return None
+    return payload['data']
+
+
+def cache_job_detail(job, data):
+    """Store a freshly serialized detail payload with the current reference stamps"""
+    ref_keys = [_ref_version_key(name, getattr(job, f'{name}_id')) for name in DETAIL_REFS]
+    versions = cache.get_many(ref_keys)
+    payload = {
+        'data': {key: value for key, value in data.items() if key not in VOLATILE_FIELDS},
+        'refs': {key: versions.get(key) for key in ref_keys},
+    }
+    cache.set(DETAIL_KEY.format(slug=job.slug), payload, settings.JOB_DETAIL_CACHE_TTL)
+
+
+def invalidate_job_detail(slug):
+    cache.delete(DETAIL_KEY.format(slug=slug))
+
+
+def invalidate_job_details(slugs):
+    cache.delete_many([DETAIL_KEY.format(slug=slug) for slug in slugs])
+
+
+def bump_job_detail_ref(model_name, pk):
+    """Invalidate every cached detail payload embedding this company/category/job type"""
+    # The stamp is the change time, which doubles as a Last-Modified candidate
+    cache.set(_ref_version_key(model_name, pk), time.time(), None)
+
+
+def get_job_detail_refs(refs):
+    """Current stamps of the ``{'company': pk, ...}`` objects a detail payload embeds"""
+    keys = {name: _ref_version_key(name, pk) for name, pk in refs.items()}
+    stamps = cache.get_many(list(keys.values()))
+    return {name: stamps.get(key) for name, key in keys.items()}
+
+
+def get_jobs_version():
+    """Current ``(generation, time of the last bump)``; the time is None if unknown"""
+    values = cache.get_many([JOBS_GENERATION_KEY, JOBS_MODIFIED_KEY])
+    generation = values.get(JOBS_GENERATION_KEY)
+    if generation is None:
+        # Start from the clock so a lost key can never resurrect an old generation
+        cache.add(JOBS_GENERATION_KEY, time.time_ns() // 1000, None)
+        generation = cache.get(JOBS_GENERATION_KEY)
+    return generation, values.get(JOBS_MODIFIED_KEY)
+
+
+def get_jobs_generation():
+    """Current jobs generation; part of every cached list key"""
+    return get_jobs_version()[0]
+
+
+def bump_jobs_generation():
+    """Invalidate every cached job list page"""
+    try:
+        cache.incr(JOBS_GENERATION_KEY)
+    except ValueError:
+        cache.add(JOBS_GENERATION_KEY, time.time_ns() // 1000, None)
+    cache.set(JOBS_MODIFIED_KEY, time.time(), None)
+
+
+def job_list_cache_key(request, defaults, generation):
+    """
+    Cache key for a list request under a generation.
+
+    Parameters are sorted, blank values are dropped and ``defaults`` fill in
+    parameters the client left out, so ``?remote=true&page=1`` and
+    ``?page=&remote=true`` share an entry. The host and path are included
+    because pagination links are absolute.
+    """
+    params = request.query_params
+    items = {
+        key: sorted(value for value in params.getlist(key) if value != '')
+        for key in params
+    }
+    items = {key: values for key, values in items.items() if values}
+    for key, value in defaults.items():
+        items.setdefault(key, [value])
+
+    canonical = urlencode(sorted((key, value) for key, values in items.items() for value in values))
+    digest = hashlib.sha1(f'{request.get_host()}{request.path}?{canonical}'.encode()).hexdigest()
+    return LIST_KEY.format(generation=generation, digest=digest)
+
+
+def record_cache_lookup(name, hit):
+    """Count a hit or miss for one of the ``TRACKED_CACHES``"""
+    key = STATS_KEY.format(name=name, outcome='hits' if hit else 'misses')
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def cache_hit_ratios():
+    """Hits, misses and hit ratio of each tracked cache since the last reset"""
+    keys = [
+        STATS_KEY.format(name=name, outcome=outcome)
+        for name in TRACKED_CACHES
+        for outcome in ('hits', 'misses')
+    ]
+    counts = cache.get_many(keys)
+    stats = {}
+    for name in TRACKED_CACHES:
+        hits = counts.get(STATS_KEY.format(name=name, outcome='hits'), 0)
+        misses = counts.get(STATS_KEY.format(name=name, outcome='misses'), 0)
+        lookups = hits + misses
+        stats[name] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / lookups, 4) if lookups else None,
+        }
+    return stats
+
+
+def reset_cache_stats():
+    cache.delete_many([
+        STATS_KEY.format(name=name, outcome=outcome)
+        for name in TRACKED_CACHES
+        for outcome in ('hits', 'misses')
+    ])
@@ -0,0 +1,110 @@
+"""
+Conditional GET (ETag / Last-Modified) for the read endpoints.
+
+Validators are derived from the version data kept by ``jobs.caching`` and are
+never computed from the response body. List views use the jobs generation,
+which every job, company, category and job type write bumps. The job detail
+view uses the job's ``updated_at`` and the stamps of the objects it embeds.
+A request whose ``If-None-Match`` or ``If-Modified-Since`` still matches gets
+a 304 after one Redis round trip (lists) or one single-row query (detail),
+without querying the rows or running the serializer.
+
+ETags are weak: view and application counters are not part of them, so a 304
+may carry counters that are slightly behind.
+"""
+import hashlib
+from datetime import datetime, timezone
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .caching import get_job_detail_refs, get_jobs_version
+
+
+def make_etag(*parts):
+    digest = hashlib.sha1(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return 'W/' + quote_etag(digest)
+
+
+class ConditionalGetMixin:
+    """Answer GET requests with 304 Not Modified when the client's copy is current"""
+
+    def get_validators(self, request, *args, **kwargs):
+        """Return ``(etag, last_modified datetime or None)``, or None to skip the check"""
+        raise NotImplementedError
+
+    def get_representation_key(self, request):
+        """Everything besides the data that changes the body: host, query and format"""
+        renderer = getattr(request, 'accepted_renderer', None)
+        return (
+            request.get_host(), request.path,
+            sorted(request.query_params.lists()),
+            getattr(renderer, 'format', ''),
+        )
+
+    def not_modified(self, request, response, *args, **kwargs):
+        """Hook for side effects that must happen even when the body is skipped"""
+        return response
+
+    def get(self, request, *args, **kwargs):
+        validators = self.get_validators(request, *args, **kwargs)
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is not None:
+            response = self.not_modified(request, response, *args, **kwargs)
+        else:
+            response = super().get(request, *args, **kwargs)
+            if not 200 <= response.status_code < 300:
+                return response
+
+        response['ETag'] = etag
+        if timestamp is not None:
+            response['Last-Modified'] = http_date(timestamp)
+        return response
+
+
+class JobsVersionConditionalMixin(ConditionalGetMixin):
+    """Validators for list views whose payload only changes with the jobs generation"""
+
+    def get_validators(self, request, *args, **kwargs):
+        generation, modified = get_jobs_version()
+        # Kept for views that also key a cache on the generation
+        self.jobs_generation = generation
+        last_modified = datetime.fromtimestamp(modified, tz=timezone.utc) if modified else None
+        return make_etag(generation, self.get_representation_key(request)), last_modified
+
+
+class JobDetailConditionalMixin(ConditionalGetMixin):
+    """Validators for a single job from its row timestamp and embedded object stamps"""
+
+    def get_validators(self, request, *args, **kwargs):
+        row = (
+            self.get_queryset().model.objects
+            .filter(**{self.lookup_field: kwargs[self.lookup_field]})
+            .values('pk', 'updated_at', 'company_id', 'category_id', 'job_type_id')
+            .first()
+        )
+        if row is None:
+            # Let the regular path answer with 404
+            return None
+
+        self.validated_job_id = row['pk']
+        stamps = get_job_detail_refs({
+            'company': row['company_id'],
+            'category': row['category_id'],
+            'job_type': row['job_type_id'],
+        })
+        last_modified = max(
+            [row['updated_at']]
+            + [datetime.fromtimestamp(stamp, tz=timezone.utc) for stamp in stamps.values()
+               if isinstance(stamp, (int, float))]
+        )
+        etag = make_etag(
+            row['pk'], row['updated_at'].isoformat(), sorted(stamps.items()),
+            self.get_representation_key(request),
+        )
+        return etag, last_modified
@@ -0,0 +1,196 @@
+"""
+Denormalized counters.
+
+Category, Company and JobType store ``active_jobs_count`` so serializers can
+expose ``jobs_count`` without running a COUNT query per row. The counters are
+kept in step with ``Job`` writes by ``Job.save`` and the ``post_delete``
+receiver in ``jobs.signals``; ``rebuild_active_job_counters`` recomputes them
+from scratch.
+
+``Job.applications_count`` is moved with atomic F() increments only when an
+application is created, deleted or reassigned to another job, and
+``reconcile_applications_count`` repairs any drift in batches.
+"""
+from collections import Counter
+
+from django.apps import apps
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from .refdata import refresh_reference_counts
+
+
+# Job foreign keys whose targets carry an ``active_jobs_count`` column
+COUNTED_RELATIONS = ('company', 'category', 'job_type')
+
+# Job fields that can move a job in or out of a counter
+COUNTER_FIELDS = frozenset(
+    ['status'] + list(COUNTED_RELATIONS) + [f'{name}_id' for name in COUNTED_RELATIONS]
+)
+
+
+def job_counter_state(job):
+    """Return the (company_id, category_id, job_type_id) a job counts towards, or None"""
+    if job.status != 'active':
+        return None
+    return tuple(getattr(job, f'{name}_id') for name in COUNTED_RELATIONS)
+
+
+def locked_counter_state(job):
+    """Lock the persisted job row and return the counter state stored in the database"""
+    if job._state.adding or job.pk is None:
+        return None
+
+    fields = ['status'] + [f'{name}_id' for name in COUNTED_RELATIONS]
+    row = (
+        type(job)._default_manager.select_for_update()
+        .filter(pk=job.pk)
+        .values_list(*fields)
+        .first()
+    )
+    if row is None or row[0] != 'active':
+        return None
+    return tuple(row[1:])
+
+
+def apply_counter_delta(old_state, new_state):
+    """Move a job from one counter state to another with atomic F() updates"""
+    if old_state == new_state:
+        return
+
+    Job = apps.get_model('jobs', 'Job')
+    changed = {}
+    for index, name in enumerate(COUNTED_RELATIONS):
+        model = Job._meta.get_field(name).related_model
+        old_id = old_state[index] if old_state else None
+        new_id = new_state[index] if new_state else None
+        if old_id == new_id:
+            continue
+        changed[name] = {pk for pk in (old_id, new_id) if pk is not None}
+        if old_id is not None:
+            model.objects.filter(pk=old_id).update(
+                active_jobs_count=Greatest(F('active_jobs_count') - 1, Value(0))
+            )
+        if new_id is not None:
+            model.objects.filter(pk=new_id).update(
+                active_jobs_count=F('active_jobs_count') + 1
+            )
+    # The cached serialized rows carry jobs_count
+    refresh_reference_counts(changed)
+
+
+def count_inserted_jobs(jobs, using='default'):
+    """Add jobs inserted without ``save()`` (e.g. ``bulk_create``) to the counters, one UPDATE per model"""
+    shift_job_counters(map(job_counter_state, jobs), 1, using=using)
+
+
+def shift_job_counters(states, sign, using='default'):
+    """Add (``sign=1``) or remove (``sign=-1``) jobs given by counter state, one UPDATE per model"""
+    Job = apps.get_model('jobs', 'Job')
+    states = [state for state in states if state]
+    changed = {}
+    for index, name in enumerate(COUNTED_RELATIONS):
+        increments = Counter(state[index] for state in states)
+        if increments:
+            model = Job._meta.get_field(name).related_model
+            deltas = {pk: sign * count for pk, count in increments.items()}
+            increment_counts(model, 'active_jobs_count', deltas, using=using)
+            changed[name] = set(increments)
+    refresh_reference_counts(changed, using=using)
+
+
+def rebuild_active_job_counters(using='default'):
+    """Recompute every counter from the jobs table; returns rows updated per model"""
+    Job = apps.get_model('jobs', 'Job')
+    updated = {}
+    for name in COUNTED_RELATIONS:
+        model = Job._meta.get_field(name).related_model
+        active_jobs = (
+            Job.objects.using(using)
+            .filter(**{name: OuterRef('pk')}, status='active')
+            .order_by()
+            .values(name)
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        updated[model._meta.label] = model.objects.using(using).update(
+            active_jobs_count=Coalesce(Subquery(active_jobs), Value(0))
+        )
+    return updated
+
+
+def find_counter_drift(using='default'):
+    """Return (model label, pk, stored, actual) for every counter that is out of date"""
+    Job = apps.get_model('jobs', 'Job')
+    drift = []
+    for name in COUNTED_RELATIONS:
+        model = Job._meta.get_field(name).related_model
+        rows = (
+            model.objects.using(using)
+            .annotate(actual=Count('jobs', filter=Q(jobs__status='active')))
+            .exclude(active_jobs_count=F('actual'))
+            .values_list('pk', 'active_jobs_count', 'actual')
+        )
+        drift.extend((model._meta.label, pk, stored, actual) for pk, stored, actual in rows)
+    return drift
+
+
+def increment_counts(model, field, increments, using='default'):
+    """Apply ``{pk: delta}`` to a counter column in one UPDATE, never going below zero"""
+    increments = {pk: delta for pk, delta in increments.items() if delta}
+    if not increments:
+        return 0
+    delta = Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in increments.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    return model.objects.using(using).filter(pk__in=increments).update(
+        **{field: Greatest(F(field) + delta, Value(0), output_field=IntegerField())}
+    )
+
+
+def raise_counts(model, field, values, using='default'):
+    """Raise a counter column to at least ``{pk: value}`` in one UPDATE; counters never go down"""
+    if not values:
+        return 0
+    floor = Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    return model.objects.using(using).filter(pk__in=values).update(
+        **{field: Greatest(F(field), floor, output_field=IntegerField())}
+    )
+
+
+def recount_applications(job_ids, using='default'):
+    """Set applications_count to the exact count for the given jobs, one UPDATE in total"""
+    Job = apps.get_model('jobs', 'Job')
+    Application = apps.get_model('jobs', 'Application')
+    exact = (
+        Application.objects.using(using)
+        .filter(job=OuterRef('pk'))
+        .order_by()
+        .values('job')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Job.objects.using(using).filter(pk__in=job_ids).update(
+        applications_count=Coalesce(Subquery(exact), Value(0))
+    )
+
+
+def reconcile_applications_count(start_pk, end_pk, dry_run=False, using='default'):
+    """Repair applications_count drift for jobs with ``start_pk <= pk < end_pk``; returns drifted rows"""
+    Job = apps.get_model('jobs', 'Job')
+    drift = list(
+        Job.objects.using(using)
+        .filter(pk__gte=start_pk, pk__lt=end_pk)
+        .annotate(actual=Count('applications'))
+        .exclude(applications_count=F('actual'))
+        .values_list('pk', 'applications_count', 'actual')
+    )
+    if drift and not dry_run:
+        recount_applications([pk for pk, _, _ in drift], using=using)
+    return drift
@@ -0,0 +1,189 @@
+"""
+Job alert digest delivery.
+
+Delivery runs in two checkpointed phases:
+
+1. Plan: the alerts that are due for their ``frequency`` are matched in one
+   pass (``jobs.alerts``) and the matches are stored as one
+   ``JobAlertDigest`` per user. The same transaction moves ``last_sent`` of
+   every due alert to the match cut-off, so the same jobs are never planned
+   twice, whether a crash happens before or after it.
+2. Deliver: pending digests are claimed in batches (``sending``), rendered in
+   parallel by a process pool, sent over one email connection and marked
+   ``sent``.
+
+A crash while delivering leaves at most one batch in ``sending``. Whether those
+emails left is unknown, so they are not resent unless asked to
+(``retry_unconfirmed``); everything else resumes where it stopped.
+"""
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connections, transaction
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .alerts import load_alerts, mark_alerts_sent, match_alerts
+from .models import Job, JobAlert, JobAlertDigest
+
+
+FREQUENCY_PERIODS = {
+    'daily': timedelta(days=1),
+    'weekly': timedelta(weeks=1),
+    'monthly': timedelta(days=30),
+}
+
+# Lets a scheduled run fire slightly early without skipping a period
+SCHEDULE_TOLERANCE = timedelta(hours=1)
+
+
+def due_alerts(now):
+    """Active alerts never sent, or last sent at least one period ago"""
+    due = Q(last_sent__isnull=True)
+    for frequency, period in FREQUENCY_PERIODS.items():
+        due |= Q(frequency=frequency, last_sent__lte=now - period + SCHEDULE_TOLERANCE)
+    return JobAlert.objects.filter(is_active=True).filter(due)
+
+
+def plan_digests(now=None):
+    """Match due alerts and store one pending digest per user; returns (alerts, digests)"""
+    now = now or timezone.now()
+    alerts = load_alerts(due_alerts(now))
+    if not alerts:
+        return 0, 0
+
+    matches, cutoff = match_alerts(alerts, now)
+    by_user = defaultdict(dict)
+    for alert, job_ids in matches:
+        by_user[alert.user_id][str(alert.id)] = job_ids
+
+    with transaction.atomic():
+        JobAlertDigest.objects.bulk_create([
+            JobAlertDigest(user_id=user_id, matches=user_matches, cutoff=cutoff)
+            for user_id, user_matches in by_user.items()
+        ], batch_size=1000)
+        mark_alerts_sent([alert.id for alert in alerts], cutoff)
+    return len(alerts), len(by_user)
+
+
+def claim_batch(batch_size):
+    """Move the next pending digests to ``sending`` and return them"""
+    with transaction.atomic():
+        batch = list(
+            JobAlertDigest.objects.select_for_update(skip_locked=True)
+            .filter(status='pending')
+            .order_by('id')[:batch_size]
+        )
+        if batch:
+            JobAlertDigest.objects.filter(pk__in=[digest.pk for digest in batch]).update(status='sending')
+    return batch
+
+
+def build_payloads(digests):
+    """Plain, picklable render input for each digest, read with one query per table"""
+    alert_ids = {int(alert_id) for digest in digests for alert_id in digest.matches}
+    job_ids = {job_id for digest in digests for ids in digest.matches.values() for job_id in ids}
+
+    users = User.objects.in_bulk({digest.user_id for digest in digests})
+    alert_names = dict(JobAlert.objects.filter(pk__in=alert_ids).values_list('id', 'name'))
+    # Jobs closed or deleted since planning are left out
+    jobs = {
+        row['id']: row
+        for row in Job.objects.filter(pk__in=job_ids, status='active').values(
+            'id', 'title', 'slug', 'location', 'is_remote', 'company__name'
+        )
+    }
+
+    payloads = []
+    for digest in digests:
+        user = users.get(digest.user_id)
+        alerts = []
+        for alert_id, ids in digest.matches.items():
+            alert_jobs = [
+                {
+                    'title': jobs[job_id]['title'],
+                    'company': jobs[job_id]['company__name'],
+                    'location': jobs[job_id]['location'],
+                    'is_remote': jobs[job_id]['is_remote'],
+                    'url': f"{settings.SITE_URL}/api/jobs/{jobs[job_id]['slug']}/",
+                }
+                for job_id in ids if job_id in jobs
+            ]
+            if alert_jobs:
+                alerts.append({'name': alert_names.get(int(alert_id), 'Job alert'), 'jobs': alert_jobs})
+        payloads.append({
+            'digest_id': digest.pk,
+            'email': user.email if user else '',
+            'name': (user.get_full_name() or user.username) if user else '',
+            'alerts': alerts,
+            'job_count': len({job['url'] for alert in alerts for job in alert['jobs']}),
+        })
+    return payloads
+
+
+def render_digest(payload):
+    """Render one digest email; runs in the worker processes"""
+    subject = f"{payload['job_count']} new job{'s' if payload['job_count'] != 1 else ''} matching your alerts"
+    return (
+        payload['digest_id'],
+        payload['email'],
+        subject,
+        render_to_string('jobs/emails/job_alert_digest.txt', payload),
+        render_to_string('jobs/emails/job_alert_digest.html', payload),
+    )
+
+
+def deliver_digests(batch_size=100, workers=1, retry_unconfirmed=False, log=None):
+    """Render and send pending digests batch by batch; returns (sent, skipped)"""
+    if retry_unconfirmed:
+        JobAlertDigest.objects.filter(status='sending').update(status='pending')
+
+    pool = None
+    if workers > 1:
+        # Forked workers must not share the parent's database sockets
+        connections.close_all()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+
+    sent = skipped = 0
+    email_connection = get_connection()
+    email_connection.open()
+    try:
+        while True:
+            batch = claim_batch(batch_size)
+            if not batch:
+                break
+
+            payloads = build_payloads(batch)
+            deliverable = [payload for payload in payloads if payload['email'] and payload['alerts']]
+            if pool:
+                rendered = list(pool.map(render_digest, deliverable, chunksize=max(1, len(deliverable) // workers)))
+            else:
+                rendered = [render_digest(payload) for payload in deliverable]
+
+            messages = []
+            for digest_id, email, subject, text, html in rendered:
+                message = EmailMultiAlternatives(subject, text, settings.DEFAULT_FROM_EMAIL, [email])
+                message.attach_alternative(html, 'text/html')
+                messages.append(message)
+            email_connection.send_messages(messages)
+
+            now = timezone.now()
+            sent_ids = [digest_id for digest_id, *_ in rendered]
+            skipped_ids = [payload['digest_id'] for payload in payloads if payload['digest_id'] not in sent_ids]
+            JobAlertDigest.objects.filter(pk__in=sent_ids).update(status='sent', sent_at=now)
+            JobAlertDigest.objects.filter(pk__in=skipped_ids).update(status='skipped')
+            sent += len(sent_ids)
+            skipped += len(skipped_ids)
+            if log:
+                log(f'Sent {sent} digests, skipped {skipped}')
+    finally:
+        email_connection.close()
+        if pool:
+            pool.shutdown()
+    return sent, skipped
@@ -0,0 +1,67 @@
+"""
+Closing jobs past their ``expires_at``.
+
+``Job.is_expired`` is only evaluated in Python, so a job that expires stays
+``active`` in the database, keeps matching every ``status='active'`` list,
+count and filter, and keeps counting towards ``active_jobs_count``. The
+``close_expired_jobs`` command sweeps such jobs to ``closed``.
+
+Each batch is its own short transaction: the rows are picked with
+``SELECT ... FOR UPDATE SKIP LOCKED`` (``Job.save`` locks the row it updates,
+so an edit in flight is simply left for the next batch or run), closed with one
+UPDATE and taken off the counters with one UPDATE per counted model. A queryset
+``update()`` sends no signals, so once the batch commits the cached detail
+payloads of the closed jobs are dropped and the jobs generation is bumped here,
+which also refreshes the conditional GET validators.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_jobs_generation, invalidate_job_details
+from .counters import COUNTED_RELATIONS, shift_job_counters
+from .models import Job
+
+
+def expired_jobs(now=None, using='default'):
+    """Active jobs whose ``expires_at`` has passed"""
+    return Job.objects.using(using).filter(status='active', expires_at__lte=now or timezone.now())
+
+
+def close_expired_batch(now, batch_size=200, using='default'):
+    """Close up to ``batch_size`` expired jobs in one transaction; returns how many were closed"""
+    with transaction.atomic(using=using):
+        rows = list(
+            expired_jobs(now, using)
+            .select_for_update(skip_locked=True)
+            .order_by('pk')
+            .values_list('pk', 'slug', *[f'{name}_id' for name in COUNTED_RELATIONS])[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        Job.objects.using(using).filter(pk__in=[row[0] for row in rows]).update(
+            status='closed', updated_at=now
+        )
+        shift_job_counters([row[2:] for row in rows], -1, using=using)
+
+        slugs = [row[1] for row in rows]
+
+        def invalidate():
+            invalidate_job_details(slugs)
+            bump_jobs_generation()
+
+        transaction.on_commit(invalidate, using=using)
+    return len(rows)
+
+
+def close_expired_jobs(batch_size=200, limit=None, using='default'):
+    """Close every job that expired by now, batch by batch; returns the number closed"""
+    now = timezone.now()
+    closed = 0
+    while limit is None or closed < limit:
+        size = batch_size if limit is None else min(batch_size, limit - closed)
+        count = close_expired_batch(now, size, using)
+        closed += count
+        if count < size:
+            break
+    return closed
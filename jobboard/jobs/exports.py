@@ -0,0 +1,107 @@
+"""
+Streaming exports of jobs and applications.
+
+Rows are read with ``iterator(chunk_size=...)``, which on PostgreSQL runs
+through a server-side cursor, and are encoded by the renderers in
+``jobs.renderers`` as they arrive, so memory use stays flat whatever the table
+size. Rows are exported as plain tuples (no model instances) in primary key
+order, which lets a client resume an interrupted export by passing the last
+id it received as ``after_id``.
+"""
+from dataclasses import dataclass
+
+from .models import Application, Job
+
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_CHUNK_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    model: type
+    # (column name, field path) pairs, in output order
+    columns: tuple
+    # Field the since/until range applies to
+    date_field: str
+    # Path to the company id, for the company filter
+    company_field: str
+
+    @property
+    def column_names(self):
+        return [name for name, _ in self.columns]
+
+
+EXPORTS = {
+    'jobs': ExportSpec(
+        model=Job,
+        columns=(
+            ('id', 'id'),
+            ('title', 'title'),
+            ('slug', 'slug'),
+            ('status', 'status'),
+            ('company_id', 'company_id'),
+            ('company', 'company__name'),
+            ('category_id', 'category_id'),
+            ('category', 'category__name'),
+            ('job_type_id', 'job_type_id'),
+            ('job_type', 'job_type__name'),
+            ('location', 'location'),
+            ('is_remote', 'is_remote'),
+            ('salary_min', 'salary_min'),
+            ('salary_max', 'salary_max'),
+            ('currency', 'currency'),
+            ('experience_level', 'experience_level'),
+            ('tags', 'tags'),
+            ('views_count', 'views_count'),
+            ('applications_count', 'applications_count'),
+            ('posted_by_id', 'posted_by_id'),
+            ('created_at', 'created_at'),
+            ('updated_at', 'updated_at'),
+            ('activated_at', 'activated_at'),
+            ('expires_at', 'expires_at'),
+        ),
+        date_field='created_at',
+        company_field='company_id',
+    ),
+    'applications': ExportSpec(
+        model=Application,
+        columns=(
+            ('id', 'id'),
+            ('job_id', 'job_id'),
+            ('company_id', 'job__company_id'),
+            ('applicant_id', 'applicant_id'),
+            ('status', 'status'),
+            ('expected_salary', 'expected_salary'),
+            ('availability_date', 'availability_date'),
+            ('applied_at', 'applied_at'),
+            ('updated_at', 'updated_at'),
+            ('reviewed_at', 'reviewed_at'),
+        ),
+        date_field='applied_at',
+        company_field='job__company_id',
+    ),
+}
+
+
+def export_rows(name, status=None, since=None, until=None, company=None, after_id=None,
+                chunk_size=EXPORT_CHUNK_SIZE, using='default'):
+    """
+    Stream the rows of one export as tuples in ``EXPORTS[name].columns`` order.
+
+    ``since`` is inclusive and ``until`` exclusive; ``after_id`` skips every
+    row up to and including that id.
+    """
+    spec = EXPORTS[name]
+    queryset = spec.model.objects.using(using).order_by('pk')
+    if status:
+        queryset = queryset.filter(status=status)
+    if since:
+        queryset = queryset.filter(**{f'{spec.date_field}__gte': since})
+    if until:
+        queryset = queryset.filter(**{f'{spec.date_field}__lt': until})
+    if company:
+        queryset = queryset.filter(**{spec.company_field: company})
+    if after_id:
+        queryset = queryset.filter(pk__gt=after_id)
+    return queryset.values_list(*(path for _, path in spec.columns)).iterator(chunk_size=chunk_size)
@@ -0,0 +1,118 @@
+"""
+Faceted counts for the job list.
+
+All requested facets are counted in one ``GROUP BY GROUPING SETS`` query over
+the filtered job queryset, so adding a facet never adds a round trip. Results
+are cached per normalized filter set and jobs generation (see ``jobs.caching``).
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import F
+from rest_framework.exceptions import ValidationError
+
+from .caching import get_jobs_generation
+from .models import Job
+
+
+# Facet name -> (value path, label path or None)
+FACETS = {
+    'category': ('category_id', 'category__name'),
+    'job_type': ('job_type_id', 'job_type__name'),
+    'experience_level': ('experience_level', None),
+    'is_remote': ('is_remote', None),
+}
+
+FACETS_PARAM = 'facets'
+
+# Query parameters that change the page but not the set of matching jobs
+NON_FILTER_PARAMS = {FACETS_PARAM, 'page', 'page_size', 'cursor', 'ordering', 'format'}
+
+CHOICE_LABELS = {
+    'experience_level': dict(Job.EXPERIENCE_LEVELS),
+}
+
+
+def parse_facets(value):
+    """Validate a comma-separated facet list, returning the names in canonical order"""
+    requested = {name.strip() for name in (value or '').split(',') if name.strip()}
+    unknown = requested - set(FACETS)
+    if unknown:
+        raise ValidationError({
+            FACETS_PARAM: f"Unknown facets: {', '.join(sorted(unknown))}. "
+                          f"Choose from: {', '.join(FACETS)}."
+        })
+    return [name for name in FACETS if name in requested]
+
+
+def facet_cache_key(query_params, facets, generation):
+    """Cache key for a normalized filter set (sorted, non-empty, page params dropped)"""
+    items = sorted(
+        (key, value)
+        for key in query_params
+        if key not in NON_FILTER_PARAMS
+        for value in query_params.getlist(key)
+        if value != ''
+    )
+    digest = hashlib.sha1(urlencode(items + [(FACETS_PARAM, ','.join(facets))]).encode()).hexdigest()
+    return f'job_facets:{generation}:{digest}'
+
+
+def compute_facet_counts(queryset, facets):
+    """Count the filtered jobs per value of each facet in a single query"""
+    columns = {}
+    for index, name in enumerate(facets):
+        value_path, label_path = FACETS[name]
+        columns[f'facet{index}_value'] = F(value_path)
+        if label_path:
+            columns[f'facet{index}_label'] = F(label_path)
+
+    inner = queryset.order_by().values(**columns)
+    inner_sql, params = inner.query.sql_with_params()
+
+    grouping_sets = []
+    for index, name in enumerate(facets):
+        group = [f'facet{index}_value']
+        if FACETS[name][1]:
+            group.append(f'facet{index}_label')
+        grouping_sets.append(f"({', '.join(group)})")
+
+    select = [f'GROUPING(facet{index}_value)' for index in range(len(facets))]
+    select += list(columns)
+    sql = (
+        f"SELECT {', '.join(select)}, COUNT(*) FROM ({inner_sql}) AS faceted "
+        f"GROUP BY GROUPING SETS ({', '.join(grouping_sets)})"
+    )
+
+    counts = {name: [] for name in facets}
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    aliases = list(columns)
+    for row in rows:
+        grouping, values, count = row[:len(facets)], row[len(facets):-1], row[-1]
+        # GROUPING() is 0 for the column this row was grouped by
+        index = grouping.index(0)
+        name = facets[index]
+        row_values = dict(zip(aliases, values))
+        value = row_values[f'facet{index}_value']
+        label = row_values.get(f'facet{index}_label', CHOICE_LABELS.get(name, {}).get(value, value))
+        counts[name].append({'value': value, 'label': label, 'count': count})
+
+    for name in facets:
+        counts[name].sort(key=lambda item: (-item['count'], str(item['label'])))
+    return counts
+
+
+def get_facet_counts(queryset, query_params, facets):
+    """Facet counts for the filtered queryset, cached per normalized filter set"""
+    cache_key = facet_cache_key(query_params, facets, get_jobs_generation())
+    counts = cache.get(cache_key)
+    if counts is None:
+        counts = compute_facet_counts(queryset, facets)
+        cache.set(cache_key, counts, getattr(settings, 'FACETS_CACHE_TTL', 300))
+    return counts
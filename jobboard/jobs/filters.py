@@ -1,6 +1,7 @@
 import django_filters
-from django.db.models import Q
 from .models import Job
+from .search import search_jobs
+from .tags import jobs_with_all_tags, jobs_with_any_tag, parse_tags
 
 
 class JobFilter(django_filters.FilterSet):
@@ -29,39 +30,35 @@ class JobFilter(django_filters.FilterSet):
     created_after = django_filters.DateTimeFilter(field_name='created_at', lookup_expr='gte')
     created_before = django_filters.DateTimeFilter(field_name='created_at', lookup_expr='lte')
     
-    # Tags filter
+    # Tags filters (exact tag names, comma-separated)
     tags = django_filters.CharFilter(method='filter_tags')
+    tags_all = django_filters.CharFilter(method='filter_tags_all')
     
     class Meta:
         model = Job
         fields = ['search', 'category', 'company', 'job_type', 'location', 
                  'is_remote', 'experience_level', 'salary_min', 'salary_max',
-                 'created_after', 'created_before', 'tags']
+                 'created_after', 'created_before', 'tags', 'tags_all']
     
     def filter_search(self, queryset, name, value):
-        """Search across multiple fields"""
+        """Full-text search across title, tags, company, location and description"""
         if not value:
             return queryset
         
-        return queryset.filter(
-            Q(title__icontains=value) |
-            Q(description__icontains=value) |
-            Q(company__name__icontains=value) |
-            Q(location__icontains=value) |
-            Q(tags__icontains=value)
-        )
+        return search_jobs(queryset, value)
     
     def filter_tags(self, queryset, name, value):
-        """Filter by tags (comma-separated)"""
-        if not value:
+        """Filter jobs having any of the given tags (comma-separated)"""
+        tags = parse_tags(value)
+        if not tags:
             return queryset
         
-        tags = [tag.strip() for tag in value.split(',') if tag.strip()]
+        return queryset.filter(pk__in=jobs_with_any_tag(tags))
+    
+    def filter_tags_all(self, queryset, name, value):
+        """Filter jobs having all of the given tags (comma-separated)"""
+        tags = parse_tags(value)
         if not tags:
             return queryset
         
-        query = Q()
-        for tag in tags:
-            query |= Q(tags__icontains=tag)
-        
-        return queryset.filter(query)
+        return queryset.filter(pk__in=jobs_with_all_tags(tags))
@@ -0,0 +1,166 @@
+"""
+Per-request SQL and timing instrumentation.
+
+``RequestInstrumentationMiddleware`` starts a ``RequestMetrics`` for every
+request and makes it current through a context variable. Every database
+connection carries a permanent execute wrapper (installed from
+``JobsConfig.ready`` through ``connection_created``) that adds the query's
+duration to the current metrics, if any. Context variables follow a request
+into ``sync_to_async`` threads, so queries made by the async views are counted
+too.
+
+A request's time is split into:
+
+* ``db``: time spent executing SQL,
+* ``render``: time DRF spends rendering the response body (``TimedJSONRenderer``),
+* ``app``: everything else in views and serializers, i.e. Python time,
+* ``total``: wall time through the middleware.
+
+The split is sent in a ``Server-Timing`` header. Requests slower than
+``SLOW_REQUEST_THRESHOLD_MS`` are logged to ``jobs.instrumentation`` as one
+JSON record with the view name, query count and the SQL statements that ran
+more than once (after collapsing ``IN (...)`` lists), which is what an N+1
+looks like.
+
+The hot path is a context variable lookup, two ``perf_counter`` calls and a
+dict increment per query, so the middleware can stay enabled in production.
+"""
+import contextvars
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from rest_framework.renderers import JSONRenderer
+
+
+logger = logging.getLogger(__name__)
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+
+# Statements reported per slow request
+MAX_DUPLICATES_LOGGED = 5
+
+PLACEHOLDER_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+
+
+class RequestMetrics:
+    """Counters for one request, filled in by the execute wrapper and the renderer"""
+    __slots__ = ('started', 'queries', 'db_time', 'render_time', 'statements', 'aliases', 'route')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.statements = Counter()
+        self.aliases = Counter()
+        self.route = None  # (alias, reason) chosen by ReplicaRoutingMiddleware, if enabled
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def duplicates(self, limit=MAX_DUPLICATES_LOGGED):
+        """SQL run more than once, as ``{'fingerprint', 'count', 'sql'}``, most repeated first"""
+        grouped = Counter()
+        for sql, count in self.statements.items():
+            grouped[PLACEHOLDER_LIST.sub('(...)', sql)] += count
+        return [
+            {'fingerprint': fingerprint(sql), 'count': count, 'sql': sql[:300]}
+            for sql, count in grouped.most_common(limit) if count > 1
+        ]
+
+
+def fingerprint(sql):
+    return hashlib.sha1(sql.encode()).hexdigest()[:12]
+
+
+def current_metrics():
+    """The metrics of the request being handled, or None outside the middleware"""
+    return _current.get()
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every connection"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - started
+        metrics.queries += 1
+        metrics.statements[sql] += 1
+        metrics.aliases[context['connection'].alias] += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install():
+    """Hook the query recorder into every database connection; called from ``JobsConfig.ready``"""
+    connection_created.connect(install_query_recorder, dispatch_uid='jobs.instrumentation')
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """JSONRenderer that reports its time to the current request's metrics"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        metrics = _current.get()
+        if metrics is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics.render_time += time.perf_counter() - started
+
+
+def start_request():
+    """Make fresh metrics current; returns them and the token for ``end_request``"""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def report_request(request, response, metrics):
+    """Add the Server-Timing header and log the request if it was slow; returns the total time"""
+    total = metrics.elapsed()
+    db, render = metrics.db_time, metrics.render_time
+    app = max(0.0, total - db - render)
+
+    if getattr(settings, 'SERVER_TIMING_HEADER', True):
+        response['Server-Timing'] = (
+            f'db;dur={db * 1000:.2f};desc="{metrics.queries} queries", '
+            f'app;dur={app * 1000:.2f}, render;dur={render * 1000:.2f}, total;dur={total * 1000:.2f}'
+        )
+        if metrics.route:
+            response['Server-Timing'] += f', route;desc="{metrics.route[0]} ({metrics.route[1]})"'
+
+    if total * 1000 >= getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 500):
+        match = getattr(request, 'resolver_match', None)
+        logger.warning('slow_request %s', json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 2),
+            'db_ms': round(db * 1000, 2),
+            'app_ms': round(app * 1000, 2),
+            'render_ms': round(render * 1000, 2),
+            'queries': metrics.queries,
+            'databases': dict(metrics.aliases),
+            'route': dict(zip(('alias', 'reason'), metrics.route)) if metrics.route else None,
+            'duplicate_queries': metrics.duplicates(),
+        }))
+    return total
@@ -0,0 +1,97 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.advisor import DEFAULT_MIN_ROWS, analyze
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN (ANALYZE, BUFFERS) the queries of the job list, filter, application list and '
+        'statistics views against the current data and report sequential scans, unused indexes '
+        'and suggested indexes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=['text', 'json'],
+            default='text',
+            help='Output format',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the report to this file instead of stdout',
+        )
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=DEFAULT_MIN_ROWS,
+            help='Only suggest indexes for tables with at least this many rows',
+        )
+        parser.add_argument(
+            '--no-timing',
+            action='store_true',
+            help='Leave out durations, buffer and row counts and index scan statistics, for diffing',
+        )
+        parser.add_argument(
+            '--fail-on-suggestions',
+            action='store_true',
+            help='Exit with an error if any index is suggested',
+        )
+
+    def handle(self, *args, **options):
+        report = analyze(min_rows=options['min_rows'], timing=not options['no_timing'])
+        if not report['scenarios']:
+            raise CommandError('No active jobs to analyse; load some data first (generate_load_data)')
+
+        if options['format'] == 'json':
+            output = json.dumps(report, indent=2, sort_keys=True, default=str) + '\n'
+        else:
+            output = self.render_text(report)
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                handle.write(output)
+        else:
+            self.stdout.write(output, ending='')
+
+        if options['fail_on_suggestions'] and report['suggestions']:
+            raise CommandError(f"{len(report['suggestions'])} indexes suggested")
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f"Successfully wrote index report to {options['output']}!"))
+
+    def render_text(self, report):
+        lines = ['Scenarios']
+        for scenario in report['scenarios']:
+            params = '&'.join(f'{key}={value}' for key, value in scenario['params'].items())
+            lines.append(f"  {scenario['name']}" + (f' ({params})' if params else ''))
+            if 'error' in scenario:
+                lines.append(f"    error: {scenario['error']}")
+                continue
+            for query in scenario['queries']:
+                if 'error' in query:
+                    lines.append(f"    [{query['fingerprint']}] error: {query['error']}")
+                    continue
+                timing = f" {query['execution_ms']:.2f} ms" if 'execution_ms' in query else ''
+                repeat = f" x{query['count']}" if query['count'] > 1 else ''
+                lines.append(f"    [{query['fingerprint']}]{timing}{repeat}: {' -> '.join(query['nodes'])}")
+
+        lines.append('')
+        lines.append('Sequential scans')
+        for scan in report['seq_scans']:
+            rows = f" ({scan['table_rows']} rows, {scan['rows_removed']} filtered out)" if 'table_rows' in scan else ''
+            lines.append(f"  {scan['table']}{rows} in {scan['scenario']}: {scan['filter'] or 'no filter'}")
+
+        lines.append('')
+        lines.append('Unused indexes (not unique, not used by any scenario, never scanned since the stats reset)')
+        lines.extend(f'  {name}' for name in report['unused_indexes'])
+
+        lines.append('')
+        lines.append('Suggested indexes')
+        for suggestion in report['suggestions']:
+            lines.append(f"  {suggestion['sql']}")
+            lines.append(f"    {suggestion['reason']}; seen in {', '.join(suggestion['scenarios'])}")
+        if not report['suggestions']:
+            lines.append('  none')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from jobs.caching import cache_hit_ratios, reset_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Report hit/miss counts and hit ratios of the job list and job detail caches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after reporting them',
+        )
+
+    def handle(self, *args, **options):
+        for name, stats in cache_hit_ratios().items():
+            ratio = 'n/a' if stats['hit_ratio'] is None else f"{stats['hit_ratio']:.1%}"
+            self.stdout.write(f"{name}: {stats['hits']} hits, {stats['misses']} misses, hit ratio {ratio}")
+        
+        if options['reset']:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Successfully reset cache statistics!'))
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.expiry import close_expired_jobs, expired_jobs
+
+
+class Command(BaseCommand):
+    help = 'Close active jobs past their expiry date, in small batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of jobs closed per transaction',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Close at most this many jobs per sweep',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, sweeping every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=60.0,
+            help='Seconds to sleep between sweeps when running with --loop',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report how many jobs have expired',
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to sweep',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = expired_jobs(using=options['database']).count()
+            self.stdout.write(f'{count} active jobs have expired')
+            return
+
+        while True:
+            closed = close_expired_jobs(
+                batch_size=options['batch_size'], limit=options['limit'], using=options['database']
+            )
+            if closed or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f'Successfully closed {closed} expired jobs!'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,102 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.exports import EXPORT_CHUNK_SIZE, EXPORTS, export_rows
+from jobs.renderers import CSVRenderer, NDJSONRenderer
+from jobs.serializers import ApplicationExportQuerySerializer, JobExportQuerySerializer
+
+
+RENDERERS = {
+    'ndjson': NDJSONRenderer,
+    'csv': CSVRenderer,
+}
+
+QUERY_SERIALIZERS = {
+    'jobs': JobExportQuerySerializer,
+    'applications': ApplicationExportQuerySerializer,
+}
+
+
+class Command(BaseCommand):
+    help = 'Stream all jobs or applications to a file (or stdout) as NDJSON or CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'export',
+            choices=sorted(EXPORTS),
+            help='What to export',
+        )
+        parser.add_argument(
+            '--format',
+            choices=sorted(RENDERERS),
+            default='ndjson',
+            help='Output format (default: ndjson)',
+        )
+        parser.add_argument(
+            '--output',
+            help='File to write to; defaults to stdout',
+        )
+        parser.add_argument(
+            '--status',
+            help='Only export rows with this status',
+        )
+        parser.add_argument(
+            '--since',
+            help='Only export rows created (applied) at or after this ISO 8601 date/time',
+        )
+        parser.add_argument(
+            '--until',
+            help='Only export rows created (applied) before this ISO 8601 date/time',
+        )
+        parser.add_argument(
+            '--company',
+            type=int,
+            help='Only export rows of this company id',
+        )
+        parser.add_argument(
+            '--after-id',
+            type=int,
+            help='Resume after this id (the last one of an interrupted export)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help='Rows fetched from the database cursor at a time',
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to export from',
+        )
+
+    def handle(self, *args, **options):
+        name = options['export']
+        params = QUERY_SERIALIZERS[name](data={
+            key: options[key]
+            for key in ('status', 'since', 'until', 'company', 'after_id')
+            if options[key] is not None
+        })
+        if not params.is_valid():
+            raise CommandError(
+                '; '.join(f'{field}: {" ".join(map(str, errors))}' for field, errors in params.errors.items())
+            )
+
+        renderer = RENDERERS[options['format']]()
+        rows = export_rows(
+            name, chunk_size=options['chunk_size'], using=options['database'], **params.validated_data
+        )
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in renderer.stream(EXPORTS[name].column_names, rows):
+                output.write(chunk)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
+
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f'Successfully exported {name} to {options["output"]}!'))
@@ -0,0 +1,59 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from jobs.tracking import (
+    acquire_flush_lock, buffered_view_count, flush_job_views, release_flush_lock
+)
+
+
+class Command(BaseCommand):
+    help = 'Write buffered job views to the database and update job view counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of buffered views to process per transaction',
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Keep running, flushing every --interval seconds',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Seconds to sleep between flushes when running with --loop',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            self.flush(options['batch_size'])
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def flush(self, batch_size):
+        if not acquire_flush_lock(timeout=300):
+            self.stdout.write(self.style.WARNING('Another flusher is running, skipping'))
+            return
+        
+        try:
+            total_read = total_stored = 0
+            while True:
+                read, stored = flush_job_views(batch_size)
+                total_read += read
+                total_stored += stored
+                if read < batch_size:
+                    break
+        finally:
+            release_flush_lock()
+        
+        if total_read:
+            self.stdout.write(
+                f'Flushed {total_read} buffered views, stored {total_stored} new views '
+                f'({buffered_view_count()} still buffered)'
+            )
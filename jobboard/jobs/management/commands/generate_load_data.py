@@ -0,0 +1,148 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from jobs.synthetic import ScaleConfig, generate
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a production-scale synthetic dataset (companies, users, jobs, applications, '
+        'views, saved jobs and alerts) with COPY, in parallel and reproducibly from a seed'
+    )
+
+    def add_arguments(self, parser):
+        defaults = ScaleConfig()
+        parser.add_argument('--seed', type=int, default=defaults.seed, help='Random seed')
+        parser.add_argument('--companies', type=int, default=defaults.companies, help='Number of companies')
+        parser.add_argument('--users', type=int, default=defaults.users, help='Number of users')
+        parser.add_argument('--jobs', type=int, default=defaults.jobs, help='Number of jobs')
+        parser.add_argument('--alerts', type=int, default=defaults.alerts, help='Number of job alerts')
+        parser.add_argument(
+            '--applications-per-job',
+            type=float,
+            default=defaults.applications_per_job,
+            help='Average applications per job',
+        )
+        parser.add_argument(
+            '--views-per-job',
+            type=float,
+            default=defaults.views_per_job,
+            help='Average views per job',
+        )
+        parser.add_argument(
+            '--saves-per-job',
+            type=float,
+            default=defaults.saves_per_job,
+            help='Average saves per job',
+        )
+        parser.add_argument(
+            '--company-skew',
+            type=float,
+            default=defaults.company_skew,
+            help='Zipf exponent of jobs per company; higher gives fewer, larger employers',
+        )
+        parser.add_argument(
+            '--hot-job-alpha',
+            type=float,
+            default=defaults.hot_job_alpha,
+            help='Pareto shape of job popularity (> 1); lower concentrates traffic on fewer hot jobs',
+        )
+        parser.add_argument(
+            '--status-weights',
+            default=','.join(map(str, defaults.status_weights)),
+            help='Relative weights of active,closed,paused,draft jobs',
+        )
+        parser.add_argument(
+            '--remote-ratio',
+            type=float,
+            default=defaults.remote_ratio,
+            help='Share of remote jobs',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=defaults.days,
+            help='Days of history to spread timestamps over',
+        )
+        parser.add_argument(
+            '--end',
+            help='ISO 8601 date/time the history ends at (default: now); fix it for identical reruns',
+        )
+        parser.add_argument(
+            '--shard-size',
+            type=int,
+            default=defaults.shard_size,
+            help='Jobs or alerts generated and loaded per transaction',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker processes loading shards in parallel',
+        )
+        parser.add_argument(
+            '--username-prefix',
+            default=defaults.username_prefix,
+            help='Prefix of generated usernames (followed by the seed)',
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to load into',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            status_weights = tuple(float(weight) for weight in options['status_weights'].split(','))
+        except ValueError:
+            raise CommandError('--status-weights must be four comma-separated numbers')
+        if len(status_weights) != 4 or not any(status_weights):
+            raise CommandError('--status-weights must be four comma-separated numbers')
+        if options['hot_job_alpha'] <= 1:
+            raise CommandError('--hot-job-alpha must be greater than 1')
+        if min(options['companies'], options['users']) < 1:
+            raise CommandError('--companies and --users must be at least 1')
+
+        config = ScaleConfig(
+            seed=options['seed'],
+            companies=options['companies'],
+            users=options['users'],
+            jobs=options['jobs'],
+            applications_per_job=options['applications_per_job'],
+            views_per_job=options['views_per_job'],
+            saves_per_job=options['saves_per_job'],
+            alerts=options['alerts'],
+            company_skew=options['company_skew'],
+            hot_job_alpha=options['hot_job_alpha'],
+            status_weights=status_weights,
+            remote_ratio=options['remote_ratio'],
+            days=options['days'],
+            end=self.parse_end(options['end']),
+            shard_size=options['shard_size'],
+            username_prefix=options['username_prefix'],
+        )
+
+        try:
+            totals = generate(
+                config, workers=options['workers'], using=options['database'], log=self.stdout.write
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for name, count in totals.items():
+            self.stdout.write(f'{name}: {count}')
+        self.stdout.write(self.style.SUCCESS('Successfully generated load test data!'))
+
+    def parse_end(self, value):
+        if not value:
+            return None
+        end = parse_datetime(value)
+        if end is None:
+            day = parse_date(value)
+            if day is None:
+                raise CommandError('--end must be an ISO 8601 date or date/time')
+            end = datetime.combine(day, time())
+        return end if timezone.is_aware(end) else timezone.make_aware(end)
@@ -1,8 +1,9 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth.models import User
+from django.utils import timezone
 from jobs.models import Category, Company, JobType, Job
 from decimal import Decimal
-from datetime import datetime, timedelta
+from datetime import timedelta
 import random
 
 
@@ -264,7 +265,7 @@ class Command(BaseCommand):
         
         for job_data in jobs_data:
             job_data['posted_by'] = user
-            job_data['expires_at'] = datetime.now() + timedelta(days=30)
+            job_data['expires_at'] = timezone.now() + timedelta(days=30)
             
             job, created = Job.objects.get_or_create(
                 title=job_data['title'],
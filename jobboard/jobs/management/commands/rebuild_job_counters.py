@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.counters import find_counter_drift, rebuild_active_job_counters
+from jobs.refdata import invalidate_all_reference_data
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the denormalized active job counters on categories, companies and job types'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report counters that are out of date, without changing them',
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to rebuild counters in',
+        )
+
+    def handle(self, *args, **options):
+        database = options['database']
+        
+        if options['check']:
+            drift = find_counter_drift(using=database)
+            for label, pk, stored, actual in drift:
+                self.stdout.write(f'{label} #{pk}: stored {stored}, actual {actual}')
+            if drift:
+                self.stdout.write(self.style.WARNING(f'{len(drift)} counters are out of date'))
+            else:
+                self.stdout.write(self.style.SUCCESS('All counters are up to date'))
+            return
+        
+        with transaction.atomic(using=database):
+            updated = rebuild_active_job_counters(using=database)
+        # Cached reference rows and list pages embed jobs_count, and update() sends no signals
+        invalidate_all_reference_data(using=database)
+        
+        for label, count in updated.items():
+            self.stdout.write(f'Rebuilt {count} {label} counters')
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt active job counters!'))
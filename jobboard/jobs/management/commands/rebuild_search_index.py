@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from jobs.caching import bump_jobs_generation
+from jobs.models import Job
+from jobs.search import search_document_expression
+
+
+class Command(BaseCommand):
+    help = 'Build the full-text search documents for existing jobs in id-ordered batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of job ids to update per transaction',
+        )
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Only build documents for jobs that do not have one yet',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Job.objects.all()
+        if options['missing_only']:
+            queryset = queryset.filter(search_document__isnull=True)
+        
+        bounds = queryset.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('No jobs need a search document')
+            return
+        
+        updated = 0
+        start = bounds['first']
+        while start <= bounds['last']:
+            with transaction.atomic():
+                updated += queryset.filter(pk__gte=start, pk__lt=start + batch_size).update(
+                    search_document=search_document_expression()
+                )
+            start += batch_size
+            self.stdout.write(f'Indexed {updated} jobs (up to id {min(start - 1, bounds["last"])})')
+        
+        # Search results may have changed, and update() sends no signals
+        bump_jobs_generation()
+        self.stdout.write(self.style.SUCCESS(f'Successfully indexed {updated} jobs!'))
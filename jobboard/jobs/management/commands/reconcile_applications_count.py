@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max, Min
+
+from jobs.counters import reconcile_applications_count
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Repair drift between Job.applications_count and the actual number of applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5000,
+            help='Number of job ids to check per transaction',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report drifted jobs, without repairing them',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        dry_run = options['dry_run']
+        bounds = Job.objects.aggregate(first=Min('pk'), last=Max('pk'))
+        if bounds['first'] is None:
+            self.stdout.write('No jobs to reconcile')
+            return
+        
+        drifted = 0
+        start = bounds['first']
+        while start <= bounds['last']:
+            with transaction.atomic():
+                drift = reconcile_applications_count(start, start + batch_size, dry_run=dry_run)
+            for pk, stored, actual in drift:
+                self.stdout.write(f'Job #{pk}: stored {stored}, actual {actual}')
+            drifted += len(drift)
+            start += batch_size
+        
+        if dry_run:
+            self.stdout.write(self.style.WARNING(f'{drifted} jobs have a drifted applications_count'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Successfully repaired {drifted} jobs!'))
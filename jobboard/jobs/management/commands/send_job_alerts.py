@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.digests import deliver_digests, plan_digests
+
+
+LOCK_KEY = 'job_alerts:send_lock'
+
+
+class Command(BaseCommand):
+    help = 'Match due job alerts and email one digest per user, resuming any unfinished run'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Number of digests rendered and sent per batch',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of processes rendering digests (1, the default, renders in this process)',
+        )
+        parser.add_argument(
+            '--retry-unconfirmed',
+            action='store_true',
+            help='Resend digests whose delivery was interrupted and may or may not have been sent',
+        )
+        parser.add_argument(
+            '--lock-timeout',
+            type=int,
+            default=60 * 60,
+            help='Seconds after which the lock of a crashed run expires',
+        )
+
+    def handle(self, *args, **options):
+        if not cache.add(LOCK_KEY, '1', options['lock_timeout']):
+            raise CommandError('Another send_job_alerts run is in progress')
+        
+        try:
+            alerts, digests = plan_digests()
+            self.stdout.write(f'Matched {alerts} due alerts into {digests} new digests')
+            
+            sent, skipped = deliver_digests(
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                retry_unconfirmed=options['retry_unconfirmed'],
+                log=self.stdout.write,
+            )
+        finally:
+            cache.delete(LOCK_KEY)
+        
+        self.stdout.write(self.style.SUCCESS(
+            f'Successfully sent {sent} job alert digests ({skipped} skipped)!'
+        ))
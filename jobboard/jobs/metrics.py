@@ -0,0 +1,127 @@
+"""
+Prometheus metrics, exposed in the text format at ``/metrics``.
+
+Every request is observed by ``RequestInstrumentationMiddleware`` (latency,
+status code and query count per URL name; see ``jobs.instrumentation``), the
+``InstrumentedRedisCache`` backend counts cache hits and misses, read-replica
+routing decisions are counted per alias and reason (``jobs.routers``), and the
+write paths count jobs created, applications submitted and job views tracked.
+
+gunicorn and uvicorn run several worker processes, each with its own
+counters. When ``PROMETHEUS_MULTIPROC_DIR`` is set (before the first import of
+``prometheus_client``), every process writes its samples to memory-mapped
+files in that directory and ``/metrics`` merges the files of all processes, so
+any worker can answer the scrape. The directory must be emptied before the
+server starts; ``gunicorn.conf.py`` sets the variable, does that and cleans up
+after dead workers. Without the variable (``runserver``, management commands),
+or if its directory does not exist, the metrics live in the process only.
+
+Labels are limited to URL names, methods, status codes, cache outcomes and
+database aliases so the number of series stays bounded whatever clients
+request.
+"""
+import hmac
+import os
+
+from django.conf import settings
+from django.core.cache.backends.redis import RedisCache
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+
+# prometheus_client picks its storage when first imported and would fail on
+# the first metric below if the directory is missing; count in memory instead
+if not os.path.isdir(os.environ.get('PROMETHEUS_MULTIPROC_DIR', '')):
+    os.environ.pop('PROMETHEUS_MULTIPROC_DIR', None)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess,
+)
+
+
+# Label for requests that did not resolve to a URL pattern (404s)
+UNMATCHED_VIEW = '<unmatched>'
+
+REQUEST_LATENCY = Histogram(
+    'jobboard_http_request_duration_seconds',
+    'Request latency through the middleware stack, per URL name',
+    ['view', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+RESPONSES = Counter(
+    'jobboard_http_responses',
+    'Responses per URL name and status code',
+    ['view', 'method', 'status'],
+)
+REQUEST_QUERIES = Histogram(
+    'jobboard_http_request_db_queries',
+    'SQL queries executed per request, per URL name',
+    ['view'],
+    buckets=(0, 1, 2, 4, 6, 8, 10, 15, 20, 30, 50, 100),
+)
+CACHE_LOOKUPS = Counter(
+    'jobboard_cache_lookups',
+    'Keys looked up in the Redis cache, by outcome',
+    ['result'],
+)
+DB_ROUTES = Counter(
+    'jobboard_db_routes',
+    'Requests per database their reads were routed to, and why (see jobs.routers)',
+    ['alias', 'reason'],
+)
+JOBS_CREATED = Counter('jobboard_jobs_created', 'Jobs created')
+APPLICATIONS_SUBMITTED = Counter('jobboard_applications_submitted', 'Job applications submitted')
+JOB_VIEWS_TRACKED = Counter('jobboard_job_views_tracked', 'Job views queued for the view flusher')
+
+_MISSING = object()
+
+
+def observe_request(request, response, metrics, total):
+    """Record one finished request; ``metrics`` is its ``jobs.instrumentation.RequestMetrics``"""
+    match = getattr(request, 'resolver_match', None)
+    view = match.view_name if match else UNMATCHED_VIEW
+    REQUEST_LATENCY.labels(view, request.method).observe(total)
+    RESPONSES.labels(view, request.method, response.status_code).inc()
+    REQUEST_QUERIES.labels(view).observe(metrics.queries)
+    if metrics.route:
+        DB_ROUTES.labels(*metrics.route).inc()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """RedisCache that counts hits and misses of ``get`` and ``get_many`` (and so ``get_or_set``)"""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            CACHE_LOOKUPS.labels('miss').inc()
+            return default
+        CACHE_LOOKUPS.labels('hit').inc()
+        return value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        values = super().get_many(keys, version)
+        if values:
+            CACHE_LOOKUPS.labels('hit').inc(len(values))
+        if len(keys) > len(values):
+            CACHE_LOOKUPS.labels('miss').inc(len(keys) - len(values))
+        return values
+
+
+def collect():
+    """The exposition text of all worker processes, or of this process outside multiprocess mode"""
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+@require_GET
+def metrics_view(request):
+    """Prometheus scrape endpoint; needs ``Authorization: Bearer <METRICS_TOKEN>`` if a token is set"""
+    token = settings.METRICS_TOKEN
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(collect(), content_type=CONTENT_TYPE_LATEST)
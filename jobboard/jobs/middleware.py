@@ -0,0 +1,83 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .instrumentation import current_metrics, end_request, report_request, start_request
+from .metrics import observe_request
+from .routers import choose_read_alias, end_routing, pin_to_primary, start_routing
+
+
+class RequestInstrumentationMiddleware:
+    """Count queries and time every request (see jobs.instrumentation and jobs.metrics); list it first"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        metrics, token = start_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request(token)
+        total = report_request(request, response, metrics)
+        observe_request(request, response, metrics, total)
+        return response
+
+    async def __acall__(self, request):
+        metrics, token = start_request()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request(token)
+        total = report_request(request, response, metrics)
+        observe_request(request, response, metrics, total)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """Send the reads of safe jobs requests to a replica (see jobs.routers); list it after the instrumentation"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        token = self.start(request, choose_read_alias(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            end_routing(token)
+        pin_to_primary(request, response)
+        return response
+
+    async def __acall__(self, request):
+        # The cache lookups block, but the context variable must be set in this coroutine
+        route = await sync_to_async(choose_read_alias)(request)
+        token = self.start(request, route)
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_routing(token)
+        await sync_to_async(pin_to_primary)(request, response)
+        return response
+
+    def start(self, request, route):
+        metrics = current_metrics()
+        if metrics is not None:
+            metrics.route = route
+        return start_routing(route[0])
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.6 on 2026-10-17 05:58
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_active_jobs_count(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    for field_name, model_name in [('company', 'Company'), ('category', 'Category'), ('job_type', 'JobType')]:
+        model = apps.get_model('jobs', model_name)
+        active_jobs = (
+            Job.objects.filter(**{field_name: OuterRef('pk')}, status='active')
+            .order_by()
+            .values(field_name)
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        model.objects.update(active_jobs_count=Coalesce(Subquery(active_jobs), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_jobs_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='active_jobs_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobtype',
+            name='active_jobs_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_active_jobs_count, migrations.RunPython.noop),
+    ]
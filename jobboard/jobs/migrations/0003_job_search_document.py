@@ -0,0 +1,76 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+
+
+SEARCH_DOCUMENT_SQL = """
+CREATE OR REPLACE FUNCTION jobs_job_search_document(
+    title text, tags text, location text, description text, company_id bigint
+) RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('pg_catalog.english', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('pg_catalog.english', coalesce(tags, '')), 'A')
+        || setweight(to_tsvector('pg_catalog.english', coalesce(
+               (SELECT name FROM jobs_company WHERE id = company_id), '')), 'B')
+        || setweight(to_tsvector('pg_catalog.english', coalesce(location, '')), 'C')
+        || setweight(to_tsvector('pg_catalog.english', coalesce(description, '')), 'D');
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION jobs_job_search_document_trigger() RETURNS trigger AS $$
+BEGIN
+    NEW.search_document := jobs_job_search_document(
+        NEW.title, NEW.tags, NEW.location, NEW.description, NEW.company_id
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_job_search_document_sync
+    BEFORE INSERT OR UPDATE OF title, tags, location, description, company_id ON jobs_job
+    FOR EACH ROW EXECUTE FUNCTION jobs_job_search_document_trigger();
+
+CREATE OR REPLACE FUNCTION jobs_company_search_document_trigger() RETURNS trigger AS $$
+BEGIN
+    UPDATE jobs_job
+       SET search_document = jobs_job_search_document(title, tags, location, description, company_id)
+     WHERE company_id = NEW.id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER jobs_company_search_document_sync
+    AFTER UPDATE OF name ON jobs_company
+    FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+    EXECUTE FUNCTION jobs_company_search_document_trigger();
+"""
+
+DROP_SEARCH_DOCUMENT_SQL = """
+DROP TRIGGER IF EXISTS jobs_company_search_document_sync ON jobs_company;
+DROP FUNCTION IF EXISTS jobs_company_search_document_trigger();
+DROP TRIGGER IF EXISTS jobs_job_search_document_sync ON jobs_job;
+DROP FUNCTION IF EXISTS jobs_job_search_document_trigger();
+DROP FUNCTION IF EXISTS jobs_job_search_document(text, text, text, text, bigint);
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_active_jobs_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_document',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_document'], name='jobs_job_search_gin'),
+        ),
+        migrations.RunSQL(SEARCH_DOCUMENT_SQL, DROP_SEARCH_DOCUMENT_SQL),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_tags_from_strings(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Tag = apps.get_model('jobs', 'Tag')
+    JobTag = apps.get_model('jobs', 'JobTag')
+
+    job_tags = {}
+    for job_id, tags in Job.objects.exclude(tags__isnull=True).exclude(tags='').values_list('id', 'tags').iterator():
+        names = []
+        for raw in tags.split(','):
+            name = ' '.join(raw.split()).lower()[:50]
+            if name and name not in names:
+                names.append(name)
+        job_tags[job_id] = names
+
+    all_names = set().union(*job_tags.values()) if job_tags else set()
+    now = timezone.now()
+    Tag.objects.bulk_create([Tag(name=name, created_at=now) for name in all_names], ignore_conflicts=True)
+    tag_ids = dict(Tag.objects.values_list('name', 'id'))
+
+    links = [
+        JobTag(job_id=job_id, tag_id=tag_ids[name])
+        for job_id, names in job_tags.items()
+        for name in names
+    ]
+    JobTag.objects.bulk_create(links, batch_size=5000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tag_links', to='jobs.job')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_links', to='jobs.tag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='tag_set',
+            field=models.ManyToManyField(blank=True, related_name='jobs', through='jobs.JobTag', to='jobs.tag'),
+        ),
+        migrations.AddIndex(
+            model_name='jobtag',
+            index=models.Index(fields=['tag', 'job'], name='jobs_jobtag_tag_id_6d646f_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='jobtag',
+            unique_together={('job', 'tag')},
+        ),
+        migrations.RunPython(populate_tags_from_strings, migrations.RunPython.noop),
+    ]
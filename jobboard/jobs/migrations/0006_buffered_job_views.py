@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:05
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_tag_model'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobview',
+            name='viewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddIndex(
+            model_name='jobview',
+            index=models.Index(fields=['job', 'ip_address', 'user'], name='jobs_jobvie_job_id_0e0a42_idx'),
+        ),
+    ]
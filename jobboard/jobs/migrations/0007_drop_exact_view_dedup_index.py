@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:06
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_buffered_job_views'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobview',
+            name='jobs_jobvie_job_id_0e0a42_idx',
+        ),
+    ]
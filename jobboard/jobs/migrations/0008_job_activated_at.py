@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:14
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_activated_at(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.filter(status='active').update(activated_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_drop_exact_view_dedup_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='activated_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'activated_at'], name='jobs_job_status_713669_idx'),
+        ),
+        migrations.RunPython(backfill_activated_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-17 06:37
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0009_job_alert_digest'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='job',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['-created_at', '-id'], name='jobs_job_active_created_idx'),
+        ),
+    ]
@@ -1,15 +1,23 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 import uuid
+from collections import Counter
+
+from . import counters
+from .tags import sync_job_tags
 
 
 class Category(models.Model):
     """Job categories for organizing jobs by industry/type"""
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, null=True)
+    active_jobs_count = models.PositiveIntegerField(default=0)  # Maintained by jobs.counters
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -33,6 +41,7 @@ class Company(models.Model):
     location = models.CharField(max_length=200, blank=True, null=True)
     size = models.CharField(max_length=50, blank=True, null=True)  # e.g., "1-10", "11-50", etc.
     industry = models.CharField(max_length=100, blank=True, null=True)
+    active_jobs_count = models.PositiveIntegerField(default=0)  # Maintained by jobs.counters
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -42,6 +51,7 @@ class Company(models.Model):
         indexes = [
             models.Index(fields=['name']),
             models.Index(fields=['industry']),
+            GinIndex(fields=['name'], name='jobs_company_name_trgm', opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
@@ -52,6 +62,19 @@ class JobType(models.Model):
     """Job types like Full-time, Part-time, Contract, etc."""
     name = models.CharField(max_length=50, unique=True)
     description = models.TextField(blank=True, null=True)
+    active_jobs_count = models.PositiveIntegerField(default=0)  # Maintained by jobs.counters
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class Tag(models.Model):
+    """Normalized skill/keyword tag attached to jobs"""
+    name = models.CharField(max_length=50, unique=True)  # Lower-cased, see jobs.tags.parse_tags
+    created_at = models.DateTimeField(auto_now_add=True)
     
     class Meta:
         ordering = ['name']
@@ -104,10 +127,13 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     expires_at = models.DateTimeField(blank=True, null=True)
+    activated_at = models.DateTimeField(blank=True, null=True, editable=False)  # Last switch to active; drives job alerts
     
     # SEO and Search
     slug = models.SlugField(max_length=250, unique=True, blank=True)
     tags = models.CharField(max_length=500, blank=True, null=True)  # Comma-separated tags
+    tag_set = models.ManyToManyField(Tag, through='JobTag', related_name='jobs', blank=True)
+    search_document = SearchVectorField(null=True, editable=False)  # Maintained by database triggers
     
     # Analytics
     views_count = models.PositiveIntegerField(default=0)
@@ -126,6 +152,16 @@ class Job(models.Model):
             models.Index(fields=['category', 'status']),
             models.Index(fields=['job_type', 'status']),
             models.Index(fields=['is_remote', 'status']),
+            models.Index(fields=['status', 'activated_at']),
+            # Live postings in list order (keyset pagination adds id); expired ones are swept to closed
+            models.Index(
+                fields=['-created_at', '-id'],
+                name='jobs_job_active_created_idx',
+                condition=Q(status='active'),
+            ),
+            GinIndex(fields=['search_document'], name='jobs_job_search_gin'),
+            GinIndex(fields=['title'], name='jobs_job_title_trgm', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['location'], name='jobs_job_location_trgm', opclasses=['gin_trgm_ops']),
         ]
     
     def __str__(self):
@@ -142,7 +178,22 @@ class Job(models.Model):
         self.clean()
         if not self.slug:
             self.slug = f"{self.title}-{self.company.name}".lower().replace(' ', '-')
-        super().save(*args, **kwargs)
+        
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not counters.COUNTER_FIELDS.union(['tags']).intersection(update_fields):
+            super().save(*args, **kwargs)
+            return
+        
+        with transaction.atomic(using=kwargs.get('using')):
+            old_state = counters.locked_counter_state(self)
+            if old_state is None and self.status == 'active':
+                self.activated_at = timezone.now()
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'activated_at'}
+            super().save(*args, **kwargs)
+            counters.apply_counter_delta(old_state, counters.job_counter_state(self))
+            if update_fields is None or 'tags' in update_fields:
+                sync_job_tags([self])
     
     @property
     def is_expired(self):
@@ -153,6 +204,40 @@ class Job(models.Model):
         return self.status == 'active' and not self.is_expired
 
 
+class JobTag(models.Model):
+    """Link between a job and one of its tags"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='tag_links')
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='job_links')
+    
+    class Meta:
+        unique_together = ['job', 'tag']
+        indexes = [
+            # Serves tag -> jobs lookups as an index-only scan
+            models.Index(fields=['tag', 'job']),
+        ]
+    
+    def __str__(self):
+        return f"{self.job_id} tagged {self.tag_id}"
+
+
+class ApplicationQuerySet(models.QuerySet):
+    def bulk_create(self, objs, batch_size=None, ignore_conflicts=False, **kwargs):
+        """Insert applications and bump each affected job's applications_count once"""
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(
+                objs, batch_size=batch_size, ignore_conflicts=ignore_conflicts, **kwargs
+            )
+            if ignore_conflicts or kwargs.get('update_conflicts'):
+                # Skipped/updated rows are not reported back, so recount the touched jobs
+                counters.recount_applications({obj.job_id for obj in objs}, using=self.db)
+            else:
+                counters.increment_counts(
+                    Job, 'applications_count', Counter(obj.job_id for obj in created), using=self.db
+                )
+        return created
+
+
 class Application(models.Model):
     """Job applications model"""
     STATUS_CHOICES = [
@@ -190,6 +275,8 @@ class Application(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     reviewed_at = models.DateTimeField(blank=True, null=True)
     
+    objects = ApplicationQuerySet.as_manager()
+    
     # Unique constraint to prevent duplicate applications
     class Meta:
         unique_together = ['job', 'applicant']
@@ -204,14 +291,38 @@ class Application(models.Model):
     def __str__(self):
         return f"{self.applicant.get_full_name()} applied for {self.job.title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember which job this application counts towards
+        instance._loaded_job_id = instance.__dict__.get('job_id')
+        return instance
+    
     def save(self, *args, **kwargs):
         if not self.email:
             self.email = self.applicant.email
-        super().save(*args, **kwargs)
         
-        # Update job applications count
-        self.job.applications_count = self.job.applications.count()
-        self.job.save(update_fields=['applications_count'])
+        update_fields = kwargs.get('update_fields')
+        old_job_id = getattr(self, '_loaded_job_id', None)
+        adding = self._state.adding
+        reassigned = (
+            not adding and old_job_id is not None and old_job_id != self.job_id
+            and (update_fields is None or {'job', 'job_id'}.intersection(update_fields))
+        )
+        if not (adding or reassigned):
+            # Status and note edits never touch the job row
+            super().save(*args, **kwargs)
+            return
+        
+        increments = Counter({self.job_id: 1})
+        if reassigned:
+            increments[old_job_id] -= 1
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            counters.increment_counts(Job, 'applications_count', increments, using=self._state.db)
+        self._loaded_job_id = self.job_id
+        if Application.job.is_cached(self):
+            self.job.applications_count += 1
 
 
 class JobView(models.Model):
@@ -220,7 +331,7 @@ class JobView(models.Model):
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
     ip_address = models.GenericIPAddressField()
     user_agent = models.TextField(blank=True, null=True)
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    viewed_at = models.DateTimeField(default=timezone.now)  # Set when buffered, not when flushed
     
     class Meta:
         indexes = [
@@ -273,3 +384,29 @@ class JobAlert(models.Model):
     
     def __str__(self):
         return f"{self.name} for {self.user.get_full_name()}"
+
+
+class JobAlertDigest(models.Model):
+    """One user's pending or delivered job alert email; the checkpoint of send_job_alerts"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('skipped', 'Skipped'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_alert_digests')
+    matches = models.JSONField()  # {alert id: [job ids]}
+    cutoff = models.DateTimeField()  # Jobs activated up to this moment are included
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"Job alert digest for {self.user} ({self.status})"
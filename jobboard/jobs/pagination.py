@@ -0,0 +1,219 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+KeysetCursor = namedtuple('KeysetCursor', ['reverse', 'position'])
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset ("seek") pagination over the view's ordering plus a primary key tie-breaker.
+
+    Unlike DRF's CursorPagination, which positions on the first ordering field and
+    falls back to OFFSET for duplicates, the cursor stores the full sort key of the
+    boundary row. Each page is a single range query of the form
+    ``(created_at, id) < (:created_at, :id)`` that walks the ordering index, and no
+    total count is computed. NULLs follow PostgreSQL's default of sorting after
+    every value, so nullable ordering fields such as ``salary_min`` still work.
+    """
+    ordering = '-created_at'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.ordering = self.get_keyset_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        current_position = self.cursor.position if self.cursor else None
+
+        if reverse:
+            queryset = queryset.order_by(*self.reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(self.get_seek_filter(current_position, reverse))
+
+        # Fetch one extra row to find out whether another page follows
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_following = len(results) > len(self.page)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_following
+        else:
+            self.has_next = has_following
+            self.has_previous = current_position is not None
+
+        if self.page:
+            self.next_position = self.get_position(self.page[-1])
+            self.previous_position = self.get_position(self.page[0])
+        else:
+            # An empty page can only follow a stale cursor; point both links back at it
+            self.next_position = self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_keyset_ordering(self, request, queryset, view):
+        """Return the view's ordering with a primary key tie-breaker appended"""
+        pk_name = self.model._meta.pk.name
+        ordering = [
+            field.replace('pk', pk_name) if field.lstrip('-') == 'pk' else field
+            for field in self.get_ordering(request, queryset, view)
+        ]
+        if pk_name not in [field.lstrip('-') for field in ordering]:
+            ordering.append(f'-{pk_name}' if ordering[0].startswith('-') else pk_name)
+        return tuple(ordering)
+
+    @staticmethod
+    def reverse_ordering(ordering):
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    def get_seek_filter(self, position, reverse):
+        """Build the lexicographic "strictly after this position" condition"""
+        ordering = self.reverse_ordering(self.ordering) if reverse else self.ordering
+        keys = []
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            model_field = self.get_model_field(name)
+            nullable = model_field is None or model_field.null
+            keys.append((name, field.startswith('-'), value, nullable))
+
+        condition = self._seek(keys)
+        name, descending, value, nullable = keys[0]
+        if value is not None and not nullable:
+            # Redundant leading bound so the planner gets an index range condition
+            condition &= Q(**{f'{name}__{"lte" if descending else "gte"}': value})
+        return condition
+
+    def _seek(self, keys):
+        name, descending, value, nullable = keys[0]
+        if value is None:
+            after = Q(**{f'{name}__isnull': False}) if descending else None
+            equal = Q(**{f'{name}__isnull': True})
+        else:
+            after = Q(**{f'{name}__{"lt" if descending else "gt"}': value})
+            if nullable and not descending:
+                after |= Q(**{f'{name}__isnull': True})
+            equal = Q(**{name: value})
+
+        if len(keys) == 1:
+            return after if after is not None else Q(pk__in=[])
+        following = equal & self._seek(keys[1:])
+        return following if after is None else after | following
+
+    def get_model_field(self, name):
+        """Return the model field behind an ordering term, or None for annotations"""
+        try:
+            return self.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+
+    def get_position(self, instance):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            model_field = self.get_model_field(name)
+            value = getattr(instance, name)
+            if value is None or model_field is None:
+                # Annotations (e.g. search relevance) are stored as plain JSON values
+                position.append(value)
+            else:
+                position.append(model_field.value_to_string(instance))
+        return position
+
+    def parse_position_value(self, name, raw):
+        model_field = self.get_model_field(name)
+        if raw is None:
+            return None
+        if model_field is None:
+            if not isinstance(raw, (int, float)):
+                raise ValueError('Annotation cursor values must be numeric')
+            return raw
+        return model_field.to_python(raw)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            tokens = json.loads(urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            if tokens['o'] != list(self.ordering) or len(tokens['p']) != len(self.ordering):
+                raise ValueError('Cursor does not match the requested ordering')
+            position = [
+                self.parse_position_value(field.lstrip('-'), raw)
+                for field, raw in zip(self.ordering, tokens['p'])
+            ]
+            reverse = bool(tokens.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return KeysetCursor(reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {'o': list(self.ordering), 'p': cursor.position}
+        if cursor.reverse:
+            tokens['r'] = 1
+        payload = json.dumps(tokens, separators=(',', ':')).encode('utf-8')
+        encoded = urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(KeysetCursor(reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(KeysetCursor(reverse=True, position=self.previous_position))
+
+
+class PageNumberOrKeysetPagination(PageNumberPagination):
+    """
+    Page-number pagination by default; keyset pagination when ``?cursor=`` is present.
+
+    Passing an empty ``cursor`` parameter requests the first keyset page, whose
+    response carries opaque ``next``/``previous`` cursors instead of a ``count``.
+    """
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_pagination_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.keyset is not None:
+            return self.keyset.to_html()
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        keyset = self.keyset_pagination_class()
+        return super().get_schema_operation_parameters(view) + keyset.get_schema_operation_parameters(view)
@@ -0,0 +1,33 @@
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline-delimited JSON: one JSON document per line.
+
+    Parsing is lazy: ``request.data`` is a generator that reads and decodes
+    the body one line at a time, so a large upload is never held in memory as
+    a whole. Blank lines are skipped, and a line that is not valid JSON is
+    yielded as a ``ParseError`` in its place instead of failing the request.
+    """
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        return self.iter_lines(stream, encoding)
+
+    def iter_lines(self, stream, encoding):
+        if stream is None:
+            return
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line.decode(encoding))
+            except (UnicodeDecodeError, ValueError) as exc:
+                yield ParseError(f'Line {number}: JSON parse error - {exc}')
@@ -0,0 +1,243 @@
+"""
+Per-process cache of the reference data embedded in job payloads.
+
+Categories, job types and companies are small, read-mostly tables. Each worker
+keeps them already serialized and keyed by primary key, so the job serializers
+attach the nested ``company``/``category``/``job_type`` by id and job queries
+need no joins for them.
+
+Every table has a version key in Redis. Writes to these tables set a new
+version once the transaction commits and then bump the jobs generation, so no
+list page rendered from the old data stays reachable; processes reload the
+whole table.
+
+Job writes only move ``active_jobs_count``, so they do not touch the version.
+Each table also has a counts sequence: a committed counter change increments it
+and logs the changed primary keys under the new sequence number for
+``COUNT_LOG_TTL`` seconds. A process that is behind reads just the logged rows'
+counts and patches ``jobs_count`` in place; if entries are missing (expired,
+evicted or not yet written) or it is more than ``MAX_COUNT_LOG_GAP`` changes
+behind, it rereads the counts column of the table, still without serializing
+any row. Job detail payloads are not invalidated by counter changes, so their
+nested ``jobs_count`` may lag by up to ``JOB_DETAIL_CACHE_TTL``; list pages are
+already dropped by the job write itself.
+
+A serialization checks the version and counts keys with a single MGET. When
+Redis is unreachable the tables are read from the database for that
+serialization instead.
+"""
+import logging
+import time
+
+import redis
+from django.core.cache import cache
+from django.db import DatabaseError, transaction
+
+from .caching import bump_job_detail_ref, bump_jobs_generation
+
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'refdata_version:{name}'
+COUNTS_KEY = 'refdata_counts:{name}'
+COUNT_LOG_KEY = 'refdata_counts:{name}:{seq}'
+
+# Seconds a counter change is kept for processes that are behind
+COUNT_LOG_TTL = 60 * 60
+
+# Beyond this many missed changes a process rereads all counts of the table
+MAX_COUNT_LOG_GAP = 100
+
+# Job foreign keys served from the cache
+REFERENCE_NAMES = ('company', 'category', 'job_type')
+
+
+def _sources():
+    from .models import Category, Company, JobType
+    from .serializers import CategorySerializer, CompanySerializer, JobTypeSerializer
+
+    return {
+        'company': (Company, CompanySerializer),
+        'category': (Category, CategorySerializer),
+        'job_type': (JobType, JobTypeSerializer),
+    }
+
+
+def _version_key(name):
+    return VERSION_KEY.format(name=name)
+
+
+def _counts_key(name):
+    return COUNTS_KEY.format(name=name)
+
+
+def _serialize(name, objects):
+    serializer_class = _sources()[name][1]
+    return {obj.pk: dict(serializer_class(obj).data) for obj in objects}
+
+
+class ReferenceDataCache:
+    """Serialized reference rows of this process, reloaded per table on version change"""
+
+    def __init__(self):
+        # name -> (version, counts sequence, {pk: payload})
+        self._tables = {}
+
+    def _read_versions(self):
+        keys = [_version_key(name) for name in REFERENCE_NAMES]
+        keys += [_counts_key(name) for name in REFERENCE_NAMES]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                # Start a lost or never-set key afresh so every process reloads
+                cache.add(key, time.time_ns(), None)
+                versions[key] = cache.get(key)
+        return versions
+
+    def _load(self, name):
+        model = _sources()[name][0]
+        return _serialize(name, model.objects.all())
+
+    def _changed_pks(self, name, seen, current):
+        """Primary keys logged between two counts sequences, or None if the log does not cover them"""
+        if not isinstance(seen, int) or not isinstance(current, int) or not 0 < current - seen <= MAX_COUNT_LOG_GAP:
+            return None
+        keys = [COUNT_LOG_KEY.format(name=name, seq=seq) for seq in range(seen + 1, current + 1)]
+        entries = cache.get_many(keys)
+        if len(entries) < len(keys):
+            return None
+        return set().union(*entries.values())
+
+    def _refresh_counts(self, name, rows, pks):
+        model = _sources()[name][0]
+        counts = model.objects.all() if pks is None else model.objects.filter(pk__in=pks)
+        for pk, count in counts.values_list('pk', 'active_jobs_count'):
+            if pk in rows:
+                # Copied, as earlier snapshots may still be serializing with the old row
+                rows[pk] = {**rows[pk], 'jobs_count': count}
+
+    def snapshot(self):
+        """Current ``{name: {pk: payload}}``, reloading any table whose version or counts moved"""
+        try:
+            versions = self._read_versions()
+        except redis.RedisError:
+            logger.warning('Reference data versions unavailable, reading from the database', exc_info=True)
+            return {name: self._load(name) for name in REFERENCE_NAMES}
+
+        tables = {}
+        for name in REFERENCE_NAMES:
+            version = versions[_version_key(name)]
+            counts = versions[_counts_key(name)]
+            cached = self._tables.get(name)
+            if cached is None or cached[0] != version:
+                cached = (version, counts, self._load(name))
+            elif cached[1] != counts:
+                try:
+                    pks = self._changed_pks(name, cached[1], counts)
+                except redis.RedisError:
+                    pks = None
+                rows = dict(cached[2])
+                self._refresh_counts(name, rows, pks)
+                cached = (version, counts, rows)
+            self._tables[name] = cached
+            tables[name] = cached[2]
+        return tables
+
+    def clear(self):
+        self._tables = {}
+
+
+reference_data = ReferenceDataCache()
+
+
+def lookup(tables, name, pk):
+    """Serialized row from a snapshot, fetched on the spot if it is newer than the snapshot"""
+    if pk is None:
+        return None
+    rows = tables[name]
+    if pk not in rows:
+        model = _sources()[name][0]
+        rows.update(_serialize(name, model.objects.filter(pk=pk)))
+    return rows.get(pk)
+
+
+def snapshot_for(jobs):
+    """
+    Snapshot that also holds every row ``jobs`` reference, so they serialize
+    without queries (e.g. on an event loop); missing rows are fetched with one
+    query per table.
+    """
+    tables = reference_data.snapshot()
+    for name in REFERENCE_NAMES:
+        rows = tables[name]
+        missing = {getattr(job, f'{name}_id') for job in jobs} - rows.keys() - {None}
+        if not missing:
+            continue
+        model = _sources()[name][0]
+        rows.update(_serialize(name, model.objects.filter(pk__in=missing)))
+        gone = missing - rows.keys()
+        if gone:
+            # Deleted meanwhile: render as null here rather than query again in lookup
+            tables[name] = {**rows, **dict.fromkeys(gone)}
+    return tables
+
+
+def warm_reference_data():
+    """Load every table ahead of the first request; failures just defer loading"""
+    try:
+        reference_data.snapshot()
+    except (DatabaseError, redis.RedisError):
+        logger.warning('Could not warm the reference data cache', exc_info=True)
+
+
+def invalidate_reference_data(changes, using=None):
+    """
+    Refresh ``{name: pks}`` in every process once the current transaction commits.
+
+    Cached job detail payloads embedding the changed rows and all cached list
+    pages are invalidated along with them.
+    """
+    changes = {name: set(pks) for name, pks in changes.items() if pks}
+    if not changes:
+        return
+
+    def bump():
+        cache.set_many({_version_key(name): time.time_ns() for name in changes}, None)
+        for name, pks in changes.items():
+            for pk in pks:
+                bump_job_detail_ref(name, pk)
+        bump_jobs_generation()
+
+    transaction.on_commit(bump, using=using)
+
+
+def refresh_reference_counts(changes, using=None):
+    """
+    Refresh ``jobs_count`` of ``{name: pks}`` in every process once the current
+    transaction commits, without reloading the tables or dropping detail payloads.
+    """
+    changes = {name: set(pks) for name, pks in changes.items() if pks}
+    if not changes:
+        return
+
+    def publish():
+        for name, pks in changes.items():
+            key = _counts_key(name)
+            try:
+                seq = cache.incr(key)
+            except ValueError:
+                # Lost or never set: processes holding another sequence reread all counts
+                cache.add(key, time.time_ns(), None)
+                seq = cache.incr(key)
+            cache.set(COUNT_LOG_KEY.format(name=name, seq=seq), sorted(pks), COUNT_LOG_TTL)
+
+    transaction.on_commit(publish, using=using)
+
+
+def invalidate_all_reference_data(using=None):
+    """Refresh every table in every process, e.g. after counters were rebuilt in bulk"""
+    def bump():
+        cache.set_many({_version_key(name): time.time_ns() for name in REFERENCE_NAMES}, None)
+        bump_jobs_generation()
+
+    transaction.on_commit(bump, using=using)
@@ -0,0 +1,86 @@
+import csv
+import json
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+class StreamingRenderer(BaseRenderer):
+    """
+    Base for row-oriented formats that can be written incrementally.
+
+    ``stream(columns, rows)`` encodes an iterable of tuples lazily and yields
+    ``bytes`` roughly every ``batch_size`` rows, for a ``StreamingHttpResponse``.
+    ``render`` handles ordinary (non-streamed) responses such as errors.
+    """
+    charset = 'utf-8'
+    batch_size = 500
+
+    def encode_header(self, columns):
+        return ''
+
+    def encode_row(self, columns, row):
+        raise NotImplementedError
+
+    def flatten(self, value):
+        return value
+
+    def stream(self, columns, rows):
+        lines = [self.encode_header(columns)]
+        for row in rows:
+            lines.append(self.encode_row(columns, row))
+            if len(lines) >= self.batch_size:
+                yield ''.join(lines).encode(self.charset)
+                lines = []
+        if lines:
+            yield ''.join(lines).encode(self.charset)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        records = data if isinstance(data, list) else [data]
+        columns = list(records[0]) if records and isinstance(records[0], dict) else ['detail']
+        rows = [
+            tuple(self.flatten(value) for value in record.values()) if isinstance(record, dict) else (record,)
+            for record in records
+        ]
+        return b''.join(self.stream(columns, rows))
+
+
+class NDJSONRenderer(StreamingRenderer):
+    """One JSON object per line"""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+    def encode_row(self, columns, row):
+        return json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+class _Line:
+    """File-like object that hands back what ``csv.writer`` writes to it"""
+
+    def write(self, value):
+        return value
+
+
+class CSVRenderer(StreamingRenderer):
+    """Comma-separated values with a header row; dates in ISO 8601"""
+    media_type = 'text/csv'
+    format = 'csv'
+
+    def __init__(self):
+        self.writer = csv.writer(_Line())
+
+    def encode_header(self, columns):
+        return self.writer.writerow(columns)
+
+    def flatten(self, value):
+        # Validation errors arrive as lists of messages
+        return '; '.join(map(str, value)) if isinstance(value, list) else value
+
+    def encode_row(self, columns, row):
+        return self.writer.writerow([
+            value.isoformat() if isinstance(value, date) else value
+            for value in row
+        ])
@@ -0,0 +1,130 @@
+"""
+Read-replica routing.
+
+``DATABASE_REPLICAS`` lists database aliases that replicate ``default``.
+``ReplicaRoutingMiddleware`` picks the alias reads go to once per request and
+``ReplicaRouter`` applies it to every query of that request through a context
+variable (which also follows the async views into ``sync_to_async`` threads).
+Writes always go to ``default``.
+
+A request reads from a replica only if it is a safe method (GET, HEAD,
+OPTIONS) to one of the ``jobs`` views and neither of these holds:
+
+* ``sticky``: the client wrote something in the last
+  ``PRIMARY_STICKINESS_SECONDS``. After every successful unsafe request a
+  short-lived cache flag is set under a hash of the request's credentials
+  (the ``Authorization`` header, or the session cookie for the admin), so a
+  client sees its own new job or application right away,
+* ``recent-write``: any job, company, category or job type write bumped the
+  jobs generation in the last ``PRIMARY_STICKINESS_SECONDS``. The job list and
+  detail caches are shared, and a page rendered from a replica that has not
+  caught up yet would stay cached under the new generation; reading from the
+  primary for a moment after each such write keeps stale rows out of them.
+
+Both checks share a single cache round trip. If the cache is unreachable the
+request stays on the primary. ``PRIMARY_STICKINESS_SECONDS`` must exceed the
+usual replication lag.
+
+Each decision is recorded as ``(alias, reason)`` on the request's
+``jobs.instrumentation.RequestMetrics``, shown in the ``Server-Timing`` header
+and slow-request log and counted in ``/metrics``.
+"""
+import contextvars
+import hashlib
+import random
+import time
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.urls import Resolver404, resolve
+
+from .caching import JOBS_MODIFIED_KEY
+
+
+PRIMARY = 'default'
+PIN_KEY = 'primary_pin:{digest}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# The API views; jobs.metrics also lives in the app but reads no rows
+JOBS_VIEW_MODULES = ('jobs.views', 'jobs.async_views')
+
+_read_alias = contextvars.ContextVar('read_alias', default=None)
+
+
+class ReplicaRouter:
+    """Send reads to the alias chosen for the current request and everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or an instance read from a replica would be saved back to it
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+def pin_key(request):
+    """Cache key of the client's primary pin, or None for requests without credentials"""
+    credentials = request.headers.get('Authorization') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    if not credentials:
+        return None
+    return PIN_KEY.format(digest=hashlib.sha1(credentials.encode()).hexdigest())
+
+
+def is_jobs_view(request):
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    view = getattr(match.func, 'view_class', match.func)
+    return view.__module__ in JOBS_VIEW_MODULES
+
+
+def choose_read_alias(request):
+    """Return ``(alias, reason)`` for the reads of this request"""
+    if request.method not in SAFE_METHODS:
+        return PRIMARY, 'write'
+    if not is_jobs_view(request):
+        return PRIMARY, 'other-view'
+
+    key = pin_key(request)
+    try:
+        values = cache.get_many([JOBS_MODIFIED_KEY, key] if key else [JOBS_MODIFIED_KEY])
+    except redis.RedisError:
+        return PRIMARY, 'cache-unavailable'
+    if key and values.get(key):
+        return PRIMARY, 'sticky'
+    modified = values.get(JOBS_MODIFIED_KEY)
+    if modified and time.time() - modified < settings.PRIMARY_STICKINESS_SECONDS:
+        return PRIMARY, 'recent-write'
+    return random.choice(settings.DATABASE_REPLICAS), 'replica'
+
+
+def pin_to_primary(request, response):
+    """After a successful write, keep the client's reads on the primary for a few seconds"""
+    if request.method in SAFE_METHODS or response.status_code >= 400:
+        return
+    key = pin_key(request)
+    if key is None:
+        return
+    try:
+        cache.set(key, 1, settings.PRIMARY_STICKINESS_SECONDS)
+    except redis.RedisError:
+        pass
+
+
+def start_routing(alias):
+    """Route the current context's reads to ``alias``; returns the token for ``end_routing``"""
+    return _read_alias.set(alias)
+
+
+def end_routing(token):
+    _read_alias.reset(token)
@@ -0,0 +1,67 @@
+"""
+PostgreSQL full-text search for jobs.
+
+``Job.search_document`` is a ``tsvector`` maintained by database triggers (see
+migration ``0003_job_search_document``) so it stays current for ``save()``,
+``QuerySet.update()`` and ``bulk_create()`` alike, and when a company is renamed.
+Weights: title and tags ``A``, company name ``B``, location ``C``, description ``D``.
+"""
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField
+from django.db.models import F, FloatField, Func
+from django.db.models.functions import Cast
+from rest_framework import filters
+
+
+SEARCH_CONFIG = 'english'
+
+# SQL function created by the migration; shared by the triggers and the backfill
+SEARCH_DOCUMENT_FUNCTION = 'jobs_job_search_document'
+
+# Annotation added to searched querysets and accepted by ``ordering=relevance``
+RELEVANCE = 'relevance'
+
+
+def search_document_expression():
+    """Expression computing a job's search document from its current row"""
+    return Func(
+        F('title'), F('tags'), F('location'), F('description'), F('company_id'),
+        function=SEARCH_DOCUMENT_FUNCTION,
+        output_field=SearchVectorField(),
+    )
+
+
+def search_jobs(queryset, value):
+    """Filter jobs matching a web-style search string, annotated with their relevance"""
+    query = SearchQuery(value, search_type='websearch', config=SEARCH_CONFIG)
+    # ts_rank() returns real; widen it so the value round-trips exactly through cursors
+    rank = Cast(SearchRank(F('search_document'), query), FloatField())
+    return queryset.filter(search_document=query).annotate(**{RELEVANCE: rank})
+
+
+class RelevanceOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that understands ``ordering=relevance`` (best match first).
+
+    Searched results default to relevance order, falling back to the view's
+    ordering as a tie-breaker; relevance is ignored when no search was made.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        searched = RELEVANCE in queryset.query.annotations
+        params = request.query_params.get(self.ordering_param)
+        if params:
+            fields = [param.strip() for param in params.split(',')]
+            ordering = []
+            for field in fields:
+                if field.lstrip('-') != RELEVANCE:
+                    ordering.extend(self.remove_invalid_fields(queryset, [field], view, request))
+                elif searched:
+                    # Rank is "higher is better", so the plain term sorts descending
+                    ordering.append(RELEVANCE if field.startswith('-') else f'-{RELEVANCE}')
+            if ordering:
+                return ordering
+
+        ordering = self.get_default_ordering(view)
+        if searched and not params:
+            return [f'-{RELEVANCE}'] + list(ordering or [])
+        return ordering
@@ -1,27 +1,28 @@
+import redis
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.utils import timezone
 from .models import (
-    Category, Company, JobType, Job, Application, 
+    Category, Company, JobType, Tag, Job, Application, 
     JobView, SavedJob, JobAlert
 )
+from .refdata import lookup, reference_data
+from .tracking import unique_viewers
 
 
 class CategorySerializer(serializers.ModelSerializer):
     """Serializer for Category model"""
-    jobs_count = serializers.SerializerMethodField()
+    jobs_count = serializers.IntegerField(source='active_jobs_count', read_only=True)
     
     class Meta:
         model = Category
         fields = ['id', 'name', 'description', 'created_at', 'updated_at', 'jobs_count']
         read_only_fields = ['created_at', 'updated_at']
-    
-    def get_jobs_count(self, obj):
-        return obj.jobs.filter(status='active').count()
 
 
 class CompanySerializer(serializers.ModelSerializer):
     """Serializer for Company model"""
-    jobs_count = serializers.SerializerMethodField()
+    jobs_count = serializers.IntegerField(source='active_jobs_count', read_only=True)
     
     class Meta:
         model = Company
@@ -31,28 +32,47 @@ class CompanySerializer(serializers.ModelSerializer):
             'updated_at', 'jobs_count'
         ]
         read_only_fields = ['created_at', 'updated_at']
-    
-    def get_jobs_count(self, obj):
-        return obj.jobs.filter(status='active').count()
 
 
 class JobTypeSerializer(serializers.ModelSerializer):
     """Serializer for JobType model"""
-    jobs_count = serializers.SerializerMethodField()
+    jobs_count = serializers.IntegerField(source='active_jobs_count', read_only=True)
     
     class Meta:
         model = JobType
         fields = ['id', 'name', 'description', 'jobs_count']
+
+
+class TagSerializer(serializers.ModelSerializer):
+    """Serializer for Tag model"""
+    jobs_count = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = Tag
+        fields = ['id', 'name', 'jobs_count']
+
+
+class ReferenceDataField(serializers.Field):
+    """Nested company, category or job type attached by id from the per-process cache"""
+    
+    def __init__(self, name, **kwargs):
+        self.reference_name = name
+        kwargs.update(source=f'{name}_id', read_only=True)
+        super().__init__(**kwargs)
     
-    def get_jobs_count(self, obj):
-        return obj.jobs.filter(status='active').count()
+    def to_representation(self, value):
+        # One version check per serialization, shared by every row and field
+        tables = getattr(self.root, '_reference_tables', None)
+        if tables is None:
+            tables = self.root._reference_tables = reference_data.snapshot()
+        return lookup(tables, self.reference_name, value)
 
 
 class JobListSerializer(serializers.ModelSerializer):
     """Serializer for Job model - list view"""
-    company = CompanySerializer(read_only=True)
-    category = CategorySerializer(read_only=True)
-    job_type = JobTypeSerializer(read_only=True)
+    company = ReferenceDataField('company')
+    category = ReferenceDataField('category')
+    job_type = ReferenceDataField('job_type')
     posted_by = serializers.StringRelatedField(read_only=True)
     is_expired = serializers.ReadOnlyField()
     is_active = serializers.ReadOnlyField()
@@ -70,13 +90,14 @@ class JobListSerializer(serializers.ModelSerializer):
 
 class JobDetailSerializer(serializers.ModelSerializer):
     """Serializer for Job model - detail view"""
-    company = CompanySerializer(read_only=True)
-    category = CategorySerializer(read_only=True)
-    job_type = JobTypeSerializer(read_only=True)
+    company = ReferenceDataField('company')
+    category = ReferenceDataField('category')
+    job_type = ReferenceDataField('job_type')
     posted_by = serializers.StringRelatedField(read_only=True)
     is_expired = serializers.ReadOnlyField()
     is_active = serializers.ReadOnlyField()
     tags_list = serializers.SerializerMethodField()
+    unique_viewers = serializers.SerializerMethodField()
     
     class Meta:
         model = Job
@@ -86,7 +107,7 @@ class JobDetailSerializer(serializers.ModelSerializer):
             'location', 'is_remote', 'salary_min', 'salary_max', 'currency',
             'experience_level', 'status', 'created_at', 'updated_at',
             'expires_at', 'slug', 'tags', 'tags_list', 'views_count',
-            'applications_count', 'is_expired', 'is_active'
+            'unique_viewers', 'applications_count', 'is_expired', 'is_active'
         ]
         read_only_fields = ['slug', 'views_count', 'applications_count', 'created_at', 'updated_at']
     
@@ -94,6 +115,16 @@ class JobDetailSerializer(serializers.ModelSerializer):
         if obj.tags:
             return [tag.strip() for tag in obj.tags.split(',')]
         return []
+    
+    def get_unique_viewers(self, obj):
+        """Approximate distinct viewers (HyperLogLog); None if Redis is unavailable"""
+        if 'unique_viewers' in self.context:
+            # Already counted by the caller, e.g. asynchronously
+            return self.context['unique_viewers']
+        try:
+            return unique_viewers(obj.pk)
+        except redis.RedisError:
+            return None
 
 
 class JobCreateUpdateSerializer(serializers.ModelSerializer):
@@ -117,6 +148,19 @@ class JobCreateUpdateSerializer(serializers.ModelSerializer):
         return data
 
 
+class JobBulkCreateSerializer(JobCreateUpdateSerializer):
+    """Validates one item of a bulk job upload; foreign keys are resolved per chunk"""
+    company = serializers.IntegerField(min_value=1)
+    category = serializers.IntegerField(min_value=1)
+    job_type = serializers.IntegerField(min_value=1)
+    
+    def validate_expires_at(self, value):
+        # bulk_create skips Job.clean()
+        if value and value <= timezone.now():
+            raise serializers.ValidationError("Expiration date must be in the future.")
+        return value
+
+
 class ApplicationSerializer(serializers.ModelSerializer):
     """Serializer for Application model"""
     job = JobListSerializer(read_only=True)
@@ -264,3 +308,31 @@ class JobSearchSerializer(serializers.Serializer):
         required=False,
         default='-created_at'
     )
+
+
+class JobAnalyticsQuerySerializer(serializers.Serializer):
+    """Serializer for job analytics query parameters"""
+    days = serializers.IntegerField(required=False, default=30, min_value=1, max_value=366)
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Serializer for export filters; ``since`` is inclusive and ``until`` exclusive"""
+    since = serializers.DateTimeField(required=False)
+    until = serializers.DateTimeField(required=False)
+    company = serializers.IntegerField(required=False, min_value=1)
+    after_id = serializers.IntegerField(required=False, min_value=0)
+    
+    def validate(self, data):
+        if data.get('since') and data.get('until') and data['since'] >= data['until']:
+            raise serializers.ValidationError("'since' must be earlier than 'until'.")
+        return data
+
+
+class JobExportQuerySerializer(ExportQuerySerializer):
+    """Serializer for job export query parameters"""
+    status = serializers.ChoiceField(choices=Job.STATUS_CHOICES, required=False)
+
+
+class ApplicationExportQuerySerializer(ExportQuerySerializer):
+    """Serializer for application export query parameters"""
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES, required=False)
@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import counters
+from .caching import bump_jobs_generation, invalidate_job_detail
+from .metrics import APPLICATIONS_SUBMITTED, JOBS_CREATED
+from .models import Application, Category, Company, Job, JobType
+from .refdata import invalidate_reference_data
+
+
+@receiver(post_delete, sender=Job)
+def release_job_counters(sender, instance, **kwargs):
+    """Decrement active-job counters when a job is deleted (including cascades)"""
+    counters.apply_counter_delta(counters.job_counter_state(instance), None)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_save, sender=Application)
+def count_created(sender, instance, created, **kwargs):
+    """Count new jobs and applications for /metrics once they are committed"""
+    if created:
+        counter = JOBS_CREATED if sender is Job else APPLICATIONS_SUBMITTED
+        transaction.on_commit(counter.inc, using=kwargs.get('using'))
+
+
+@receiver(post_delete, sender=Application)
+def release_application_count(sender, instance, **kwargs):
+    """Decrement the job's applications_count when an application is deleted"""
+    counters.increment_counts(Job, 'applications_count', {instance.job_id: -1}, using=instance._state.db)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def invalidate_cached_job(sender, instance, **kwargs):
+    """Drop the cached detail payload and list pages of a changed job"""
+    # After commit, so no request can re-cache the old row under the new generation
+    def invalidate():
+        invalidate_job_detail(instance.slug)
+        bump_jobs_generation()
+    
+    transaction.on_commit(invalidate, using=kwargs.get('using'))
+
+
+@receiver(post_save, sender=Company)
+@receiver(post_delete, sender=Company)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=JobType)
+@receiver(post_delete, sender=JobType)
+def invalidate_jobs_embedding(sender, instance, **kwargs):
+    """Refresh a changed company, category or job type everywhere it is cached"""
+    field_name = {Company: 'company', Category: 'category', JobType: 'job_type'}[sender]
+    invalidate_reference_data({field_name: [instance.pk]}, using=kwargs.get('using'))
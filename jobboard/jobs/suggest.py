@@ -0,0 +1,127 @@
+"""
+Typeahead suggestions for the job search box.
+
+Each source (job titles, company names, job locations) is matched with pg_trgm
+word similarity (``<%``), which the ``gin_trgm_ops`` indexes answer directly and
+which tolerates typos and partial words. Sources run one after another under a
+shared deadline enforced with ``SET LOCAL statement_timeout``; a source that
+cannot finish in the remaining budget is skipped and the response is flagged as
+partial instead of making the user wait.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import OperationalError, connections, router, transaction
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import Lower
+
+from .models import Company, Job
+
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+# How strongly popularity lifts a suggestion relative to its similarity
+POPULARITY_WEIGHT = 0.15
+
+
+def _title_candidates(query, limit, using):
+    rows = (
+        Job.objects.using(using).filter(status='active', title__trigram_word_similar=query)
+        .annotate(normalized=Lower('title'))
+        .values('normalized')
+        .annotate(
+            text=Max('title'),
+            similarity=Max(TrigramWordSimilarity(query, 'title')),
+            popularity=Sum('views_count') + Count('id'),
+        )
+        .order_by('-similarity', '-popularity')[:limit]
+    )
+    return [('title', None, row['text'], row['similarity'], row['popularity']) for row in rows]
+
+
+def _company_candidates(query, limit, using):
+    rows = (
+        Company.objects.using(using).filter(name__trigram_word_similar=query, active_jobs_count__gt=0)
+        .annotate(similarity=TrigramWordSimilarity(query, 'name'))
+        .values('id', 'name', 'similarity', 'active_jobs_count')
+        .order_by('-similarity', '-active_jobs_count')[:limit]
+    )
+    return [
+        ('company', row['id'], row['name'], row['similarity'], row['active_jobs_count'])
+        for row in rows
+    ]
+
+
+def _location_candidates(query, limit, using):
+    rows = (
+        Job.objects.using(using).filter(status='active', location__trigram_word_similar=query)
+        .annotate(normalized=Lower('location'))
+        .values('normalized')
+        .annotate(
+            text=Max('location'),
+            similarity=Max(TrigramWordSimilarity(query, 'location')),
+            popularity=Count('id'),
+        )
+        .order_by('-similarity', '-popularity')[:limit]
+    )
+    return [('location', None, row['text'], row['similarity'], row['popularity']) for row in rows]
+
+
+SOURCES = [_title_candidates, _company_candidates, _location_candidates]
+
+
+def _run_with_timeout(source, query, limit, timeout_ms, using):
+    # The settings are transaction-local, so they must be set on the connection the source reads from
+    with transaction.atomic(using=using):
+        with connections[using].cursor() as cursor:
+            cursor.execute("SELECT set_config('statement_timeout', %s, true)", [str(timeout_ms)])
+            cursor.execute(
+                "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                [str(getattr(settings, 'SUGGEST_SIMILARITY_THRESHOLD', 0.3))],
+            )
+        return source(query, limit, using)
+
+
+def get_suggestions(query, limit=DEFAULT_LIMIT):
+    """
+    Return ``(suggestions, partial)`` for a typeahead query.
+
+    Suggestions are deduplicated case-insensitively and ranked by trigram
+    similarity lifted by log-damped popularity.
+    """
+    budget_ms = getattr(settings, 'SUGGEST_TIMEOUT_MS', 100)
+    deadline = time.monotonic() + budget_ms / 1000
+    partial = False
+    candidates = []
+    # A replica when the request is routed to one
+    using = router.db_for_read(Job)
+
+    for source in SOURCES:
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            partial = True
+            break
+        try:
+            candidates.extend(_run_with_timeout(source, query, limit, remaining_ms, using))
+        except OperationalError:
+            # statement_timeout fired; serve what the other sources found
+            partial = True
+
+    best = {}
+    for kind, object_id, text, similarity, popularity in candidates:
+        score = similarity * (1 + POPULARITY_WEIGHT * math.log1p(popularity or 0))
+        key = text.strip().lower()
+        if key not in best or score > best[key]['score']:
+            best[key] = {
+                'text': text,
+                'type': kind,
+                'id': object_id,
+                'score': round(score, 4),
+            }
+
+    suggestions = sorted(best.values(), key=lambda item: item['score'], reverse=True)
+    return suggestions[:limit], partial
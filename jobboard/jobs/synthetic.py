@@ -0,0 +1,534 @@
+"""
+Synthetic data at production scale, for load and query-plan testing.
+
+``generate`` writes companies, users, jobs (with tags), applications, job
+views, saved jobs and alerts straight into PostgreSQL with ``COPY``, in
+fixed-size shards that a pool of worker processes loads in parallel, one
+transaction per shard.
+
+Reproducibility: every shard draws from its own ``random.Random`` seeded with
+``(seed, kind, shard)`` and primary keys are reserved up front, so the same
+seed and options produce the same rows whatever the number of workers (and
+the same ids, given the same starting database). Timestamps are spread over
+the ``days`` before ``end``.
+
+Distributions:
+
+* companies are picked for jobs with a Zipf-like law (``company_skew``), so a
+  few large employers post most jobs and a long tail posts one or two;
+* each job gets a popularity drawn from a Pareto law (``hot_job_alpha``,
+  lower is more skewed) that scales its views, applications and saves around
+  the requested averages, so a handful of hot jobs get most of the traffic;
+* only closed jobs can have expired; every other job expires within 60 days
+  after ``end``, so ``close_expired_jobs`` leaves the generated statuses alone.
+
+``COPY`` bypasses ``save()`` and the signals, so the denormalized counters are
+filled in directly (``views_count``, ``applications_count``) or rebuilt
+afterwards (``active_jobs_count``), and the caches are invalidated once at the
+end. The search document is still maintained by its database trigger.
+"""
+import io
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .caching import bump_jobs_generation
+from .counters import rebuild_active_job_counters
+from .models import Application, Category, Company, Job, JobAlert, JobTag, JobType, JobView, SavedJob, Tag
+from .refdata import invalidate_all_reference_data
+
+
+CATEGORIES = [
+    'Software Development', 'Data Science', 'Marketing', 'Design', 'Sales', 'Operations',
+    'Finance', 'Human Resources', 'Customer Support', 'Product Management', 'Healthcare',
+    'Education', 'Legal', 'Engineering', 'Logistics', 'Hospitality',
+]
+
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Freelance', 'Internship']
+
+# Role -> (category, skills)
+ROLES = {
+    'Backend Developer': ('Software Development', ['python', 'django', 'postgresql', 'api', 'docker', 'go', 'java']),
+    'Frontend Developer': ('Software Development', ['javascript', 'react', 'typescript', 'css', 'vue', 'ui']),
+    'Mobile Developer': ('Software Development', ['kotlin', 'swift', 'react native', 'android', 'ios']),
+    'DevOps Engineer': ('Engineering', ['aws', 'kubernetes', 'docker', 'terraform', 'ci/cd', 'linux']),
+    'Data Scientist': ('Data Science', ['python', 'machine learning', 'statistics', 'sql', 'pandas']),
+    'Data Engineer': ('Data Science', ['spark', 'sql', 'airflow', 'python', 'kafka', 'etl']),
+    'Marketing Manager': ('Marketing', ['seo', 'content', 'analytics', 'campaigns', 'social media']),
+    'Product Designer': ('Design', ['figma', 'ux', 'ui', 'prototyping', 'user research']),
+    'Account Executive': ('Sales', ['crm', 'saas', 'negotiation', 'b2b', 'lead generation']),
+    'Operations Analyst': ('Operations', ['excel', 'reporting', 'process improvement', 'sql']),
+    'Financial Analyst': ('Finance', ['excel', 'financial modeling', 'forecasting', 'accounting']),
+    'Recruiter': ('Human Resources', ['recruiting', 'sourcing', 'interviewing', 'hr']),
+    'Support Specialist': ('Customer Support', ['zendesk', 'communication', 'troubleshooting']),
+    'Product Manager': ('Product Management', ['roadmap', 'agile', 'analytics', 'stakeholders']),
+    'Registered Nurse': ('Healthcare', ['patient care', 'emr', 'clinical']),
+    'Teacher': ('Education', ['curriculum', 'classroom', 'tutoring']),
+    'Paralegal': ('Legal', ['contracts', 'research', 'compliance']),
+    'Warehouse Supervisor': ('Logistics', ['inventory', 'forklift', 'scheduling']),
+    'Hotel Manager': ('Hospitality', ['guest relations', 'budgeting', 'scheduling']),
+}
+
+SENIORITY = [('Junior', 'entry'), ('', 'mid'), ('Senior', 'senior'), ('Lead', 'senior'), ('Head of', 'executive')]
+
+LOCATIONS = [
+    'San Francisco, CA', 'New York, NY', 'Austin, TX', 'Seattle, WA', 'Chicago, IL', 'Boston, MA',
+    'Los Angeles, CA', 'Denver, CO', 'Atlanta, GA', 'Remote', 'London, UK', 'Berlin, Germany',
+    'Toronto, Canada', 'Addis Ababa, Ethiopia', 'Nairobi, Kenya', 'Lagos, Nigeria', 'Bangalore, India',
+]
+
+INDUSTRIES = ['Technology', 'Finance', 'Healthcare', 'Retail', 'Education', 'Manufacturing', 'Media', 'Logistics']
+
+COMPANY_SIZES = ['1-10', '10-50', '50-100', '100-500', '500-1000', '1000+']
+
+NAME_PARTS = [
+    'Acme', 'Blue', 'Nova', 'Peak', 'Bright', 'Quantum', 'Green', 'Iron', 'Silver', 'Swift', 'Lumen',
+    'Atlas', 'Orbit', 'Cedar', 'Harbor', 'Vertex', 'Pixel', 'Summit', 'River', 'Stone',
+]
+NAME_SUFFIXES = ['Labs', 'Systems', 'Group', 'Works', 'Solutions', 'Health', 'Capital', 'Logistics', 'Media', 'Inc']
+
+FIRST_NAMES = ['Abebe', 'Sara', 'John', 'Mekdes', 'Li', 'Maria', 'Omar', 'Priya', 'Yonas', 'Emma', 'Kofi', 'Hana']
+LAST_NAMES = ['Tadesse', 'Smith', 'Chen', 'Garcia', 'Khan', 'Okafor', 'Patel', 'Bekele', 'Brown', 'Kim']
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_4) AppleWebKit/605.1.15 Version/17.4 Safari/605.1.15',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 Mobile/15E148',
+    'Mozilla/5.0 (Linux; Android 14) AppleWebKit/537.36 Chrome/124.0 Mobile Safari/537.36',
+]
+
+JOB_STATUSES = ['active', 'closed', 'paused', 'draft']
+
+APPLICATION_STATUSES = (
+    ['pending'] * 50 + ['reviewed'] * 20 + ['shortlisted'] * 10 + ['interviewed'] * 7
+    + ['rejected'] * 10 + ['accepted'] * 2 + ['withdrawn'] * 1
+)
+
+SALARY_BANDS = {
+    'entry': (35000, 70000),
+    'mid': (60000, 120000),
+    'senior': (100000, 180000),
+    'executive': (150000, 300000),
+}
+
+# Rows per COPY statement
+COPY_BATCH_SIZE = 20000
+
+
+@dataclass(frozen=True)
+class ScaleConfig:
+    seed: int = 42
+    companies: int = 20000
+    users: int = 200000
+    jobs: int = 1000000
+    # Averages per job; individual jobs vary with their popularity
+    applications_per_job: float = 5.0
+    views_per_job: float = 20.0
+    saves_per_job: float = 2.0
+    alerts: int = 100000
+    company_skew: float = 1.1
+    hot_job_alpha: float = 1.3
+    # Weights of active/closed/paused/draft
+    status_weights: tuple = (60, 25, 5, 10)
+    remote_ratio: float = 0.3
+    days: int = 365
+    end: datetime = None
+    shard_size: int = 5000
+    username_prefix: str = 'load'
+
+
+@dataclass(frozen=True)
+class IdBlock:
+    """A range of primary keys reserved for one table"""
+    first: int
+    count: int
+
+    def __getitem__(self, index):
+        return self.first + index
+
+
+@dataclass(frozen=True)
+class Plan:
+    """Everything a worker needs besides its shard number; picklable"""
+    config: ScaleConfig
+    users: IdBlock
+    companies: IdBlock
+    jobs: IdBlock
+    alerts: IdBlock
+    categories: dict = field(default_factory=dict)
+    job_types: tuple = ()
+    tags: dict = field(default_factory=dict)
+
+
+def zipf_index(rng, n, skew):
+    """Index in ``range(n)`` from a continuous Zipf-like law; 0 is the most likely"""
+    u = rng.random()
+    if abs(skew - 1.0) < 1e-9:
+        x = n ** u
+    else:
+        x = ((n ** (1 - skew) - 1) * u + 1) ** (1 / (1 - skew))
+    return min(n - 1, int(x) - 1)
+
+
+def popularity(rng, alpha):
+    """Pareto-distributed multiplier with mean 1"""
+    return rng.paretovariate(alpha) * (alpha - 1) / alpha
+
+
+def scaled_count(rng, mean, weight, cap):
+    value = mean * weight
+    count = int(value) + (rng.random() < value - int(value))
+    return min(count, cap)
+
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    if value is True:
+        return 't'
+    if value is False:
+        return 'f'
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+    return str(value)
+
+
+def copy_rows(cursor, model, fields, rows):
+    """``COPY`` tuples of ``fields`` values into the model's table; returns rows written"""
+    columns = ', '.join(model._meta.get_field(name).column for name in fields)
+    statement = f'COPY {model._meta.db_table} ({columns}) FROM STDIN'
+    written = 0
+    buffer = io.StringIO()
+    pending = 0
+    for row in rows:
+        buffer.write('\t'.join(map(copy_value, row)))
+        buffer.write('\n')
+        pending += 1
+        if pending >= COPY_BATCH_SIZE:
+            buffer.seek(0)
+            cursor.copy_expert(statement, buffer)
+            written += pending
+            buffer, pending = io.StringIO(), 0
+    if pending:
+        buffer.seek(0)
+        cursor.copy_expert(statement, buffer)
+        written += pending
+    return written
+
+
+def reserve_ids(model, count, using='default'):
+    """Advance the table's id sequence past ``count`` new ids and return them as a block"""
+    table = model._meta.db_table
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT setval(
+                pg_get_serial_sequence(%s, 'id'),
+                GREATEST(
+                    (SELECT COALESCE(MAX(id), 0) FROM {table}),
+                    (SELECT nextval(pg_get_serial_sequence(%s, 'id')))
+                ) + %s
+            )
+            """,
+            [table, table, count],
+        )
+        last = cursor.fetchone()[0]
+    return IdBlock(first=last - count + 1, count=count)
+
+
+def username(config, index):
+    return f'{config.username_prefix}{config.seed}_{index}'
+
+
+def company_name(config, index):
+    # Derived arithmetically so workers need no list of names
+    mixed = (index * 7919 + config.seed) * 104729
+    return (
+        f'{NAME_PARTS[mixed % len(NAME_PARTS)]} {NAME_PARTS[(mixed // 20) % len(NAME_PARTS)]} '
+        f'{NAME_SUFFIXES[(mixed // 400) % len(NAME_SUFFIXES)]} {index}'
+    )
+
+
+def expiry(rng, config, status, created):
+    """``expires_at`` of a generated job: past its run if closed, otherwise after ``config.end``"""
+    if status == 'closed':
+        return created + timedelta(days=rng.randint(30, 90))
+    return config.end + timedelta(days=rng.randint(1, 60))
+
+
+def moment(rng, config, start=None):
+    """A random time in the config's window, not before ``start``"""
+    window_start = config.end - timedelta(days=config.days)
+    if start is not None and start > window_start:
+        window_start = start
+    span = max(0.0, (config.end - window_start).total_seconds())
+    return window_start + timedelta(seconds=rng.random() * span)
+
+
+def shards(total, size):
+    return [(start, min(total, start + size)) for start in range(0, total, size)]
+
+
+def company_rows(plan, start, end):
+    config = plan.config
+    for index in range(start, end):
+        rng = random.Random(f'{config.seed}:company:{index}')
+        created = moment(rng, config)
+        yield (
+            plan.companies[index], company_name(config, index), 'Synthetic company for load testing',
+            f'https://company{index}.example.com', None, rng.choice(LOCATIONS), rng.choice(COMPANY_SIZES),
+            rng.choice(INDUSTRIES), 0, created, created,
+        )
+
+
+def user_rows(plan, password, start, end):
+    config = plan.config
+    for index in range(start, end):
+        rng = random.Random(f'{config.seed}:user:{index}')
+        joined = moment(rng, config)
+        name = username(config, index)
+        yield (
+            plan.users[index], password, None, False, name, rng.choice(FIRST_NAMES),
+            rng.choice(LAST_NAMES), f'{name}@example.com', False, True, joined,
+        )
+
+
+def load_jobs_shard(plan, shard, start, end, using='default'):
+    """Generate and COPY one shard of jobs with their tags, applications, views and saves"""
+    config = plan.config
+    rng = random.Random(f'{config.seed}:jobs:{shard}')
+    roles = list(ROLES.items())
+
+    jobs, job_tags, applications, views, saves = [], [], [], [], []
+    for index in range(start, end):
+        job_id = plan.jobs[index]
+        role, (category, skills) = rng.choice(roles)
+        prefix, level = rng.choice(SENIORITY)
+        title = f'{prefix} {role}'.strip()
+        company = zipf_index(rng, config.companies, config.company_skew)
+        status = rng.choices(JOB_STATUSES, weights=config.status_weights)[0]
+        created = moment(rng, config)
+        is_remote = rng.random() < config.remote_ratio
+        low, high = SALARY_BANDS[level]
+        salary_min = Decimal(rng.randrange(low, high, 1000))
+        salary_max = salary_min + Decimal(rng.randrange(5000, 40000, 1000))
+        tags = rng.sample(skills, rng.randint(1, min(4, len(skills))))
+
+        weight = popularity(rng, config.hot_job_alpha) if status != 'draft' else 0
+        view_count = scaled_count(rng, config.views_per_job, weight, 10 ** 9)
+        applicant_indexes = rng.sample(
+            range(config.users), scaled_count(rng, config.applications_per_job, weight, config.users)
+        )
+        saver_indexes = rng.sample(
+            range(config.users), scaled_count(rng, config.saves_per_job, weight, config.users)
+        )
+
+        jobs.append((
+            job_id, title,
+            f'{title} at {company_name(config, company)}. Synthetic posting generated for load testing.',
+            f'Experience with {", ".join(tags)}.',
+            'Deliver on the team roadmap and collaborate across functions.',
+            'Health insurance, flexible hours',
+            plan.companies[company], plan.categories[category], rng.choice(plan.job_types),
+            plan.users[rng.randrange(config.users)],
+            'Remote' if is_remote else rng.choice(LOCATIONS), is_remote, salary_min, salary_max, 'USD',
+            level, status, created, created, expiry(rng, config, status, created),
+            created if status == 'active' else None,
+            f'{title}-{company_name(config, company)}-{job_id}'.lower().replace(' ', '-'),
+            ', '.join(tags), view_count, len(applicant_indexes),
+        ))
+        job_tags.extend((job_id, plan.tags[tag]) for tag in tags)
+
+        for applicant in applicant_indexes:
+            applied = moment(rng, config, created)
+            status_choice = rng.choice(APPLICATION_STATUSES)
+            applications.append((
+                job_id, plan.users[applicant], 'I am very interested in this role.', None, status_choice,
+                None, f'{username(config, applicant)}@example.com', None, None,
+                salary_min if rng.random() < 0.3 else None, None, None, applied, applied,
+                applied if status_choice != 'pending' else None,
+            ))
+        for _ in range(view_count):
+            viewer = plan.users[rng.randrange(config.users)] if rng.random() < 0.3 else None
+            views.append((
+                job_id, viewer, f'10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}',
+                rng.choice(USER_AGENTS), moment(rng, config, created),
+            ))
+        saves.extend(
+            (job_id, plan.users[saver], moment(rng, config, created)) for saver in saver_indexes
+        )
+
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        copy_rows(cursor, Job, JOB_FIELDS, jobs)
+        copy_rows(cursor, JobTag, ['job_id', 'tag_id'], job_tags)
+        copy_rows(cursor, Application, APPLICATION_FIELDS, applications)
+        copy_rows(cursor, JobView, ['job_id', 'user_id', 'ip_address', 'user_agent', 'viewed_at'], views)
+        copy_rows(cursor, SavedJob, ['job_id', 'user_id', 'saved_at'], saves)
+    return {'jobs': len(jobs), 'applications': len(applications), 'views': len(views), 'saved_jobs': len(saves)}
+
+
+def load_alerts_shard(plan, shard, start, end, using='default'):
+    """Generate and COPY one shard of job alerts with their category and job type links"""
+    config = plan.config
+    rng = random.Random(f'{config.seed}:alerts:{shard}')
+    skills = sorted({skill for _, role_skills in ROLES.values() for skill in role_skills})
+    category_ids = sorted(plan.categories.values())
+
+    alerts, alert_categories, alert_job_types = [], [], []
+    for index in range(start, end):
+        alert_id = plan.alerts[index]
+        keywords = rng.sample(skills, rng.randint(0, 2))
+        alerts.append((
+            alert_id, plan.users[rng.randrange(config.users)], f'Alert {index}',
+            ', '.join(keywords) or None,
+            rng.choice(LOCATIONS) if rng.random() < 0.4 else None,
+            rng.choice(['entry', 'mid', 'senior', 'executive']) if rng.random() < 0.3 else None,
+            Decimal(rng.randrange(40000, 150000, 5000)) if rng.random() < 0.2 else None,
+            rng.random() < config.remote_ratio, rng.choice(['daily', 'weekly', 'monthly']),
+            rng.random() < 0.9, moment(rng, config), None,
+        ))
+        if not keywords or rng.random() < 0.3:
+            alert_categories.extend(
+                (alert_id, category_id) for category_id in rng.sample(category_ids, rng.randint(1, 2))
+            )
+        if rng.random() < 0.2:
+            alert_job_types.append((alert_id, rng.choice(plan.job_types)))
+
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        copy_rows(cursor, JobAlert, ALERT_FIELDS, alerts)
+        copy_rows(cursor, JobAlert.categories.through, ['jobalert_id', 'category_id'], alert_categories)
+        copy_rows(cursor, JobAlert.job_types.through, ['jobalert_id', 'jobtype_id'], alert_job_types)
+    return {'alerts': len(alerts)}
+
+
+JOB_FIELDS = [
+    'id', 'title', 'description', 'requirements', 'responsibilities', 'benefits', 'company_id',
+    'category_id', 'job_type_id', 'posted_by_id', 'location', 'is_remote', 'salary_min', 'salary_max',
+    'currency', 'experience_level', 'status', 'created_at', 'updated_at', 'expires_at', 'activated_at',
+    'slug', 'tags', 'views_count', 'applications_count',
+]
+
+APPLICATION_FIELDS = [
+    'job_id', 'applicant_id', 'cover_letter', 'resume', 'status', 'phone', 'email', 'linkedin_url',
+    'portfolio_url', 'expected_salary', 'availability_date', 'notes', 'applied_at', 'updated_at',
+    'reviewed_at',
+]
+
+ALERT_FIELDS = [
+    'id', 'user_id', 'name', 'keywords', 'locations', 'experience_levels', 'salary_min', 'is_remote',
+    'frequency', 'is_active', 'created_at', 'last_sent',
+]
+
+COMPANY_FIELDS = [
+    'id', 'name', 'description', 'website', 'logo', 'location', 'size', 'industry', 'active_jobs_count',
+    'created_at', 'updated_at',
+]
+
+USER_FIELDS = [
+    'id', 'password', 'last_login', 'is_superuser', 'username', 'first_name', 'last_name', 'email',
+    'is_staff', 'is_active', 'date_joined',
+]
+
+SHARD_LOADERS = {
+    'jobs': load_jobs_shard,
+    'alerts': load_alerts_shard,
+}
+
+
+def run_shard(plan, kind, shard, start, end, using='default'):
+    """Worker entry point"""
+    return kind, SHARD_LOADERS[kind](plan, shard, start, end, using)
+
+
+def prepare(config, using='default'):
+    """Create the reference rows, companies and users serially and reserve ids for the rest"""
+    Category.objects.using(using).bulk_create(
+        [Category(name=name) for name in CATEGORIES], ignore_conflicts=True
+    )
+    JobType.objects.using(using).bulk_create(
+        [JobType(name=name) for name in JOB_TYPES], ignore_conflicts=True
+    )
+    tag_names = sorted({skill for _, skills in ROLES.values() for skill in skills})
+    Tag.objects.using(using).bulk_create([Tag(name=name) for name in tag_names], ignore_conflicts=True)
+
+    if User.objects.using(using).filter(username__startswith=f'{config.username_prefix}{config.seed}_').exists():
+        raise ValueError(
+            f'Users for seed {config.seed} already exist; use another seed or username prefix'
+        )
+
+    categories = dict(Category.objects.using(using).filter(name__in=CATEGORIES).values_list('name', 'id'))
+    plan = Plan(
+        config=config,
+        users=reserve_ids(User, config.users, using),
+        companies=reserve_ids(Company, config.companies, using),
+        jobs=reserve_ids(Job, config.jobs, using),
+        alerts=reserve_ids(JobAlert, config.alerts, using),
+        categories=categories,
+        job_types=tuple(
+            JobType.objects.using(using).filter(name__in=JOB_TYPES).order_by('name').values_list('id', flat=True)
+        ),
+        tags=dict(Tag.objects.using(using).filter(name__in=tag_names).values_list('name', 'id')),
+    )
+
+    password = make_password('loadtest')
+    with transaction.atomic(using=using), connections[using].cursor() as cursor:
+        copy_rows(cursor, Company, COMPANY_FIELDS, company_rows(plan, 0, config.companies))
+        copy_rows(cursor, User, USER_FIELDS, user_rows(plan, password, 0, config.users))
+    return plan
+
+
+def finish(using='default'):
+    """Rebuild what COPY skipped: counters, caches and planner statistics"""
+    with transaction.atomic(using=using):
+        rebuild_active_job_counters(using=using)
+    invalidate_all_reference_data(using=using)
+    bump_jobs_generation()
+    with connections[using].cursor() as cursor:
+        for model in (Company, User, Job, JobTag, Application, JobView, SavedJob, JobAlert):
+            cursor.execute(f'ANALYZE {model._meta.db_table}')
+
+
+def generate(config, workers=1, using='default', log=None):
+    """Load a full synthetic dataset; returns the number of rows written per table"""
+    if config.end is None:
+        config = replace(config, end=timezone.now())
+    plan = prepare(config, using)
+    totals = {'companies': config.companies, 'users': config.users}
+    if log:
+        log(f'Created {config.companies} companies and {config.users} users')
+
+    tasks = [
+        (kind, shard, start, end, using)
+        for kind, total in (('jobs', config.jobs), ('alerts', config.alerts))
+        for shard, (start, end) in enumerate(shards(total, config.shard_size))
+    ]
+
+    def record(kind, counts):
+        for name, count in counts.items():
+            totals[name] = totals.get(name, 0) + count
+        if log:
+            log(f"Loaded {totals.get('jobs', 0)}/{config.jobs} jobs, {totals.get('alerts', 0)}/{config.alerts} alerts")
+
+    if workers > 1:
+        # Forked workers must not share the parent's database sockets
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+            futures = [pool.submit(run_shard, plan, *task) for task in tasks]
+            for future in futures:
+                record(*future.result())
+    else:
+        for task in tasks:
+            record(*run_shard(plan, *task))
+
+    finish(using)
+    return totals
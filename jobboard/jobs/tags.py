@@ -0,0 +1,77 @@
+"""
+Normalized tags for jobs.
+
+``Job.tags`` stays the comma-separated string clients read and write; the
+``Tag``/``JobTag`` tables mirror it so tag filters and per-tag counts can use
+the ``(tag, job)`` index instead of substring scans. ``Job.save`` keeps the two
+in sync, and ``sync_job_tags`` does the same for jobs written in bulk.
+"""
+from collections import defaultdict
+
+from django.apps import apps
+from django.db.models import Count, Q
+
+
+MAX_TAG_LENGTH = 50
+
+
+def parse_tags(value):
+    """Split a comma-separated tag string into unique, lower-cased tag names"""
+    names = []
+    for raw in (value or '').split(','):
+        name = ' '.join(raw.split()).lower()[:MAX_TAG_LENGTH]
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def sync_job_tags(jobs):
+    """Make the Tag links of the given saved jobs match their ``tags`` strings"""
+    Tag = apps.get_model('jobs', 'Tag')
+    JobTag = apps.get_model('jobs', 'JobTag')
+
+    wanted = {job.pk: set(parse_tags(job.tags)) for job in jobs}
+    if not wanted:
+        return
+
+    all_names = set().union(*wanted.values())
+    tag_ids = {}
+    if all_names:
+        Tag.objects.bulk_create([Tag(name=name) for name in all_names], ignore_conflicts=True)
+        tag_ids = dict(Tag.objects.filter(name__in=all_names).values_list('name', 'id'))
+
+    existing = defaultdict(set)
+    for job_id, tag_id in JobTag.objects.filter(job_id__in=wanted).values_list('job_id', 'tag_id'):
+        existing[job_id].add(tag_id)
+
+    to_add = []
+    stale = Q()
+    for job_id, names in wanted.items():
+        ids = {tag_ids[name] for name in names}
+        to_add.extend(JobTag(job_id=job_id, tag_id=tag_id) for tag_id in ids - existing[job_id])
+        removed = existing[job_id] - ids
+        if removed:
+            stale |= Q(job_id=job_id, tag_id__in=removed)
+
+    if to_add:
+        JobTag.objects.bulk_create(to_add, ignore_conflicts=True)
+    if stale:
+        JobTag.objects.filter(stale).delete()
+
+
+def jobs_with_any_tag(names):
+    """Subquery of job ids tagged with at least one of the given tag names"""
+    JobTag = apps.get_model('jobs', 'JobTag')
+    return JobTag.objects.filter(tag__name__in=names).values('job_id')
+
+
+def jobs_with_all_tags(names):
+    """Subquery of job ids tagged with every one of the given tag names"""
+    JobTag = apps.get_model('jobs', 'JobTag')
+    return (
+        JobTag.objects.filter(tag__name__in=names)
+        .values('job_id')
+        .annotate(matched=Count('tag_id'))
+        .filter(matched=len(names))
+        .values('job_id')
+    )
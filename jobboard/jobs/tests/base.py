@@ -0,0 +1,49 @@
+"""Fixtures and settings shared by the jobs test modules."""
+import itertools
+import os
+
+from django.contrib.auth.models import User
+from django.test import override_settings
+
+from ..models import Category, Company, Job, JobType
+
+
+PASSWORD = 'benchmark-pass'
+
+# Keep view tracking away from the Redis database the development server uses
+BENCHMARK_REDIS_URL = os.environ.get('BENCHMARK_REDIS_URL', 'redis://127.0.0.1:6379/15')
+
+# A private cache and Redis database, and every read on the primary connection
+isolated_services = override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'jobs-tests'}},
+    JOB_VIEW_BUFFER_URL=BENCHMARK_REDIS_URL,
+    DATABASE_REPLICAS=[],
+)
+
+_titles = itertools.count(1)
+
+
+def create_user(username, **fields):
+    return User.objects.create_user(username, f'{username}@example.com', PASSWORD, **fields)
+
+
+def create_job(**overrides):
+    """Create an active job; fields a test does not pass get shared defaults"""
+    if 'posted_by' not in overrides:
+        overrides['posted_by'] = User.objects.filter(username='owner').first() or create_user('owner')
+    if 'company' not in overrides and 'company_id' not in overrides:
+        overrides['company'] = Company.objects.get_or_create(name='Acme')[0]
+    if 'category' not in overrides:
+        overrides['category'] = Category.objects.get_or_create(name='Software Development')[0]
+    if 'job_type' not in overrides:
+        overrides['job_type'] = JobType.objects.get_or_create(name='Full-time')[0]
+    fields = {
+        'title': f'Python Developer {next(_titles)}',
+        'description': 'Build things',
+        'requirements': 'Python',
+        'responsibilities': 'Ship',
+        'location': 'Remote',
+        'status': 'active',
+        **overrides,
+    }
+    return Job.objects.create(**fields)
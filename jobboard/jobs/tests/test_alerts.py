@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from ..alerts import ALERT_COMMIT_GRACE, match_alerts
+from ..digests import plan_digests
+from ..models import Category, Job, JobAlert, JobAlertDigest
+from .base import create_job, create_user, isolated_services
+
+
+@isolated_services
+class AlertMatchingTests(TestCase):
+    """Alert criteria, the commit grace of the cut-off and digest planning"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.subscriber = create_user('subscriber')
+        cls.engineering = Category.objects.create(name='Software Development')
+        cls.design = Category.objects.create(name='Design')
+        cls.now = timezone.now()
+
+    def create_job(self, title, category, activated_ago, **fields):
+        job = create_job(title=title, category=category, **fields)
+        Job.objects.filter(pk=job.pk).update(activated_at=self.now - activated_ago)
+        return job
+
+    def create_alert(self, since, frequency='daily', categories=(), **fields):
+        alert = JobAlert.objects.create(user=self.subscriber, name='Alert', frequency=frequency, **fields)
+        alert.categories.set(categories)
+        JobAlert.objects.filter(pk=alert.pk).update(created_at=self.now - since)
+        return alert
+
+    def test_criteria(self):
+        python = self.create_job('Senior Python Developer', self.engineering, timedelta(hours=2))
+        remote_design = self.create_job('Product Designer', self.design, timedelta(hours=2), is_remote=True)
+        self.create_job('Junior Python Developer', self.engineering, timedelta(hours=2), location='Berlin')
+        keyword = self.create_alert(timedelta(days=1), keywords='python developer, golang', locations='remote')
+        category = self.create_alert(timedelta(days=1), categories=[self.design], is_remote=True)
+        late = self.create_alert(timedelta(hours=1))
+
+        matches, _ = match_alerts(now=self.now)
+        self.assertEqual(
+            [(alert.id, job_ids) for alert, job_ids in matches],
+            [(keyword.pk, [python.pk]), (category.pk, [remote_design.pk])],
+        )
+        self.assertNotIn(late.pk, [alert.id for alert, _ in matches])
+
+    def test_recent_activations_wait_for_next_run(self):
+        settled = self.create_job('Python Developer', self.engineering, ALERT_COMMIT_GRACE + timedelta(minutes=1))
+        pending = self.create_job('Data Engineer', self.engineering, ALERT_COMMIT_GRACE - timedelta(minutes=1))
+        alert = self.create_alert(timedelta(days=1))
+
+        matches, cutoff = match_alerts(now=self.now)
+        self.assertEqual(cutoff, self.now - ALERT_COMMIT_GRACE)
+        self.assertEqual(matches[0][1], [settled.pk])
+
+        JobAlert.objects.filter(pk=alert.pk).update(last_sent=cutoff)
+        matches, _ = match_alerts(now=self.now + timedelta(days=1))
+        self.assertEqual(matches[0][1], [pending.pk])
+
+    def test_plan_digests_only_due_alerts(self):
+        job = self.create_job('Python Developer', self.engineering, timedelta(hours=2))
+        due = self.create_alert(timedelta(days=3))
+        not_due = self.create_alert(timedelta(days=3), frequency='weekly')
+        JobAlert.objects.filter(pk=not_due.pk).update(last_sent=self.now - timedelta(days=3))
+
+        self.assertEqual(plan_digests(now=self.now), (1, 1))
+        digest = JobAlertDigest.objects.get()
+        self.assertEqual(digest.matches, {str(due.pk): [job.pk]})
+        self.assertEqual(JobAlert.objects.get(pk=due.pk).last_sent, self.now - ALERT_COMMIT_GRACE)
+        self.assertEqual(JobAlert.objects.get(pk=not_due.pk).last_sent, self.now - timedelta(days=3))
+        # The same jobs are never planned twice
+        self.assertEqual(plan_digests(now=self.now + timedelta(minutes=1)), (0, 0))
@@ -0,0 +1,306 @@
+"""
+Endpoint benchmark and regression suite.
+
+Seeds a fixed dataset, then requests every endpoint in ``jobs/urls.py``
+``BENCHMARK_ITERATIONS`` times (the first request after clearing the cache,
+the rest warm) and records SQL query counts and latency percentiles. A test
+fails when an endpoint
+
+* answers with an unexpected status,
+* runs more queries than its declared ``budget`` on any request, or
+* runs more queries than recorded in ``benchmarks/endpoint_baseline.json``.
+
+Query budgets are exact counts for the seeded dataset and do not grow with the
+number of rows on a page, so an N+1 in a serializer fails immediately.
+
+Latencies depend on the machine, so they are only checked with
+``BENCHMARK_CHECK_LATENCY=1``: then a p50 above ``baseline *
+BENCHMARK_LATENCY_TOLERANCE + BENCHMARK_LATENCY_SLACK_MS`` fails as well.
+Regenerate the baseline where the suite runs:
+
+    BENCHMARK_UPDATE_BASELINE=1 python manage.py test jobs.tests.test_benchmarks
+
+The suite needs PostgreSQL with ``pg_trgm`` (search suggestions) and Redis at
+``BENCHMARK_REDIS_URL`` (``job-analytics`` answers 503 without it).
+
+Set ``BENCHMARK_REPORT=path.json`` to also write the measurements to a file.
+"""
+import json
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .. import tracking, urls
+from ..models import Application, Category, Company, Job, JobType
+from .base import PASSWORD, isolated_services
+
+
+BASELINE_PATH = Path(settings.BASE_DIR) / 'benchmarks' / 'endpoint_baseline.json'
+ITERATIONS = int(os.environ.get('BENCHMARK_ITERATIONS', 15))
+CHECK_LATENCY = bool(os.environ.get('BENCHMARK_CHECK_LATENCY'))
+LATENCY_TOLERANCE = float(os.environ.get('BENCHMARK_LATENCY_TOLERANCE', 3.0))
+LATENCY_SLACK_MS = float(os.environ.get('BENCHMARK_LATENCY_SLACK_MS', 20.0))
+
+
+@dataclass
+class Endpoint:
+    """One benchmarked request; ``url_kwargs``, ``params`` and ``data`` are callables of (fixtures, iteration)"""
+    key: str
+    url_name: str
+    budget: int
+    method: str = 'get'
+    user: str = None
+    url_kwargs: object = None
+    params: object = None
+    data: object = None
+    content_type: str = 'application/json'
+    status: int = 200
+    headers: dict = field(default_factory=dict)
+    iterations: int = ITERATIONS
+
+
+ENDPOINTS = [
+    # Password hashing dominates logins, so a few requests are enough
+    Endpoint('token_obtain_pair', 'token_obtain_pair', budget=2, method='post', iterations=3,
+             data=lambda f, i: {'username': 'applicant', 'password': PASSWORD}),
+    Endpoint('token_refresh', 'token_refresh', budget=0, method='post',
+             data=lambda f, i: {'refresh': str(RefreshToken.for_user(f.applicant))}),
+    Endpoint('category-list', 'category-list', budget=2),
+    Endpoint('category-list:create', 'category-list', budget=3, method='post', user='staff', status=201,
+             data=lambda f, i: {'name': f'Benchmark Category {i}'}),
+    Endpoint('category-detail', 'category-detail', budget=1,
+             url_kwargs=lambda f, i: {'pk': f.categories[0].pk}),
+    Endpoint('company-list', 'company-list', budget=2),
+    Endpoint('company-detail', 'company-detail', budget=1,
+             url_kwargs=lambda f, i: {'pk': f.companies[0].pk}),
+    Endpoint('job-type-list', 'job-type-list', budget=2),
+    Endpoint('job-type-detail', 'job-type-detail', budget=1,
+             url_kwargs=lambda f, i: {'pk': f.job_types[0].pk}),
+    Endpoint('tag-list', 'tag-list', budget=2),
+    Endpoint('job-list', 'job-list', budget=5),
+    Endpoint('job-list:search', 'job-list', budget=5,
+             params=lambda f, i: {'search': 'python developer'}),
+    Endpoint('job-list:filters-facets', 'job-list', budget=6,
+             params=lambda f, i: {'is_remote': 'true', 'salary_min': 50000, 'facets': 'category,job_type,is_remote'}),
+    Endpoint('job-list:cursor', 'job-list', budget=4, params=lambda f, i: {'cursor': ''}),
+    Endpoint('job-list:authenticated', 'job-list', budget=6, user='applicant'),
+    Endpoint('job-create', 'job-create', budget=14, method='post', user='owner', status=201,
+             data=lambda f, i: job_payload(f, f'Benchmark Engineer {i}')),
+    Endpoint('job-bulk-create', 'job-bulk-create', budget=19, method='post', user='owner', status=201,
+             data=lambda f, i: [job_payload(f, f'Bulk Engineer {i}') for _ in range(25)]),
+    Endpoint('job-detail', 'job-detail', budget=5,
+             url_kwargs=lambda f, i: {'slug': f.jobs[0].slug}),
+    Endpoint('job-analytics', 'job-analytics', budget=3, user='owner',
+             url_kwargs=lambda f, i: {'slug': f.jobs[0].slug}),
+    Endpoint('application-list', 'application-list', budget=6, user='applicant'),
+    Endpoint('application-list:create', 'application-list', budget=10, method='post', user='staff', status=201,
+             data=lambda f, i: {'job_id': f.jobs[i].pk, 'cover_letter': 'Benchmark', 'email': 'staff@example.com'}),
+    Endpoint('job-export', 'job-export', budget=2, user='staff', params=lambda f, i: {'format': 'csv'}),
+    Endpoint('application-export', 'application-export', budget=2, user='staff'),
+    # Three sources, each in a savepoint with two set_config calls
+    Endpoint('search-suggest', 'search-suggest', budget=15, params=lambda f, i: {'q': 'pyth'}),
+    Endpoint('job-statistics', 'job-statistics', budget=4),
+    Endpoint('job-list-async', 'job-list-async', budget=5),
+    Endpoint('job-detail-async', 'job-detail-async', budget=4,
+             url_kwargs=lambda f, i: {'slug': f.jobs[0].slug}),
+    Endpoint('job-statistics-async', 'job-statistics-async', budget=4),
+]
+
+
+def job_payload(fixtures, title):
+    return {
+        'title': title,
+        'description': 'Build and run services.',
+        'requirements': 'Python',
+        'responsibilities': 'Ship features',
+        'company': fixtures.companies[0].pk,
+        'category': fixtures.categories[0].pk,
+        'job_type': fixtures.job_types[0].pk,
+        'location': 'Remote',
+        'is_remote': True,
+        'experience_level': 'mid',
+        'status': 'active',
+        'tags': 'python, django',
+    }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def load_baseline():
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+# Budgets count the queries on the primary connection, so no replicas
+@isolated_services
+class EndpointBenchmarkTests(TestCase):
+    """Query budgets and latency regressions for every endpoint in jobs/urls.py"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        tracking._client = None
+
+    @classmethod
+    def tearDownClass(cls):
+        tracking._client = None
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(2024)
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', PASSWORD)
+        cls.applicant = User.objects.create_user('applicant', 'applicant@example.com', PASSWORD)
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', PASSWORD, is_staff=True)
+        others = [User.objects.create_user(f'user{n}', f'user{n}@example.com', PASSWORD) for n in range(10)]
+
+        cls.categories = [Category.objects.create(name=name) for name in (
+            'Software Development', 'Data Science', 'Design', 'Marketing', 'Sales',
+        )]
+        cls.job_types = [JobType.objects.create(name=name) for name in (
+            'Full-time', 'Part-time', 'Contract', 'Internship',
+        )]
+        cls.companies = [
+            Company.objects.create(name=f'Company {n}', industry=rng.choice(['Technology', 'Finance']))
+            for n in range(10)
+        ]
+
+        titles = ['Python Developer', 'Data Engineer', 'Frontend Developer', 'Product Designer', 'Sales Lead']
+        tags = ['python', 'django', 'react', 'sql', 'figma', 'aws']
+        cls.jobs = []
+        for n in range(60):
+            cls.jobs.append(Job.objects.create(
+                title=f'{rng.choice(titles)} {n}',
+                description='Work on an interesting product with a great team.',
+                requirements='Relevant experience',
+                responsibilities='Deliver',
+                company=rng.choice(cls.companies),
+                category=rng.choice(cls.categories),
+                job_type=rng.choice(cls.job_types),
+                posted_by=cls.owner,
+                location=rng.choice(['Remote', 'Addis Ababa', 'New York, NY']),
+                is_remote=rng.random() < 0.5,
+                salary_min=Decimal(rng.randrange(30000, 90000, 1000)),
+                salary_max=Decimal(rng.randrange(90000, 150000, 1000)),
+                experience_level=rng.choice(['entry', 'mid', 'senior']),
+                status='active' if n < 50 else 'closed',
+                expires_at=timezone.now() + timedelta(days=30),
+                tags=', '.join(rng.sample(tags, 3)),
+            ))
+
+        for job in cls.jobs[30:55]:
+            Application.objects.create(job=job, applicant=cls.applicant, cover_letter='Hello')
+        for job in cls.jobs[:20]:
+            for user in rng.sample(others, 3):
+                Application.objects.create(job=job, applicant=user, cover_letter='Hello')
+
+    def auth_headers(self, user):
+        if user is None:
+            return {}
+        token = RefreshToken.for_user(getattr(self, user)).access_token
+        return {'Authorization': f'Bearer {token}'}
+
+    def request(self, endpoint, iteration):
+        kwargs = endpoint.url_kwargs(self, iteration) if endpoint.url_kwargs else None
+        path = reverse(endpoint.url_name, kwargs=kwargs)
+        headers = {**self.auth_headers(endpoint.user), **endpoint.headers}
+        if endpoint.method == 'get':
+            params = endpoint.params(self, iteration) if endpoint.params else {}
+            return self.client.get(path, params, headers=headers)
+        data = endpoint.data(self, iteration)
+        return self.client.generic(
+            endpoint.method.upper(), path, json.dumps(data), endpoint.content_type, headers=headers
+        )
+
+    def measure(self, endpoint):
+        queries, latencies = [], []
+        cache.clear()
+        for iteration in range(endpoint.iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = self.request(endpoint, iteration)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+                latencies.append((time.perf_counter() - started) * 1000)
+            self.assertEqual(
+                response.status_code, endpoint.status,
+                f'{endpoint.key}: unexpected status, body: {getattr(response, "content", b"")[:300]!r}',
+            )
+            queries.append(len(captured))
+        return {
+            'queries': max(queries),
+            'warm_queries': min(queries),
+            'p50_ms': round(percentile(latencies, 0.50), 2),
+            'p95_ms': round(percentile(latencies, 0.95), 2),
+            'max_ms': round(max(latencies), 2),
+            'budget': endpoint.budget,
+        }
+
+    def test_every_endpoint_is_benchmarked(self):
+        names = {pattern.name for pattern in urls.urlpatterns if isinstance(pattern, URLPattern) and pattern.name}
+        missing = names - {endpoint.url_name for endpoint in ENDPOINTS}
+        self.assertFalse(missing, f'Endpoints without a benchmark and query budget: {sorted(missing)}')
+
+    def test_endpoint_budgets_and_baseline(self):
+        baseline = load_baseline()
+        results = {}
+        for endpoint in ENDPOINTS:
+            with self.subTest(endpoint=endpoint.key):
+                result = results[endpoint.key] = self.measure(endpoint)
+                self.assertLessEqual(
+                    result['queries'], endpoint.budget,
+                    f'{endpoint.key} ran {result["queries"]} queries, budget is {endpoint.budget}',
+                )
+
+                expected = baseline.get(endpoint.key)
+                if not expected or os.environ.get('BENCHMARK_UPDATE_BASELINE'):
+                    continue
+                self.assertLessEqual(
+                    result['queries'], expected['queries'],
+                    f'{endpoint.key} ran {result["queries"]} queries, baseline is {expected["queries"]}',
+                )
+                if CHECK_LATENCY:
+                    limit = expected['p50_ms'] * LATENCY_TOLERANCE + LATENCY_SLACK_MS
+                    self.assertLessEqual(
+                        result['p50_ms'], limit,
+                        f'{endpoint.key} p50 is {result["p50_ms"]} ms, baseline {expected["p50_ms"]} ms '
+                        f'(limit {limit:.1f} ms)',
+                    )
+
+        self.report(results, baseline)
+        if os.environ.get('BENCHMARK_UPDATE_BASELINE'):
+            BASELINE_PATH.write_text(json.dumps(
+                {key: {'queries': result['queries'], 'p50_ms': result['p50_ms']} for key, result in results.items()},
+                indent=2, sort_keys=True,
+            ) + '\n')
+        if os.environ.get('BENCHMARK_REPORT'):
+            Path(os.environ['BENCHMARK_REPORT']).write_text(json.dumps(results, indent=2) + '\n')
+
+    def report(self, results, baseline):
+        lines = [f'\n{"endpoint":<28} {"queries":>7} {"budget":>6} {"base":>5} {"p50 ms":>8} {"p95 ms":>8} {"max ms":>8}']
+        for key, result in results.items():
+            lines.append(
+                f'{key:<28} {result["queries"]:>7} {result["budget"]:>6} '
+                f'{baseline.get(key, {}).get("queries", "-"):>5} '
+                f'{result["p50_ms"]:>8} {result["p95_ms"]:>8} {result["max_ms"]:>8}'
+            )
+        sys.stderr.write('\n'.join(lines) + '\n')
@@ -0,0 +1,71 @@
+from django.test import TestCase
+
+from ..bulk import bulk_insert, create_jobs, insert_jobs
+from ..models import Category, Company, Job, JobType
+from .base import create_job, create_user, isolated_services
+
+
+@isolated_services
+class BulkCreateTests(TestCase):
+    """Per-item results and unique slugs of jobs.bulk"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner')
+        cls.company = Company.objects.create(name='Acme')
+        cls.category = Category.objects.create(name='Software Development')
+        cls.job_type = JobType.objects.create(name='Full-time')
+
+    def item(self, title='Python Developer', **fields):
+        return {
+            'title': title, 'description': 'Build things', 'requirements': 'Python',
+            'responsibilities': 'Ship', 'company': self.company.pk, 'category': self.category.pk,
+            'job_type': self.job_type.pk, 'location': 'Remote', 'experience_level': 'mid', 'status': 'active',
+            **fields,
+        }
+
+    def job(self, company_id, slug=''):
+        return Job(
+            title='Python Developer', description='Build things', requirements='Python',
+            responsibilities='Ship', company_id=company_id, category=self.category,
+            job_type=self.job_type, posted_by=self.owner, location='Remote', status='active', slug=slug,
+        )
+
+    def test_invalid_items_do_not_abort_the_batch(self):
+        create_job(title='Python Developer')
+        items = [
+            self.item(), 'not an object', self.item(title=''), self.item(),
+            self.item(company=999999), self.item(),
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            results = create_jobs(items, self.owner, chunk_size=4)
+
+        self.assertEqual(
+            [(result['index'], result['status']) for result in results],
+            [(0, 'created'), (1, 'error'), (2, 'error'), (3, 'created'), (4, 'error'), (5, 'created')],
+        )
+        self.assertIn('company', results[4]['errors'])
+        self.assertEqual(
+            [result['slug'] for result in results if result['status'] == 'created'],
+            ['python-developer-acme-2', 'python-developer-acme-3', 'python-developer-acme-4'],
+        )
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.active_jobs_count, 4)
+
+    def test_slug_taken_concurrently_is_picked_again(self):
+        create_job(title='Python Developer')
+        job = self.job(self.company.pk, slug='python-developer-acme')
+        bulk_insert([job], {self.company.pk: self.company.name})
+        self.assertEqual(job.slug, 'python-developer-acme-2')
+        self.assertIsNotNone(job.pk)
+
+    def test_other_integrity_errors_are_reported_per_job(self):
+        jobs = [self.job(self.company.pk), self.job(999999), self.job(self.company.pk)]
+        with self.captureOnCommitCallbacks(execute=True):
+            failed = insert_jobs(jobs, {self.company.pk: self.company.name, 999999: 'Gone'})
+
+        self.assertEqual(list(failed), [1])
+        self.assertIsNone(jobs[1].pk)
+        self.assertTrue(all(Job.objects.filter(pk=job.pk).exists() for job in (jobs[0], jobs[2])))
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.active_jobs_count, 2)
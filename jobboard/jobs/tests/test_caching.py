@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from ..caching import cache_job_detail, get_cached_job_detail, get_jobs_generation
+from .base import create_job, isolated_services
+
+
+@isolated_services
+class CacheInvalidationTests(TestCase):
+    """Job writes invalidate the shared caches only once they are committed"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.job = create_job()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_detail_dropped_after_commit(self):
+        cache_job_detail(self.job, {'id': self.job.pk, 'title': self.job.title})
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.job.title = 'Senior Python Developer'
+            self.job.save()
+            # A request racing the transaction still sees the old row, so must the cache
+            self.assertIsNotNone(get_cached_job_detail(self.job.slug))
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(get_cached_job_detail(self.job.slug))
+
+    def test_generation_bumped_after_commit(self):
+        generation = get_jobs_generation()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.job.title = 'Senior Python Developer'
+            self.job.save()
+            self.job.company.save()
+            # Pages rendered before the commit must not be cached under a new generation
+            self.assertEqual(get_jobs_generation(), generation)
+        for callback in callbacks:
+            callback()
+        self.assertGreater(get_jobs_generation(), generation)
+
+    def test_company_edit_drops_details_after_commit(self):
+        cache_job_detail(self.job, {'id': self.job.pk, 'title': self.job.title})
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.job.company.name = 'Renamed'
+            self.job.company.save()
+            self.assertIsNotNone(get_cached_job_detail(self.job.slug))
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(get_cached_job_detail(self.job.slug))
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from ..caching import cache_job_detail, get_cached_job_detail, get_jobs_generation
+from ..expiry import close_expired_jobs, expired_jobs
+from ..models import Job
+from .base import create_job, isolated_services
+
+
+@isolated_services
+class ExpiryTests(TransactionTestCase):
+    """close_expired_jobs on committed rows, so a second connection can hold locks"""
+
+    def setUp(self):
+        cache.clear()
+        self.jobs = [create_job(expires_at=timezone.now() + timedelta(days=1)) for _ in range(6)]
+        self.company = self.jobs[0].company
+        # Expire all but the last one
+        Job.objects.filter(pk__in=[job.pk for job in self.jobs[:5]]).update(
+            expires_at=timezone.now() - timedelta(hours=1)
+        )
+
+    def test_closes_expired_jobs_and_updates_counters_and_caches(self):
+        cache_job_detail(self.jobs[0], {'id': self.jobs[0].pk})
+        generation = get_jobs_generation()
+
+        self.assertEqual(close_expired_jobs(batch_size=2), 5)
+
+        self.assertEqual(
+            list(Job.objects.order_by('pk').values_list('status', flat=True)),
+            ['closed'] * 5 + ['active'],
+        )
+        self.company.refresh_from_db()
+        self.assertEqual(self.company.active_jobs_count, 1)
+        self.assertIsNone(get_cached_job_detail(self.jobs[0].slug))
+        self.assertGreater(get_jobs_generation(), generation)
+
+    def test_limit(self):
+        self.assertEqual(close_expired_jobs(batch_size=2, limit=3), 3)
+        self.assertEqual(expired_jobs().count(), 2)
+
+    def test_rows_locked_by_a_save_are_skipped(self):
+        other = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            other.set_autocommit(False)
+            with other.cursor() as cursor:
+                cursor.execute('SELECT id FROM jobs_job WHERE id = %s FOR UPDATE', [self.jobs[0].pk])
+            self.assertEqual(close_expired_jobs(batch_size=2), 4)
+            self.assertEqual(list(expired_jobs().values_list('pk', flat=True)), [self.jobs[0].pk])
+        finally:
+            other.rollback()
+            other.close()
+        self.assertEqual(close_expired_jobs(), 1)
@@ -0,0 +1,85 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..models import Category, Company, JobType
+from ..refdata import COUNT_LOG_KEY, ReferenceDataCache, reference_data
+from .base import create_job, create_user, isolated_services
+
+
+@isolated_services
+class ReferenceDataCountTests(TestCase):
+    """Job writes refresh only the moved counts of the reference data cache"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_user('owner')
+        cls.companies = [Company.objects.create(name=f'Company {n}') for n in range(3)]
+        Category.objects.create(name='Software Development')
+        JobType.objects.create(name='Full-time')
+
+    def setUp(self):
+        cache.clear()
+        self.cache = ReferenceDataCache()
+        reference_data.clear()
+
+    def tearDown(self):
+        reference_data.clear()
+
+    def commit_job(self, company):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_job(company=company)
+
+    def test_job_write_refreshes_only_changed_counts(self):
+        self.cache.snapshot()
+        version = cache.get('refdata_version:company')
+        ref_key = f'job_detail_ref:company:{self.companies[1].pk}'
+        cache.set(ref_key, 1, None)
+
+        self.commit_job(self.companies[1])
+        with CaptureQueriesContext(connection) as captured:
+            tables = self.cache.snapshot()
+
+        self.assertEqual(tables['company'][self.companies[1].pk]['jobs_count'], 1)
+        self.assertEqual(tables['company'][self.companies[0].pk]['jobs_count'], 0)
+        self.assertEqual(cache.get('refdata_version:company'), version)
+        self.assertEqual(cache.get(ref_key), 1)
+        # Only the counts of the logged rows, one query per table
+        self.assertEqual(len(captured), 3)
+        self.assertIn('active_jobs_count', captured[0]['sql'])
+        self.assertIn('IN', captured[0]['sql'])
+
+    def test_missing_log_rereads_counts_column(self):
+        self.cache.snapshot()
+        self.commit_job(self.companies[2])
+        cache.delete(COUNT_LOG_KEY.format(name='company', seq=cache.get('refdata_counts:company')))
+
+        tables = self.cache.snapshot()
+        self.assertEqual(tables['company'][self.companies[2].pk]['jobs_count'], 1)
+
+    async def test_async_views_fetch_rows_newer_than_snapshot(self):
+        await sync_to_async(self.commit_job)(self.companies[0])
+        await sync_to_async(reference_data.snapshot)()
+        company = await Company.objects.acreate(name='Newcomer')
+        job = await sync_to_async(self.commit_job)(company)
+        # As if another worker had not seen the version bump yet
+        await sync_to_async(reference_data.snapshot)()
+        reference_data._tables['company'][2].pop(company.pk, None)
+
+        response = await self.async_client.get(reverse('job-detail-async', kwargs={'slug': job.slug}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['company']['name'], 'Newcomer')
+        response = await self.async_client.get(reverse('job-list-async'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Newcomer', [row['company']['name'] for row in response.json()['results']])
+
+    def test_company_edit_reloads_table(self):
+        self.cache.snapshot()
+        company = self.companies[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            company.name = 'Renamed'
+            company.save()
+        self.assertEqual(self.cache.snapshot()['company'][company.pk]['name'], 'Renamed')
@@ -0,0 +1,107 @@
+import time
+
+from django.core.cache import cache
+from django.db import connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from ..caching import JOBS_MODIFIED_KEY
+from ..routers import choose_read_alias, pin_to_primary
+from .base import BENCHMARK_REDIS_URL
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'routing'}},
+    DATABASE_REPLICAS=['replica_1'],
+    PRIMARY_STICKINESS_SECONDS=5,
+)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Read alias decisions of jobs.routers"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.token = {'HTTP_AUTHORIZATION': 'Bearer token'}
+
+    def decide(self, method='get', path=None, **extra):
+        request = getattr(self.factory, method)(path or reverse('job-list'), **extra)
+        return choose_read_alias(request)
+
+    def test_reads_of_job_views_go_to_a_replica(self):
+        self.assertEqual(self.decide(**self.token), ('replica_1', 'replica'))
+
+    def test_writes_and_other_views_stay_on_the_primary(self):
+        self.assertEqual(self.decide('post'), ('default', 'write'))
+        self.assertEqual(self.decide(path=reverse('metrics')), ('default', 'other-view'))
+        self.assertEqual(self.decide(path='/admin/'), ('default', 'other-view'))
+
+    def test_recent_write_keeps_everyone_on_the_primary(self):
+        cache.set(JOBS_MODIFIED_KEY, time.time() - 1)
+        self.assertEqual(self.decide(), ('default', 'recent-write'))
+        cache.set(JOBS_MODIFIED_KEY, time.time() - 10)
+        self.assertEqual(self.decide(), ('replica_1', 'replica'))
+
+    def test_client_is_pinned_only_after_a_successful_write(self):
+        pin = lambda method, status: pin_to_primary(
+            getattr(self.factory, method)(reverse('job-create'), **self.token), HttpResponse(status=status)
+        )
+        pin('get', 200)
+        pin('post', 400)
+        self.assertEqual(self.decide(**self.token), ('replica_1', 'replica'))
+
+        pin('post', 201)
+        self.assertEqual(self.decide(**self.token), ('default', 'sticky'))
+        # Other clients are not affected
+        self.assertEqual(self.decide(HTTP_AUTHORIZATION='Bearer other'), ('replica_1', 'replica'))
+
+    def test_anonymous_writes_are_not_pinned(self):
+        pin_to_primary(self.factory.post(reverse('job-create')), HttpResponse(status=201))
+        self.assertEqual(self.decide(), ('replica_1', 'replica'))
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:1/0',
+    }})
+    def test_unreachable_cache_stays_on_the_primary(self):
+        self.assertEqual(self.decide(), ('default', 'cache-unavailable'))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'routing'}},
+    JOB_VIEW_BUFFER_URL=BENCHMARK_REDIS_URL,
+    DATABASE_REPLICAS=['replica_1'],
+)
+class ReplicaQueryTests(TestCase):
+    """Reads of a routed request, including their session settings, run on the replica"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # A second connection to the test database stands in for the replica; it
+        # is outside the test transaction, so it only sees committed rows
+        connections.settings['replica_1'] = connections.settings['default'].copy()
+        # Not declared on the class: the runner checks declared aliases before this exists
+        cls.databases = {*cls.databases, 'replica_1'}
+
+    @classmethod
+    def tearDownClass(cls):
+        del cls.databases
+        connections['replica_1'].close()
+        del connections['replica_1']
+        del connections.settings['replica_1']
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def test_search_suggest_runs_on_the_replica(self):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica_1']) as replica:
+            response = self.client.get(reverse('search-suggest'), {'q': 'pyth'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(primary), 0, [query['sql'] for query in primary])
+        sql = [query['sql'] for query in replica]
+        self.assertEqual(sum('statement_timeout' in query for query in sql), 3)
+        self.assertTrue(any('jobs_job' in query for query in sql))
@@ -0,0 +1,84 @@
+import json
+
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .. import tracking
+from ..views import JobDetailView
+from .base import create_job, create_user, isolated_services
+
+
+@isolated_services
+class JobViewBufferTests(TestCase):
+    """Invalid client IPs and malformed events never stall the view buffer"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('owner')
+        cls.job = create_job(posted_by=cls.owner)
+
+    def setUp(self):
+        tracking._client = None
+        self.clear_redis()
+
+    def tearDown(self):
+        self.clear_redis()
+        tracking._client = None
+
+    def clear_redis(self):
+        client = tracking.get_redis()
+        client.delete(tracking.BUFFER_KEY, tracking.DEAD_LETTER_KEY, *client.keys('job_viewers:*'))
+
+    def test_forwarded_garbage_falls_back_to_remote_addr(self):
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='unknown, 10.0.0.1', REMOTE_ADDR='192.0.2.7')
+        self.assertEqual(JobDetailView().get_client_ip(request), '192.0.2.7')
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR=' 2001:db8::1 , 10.0.0.1')
+        self.assertEqual(JobDetailView().get_client_ip(request), '2001:db8::1')
+
+    def test_invalid_ip_is_not_buffered(self):
+        tracking.buffer_job_view(self.job.pk, None, 'not-an-ip')
+        tracking.buffer_job_view(self.job.pk, None, 'fe80::1%eth0')
+        self.assertEqual(tracking.buffered_view_count(), 0)
+
+    def test_flush_dead_letters_bad_events(self):
+        client = tracking.get_redis()
+        tracking.buffer_job_view(self.job.pk, None, '192.0.2.1')
+        bad = [
+            b'not json',
+            json.dumps({'job': self.job.pk, 'user': None, 'ip': 'bogus', 'at': timezone.now().isoformat()}),
+            json.dumps({'job': self.job.pk, 'user': 'x', 'ip': '192.0.2.2', 'at': timezone.now().isoformat()}),
+        ]
+        client.rpush(tracking.BUFFER_KEY, *bad)
+
+        self.assertEqual(tracking.flush_job_views(), (4, 1))
+        self.assertEqual(tracking.buffered_view_count(), 0)
+        self.assertEqual(client.llen(tracking.DEAD_LETTER_KEY), 3)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views_count, 1)
+
+    def test_views_count_counts_distinct_viewers(self):
+        for ip in ('192.0.2.1', '192.0.2.1', '192.0.2.2', '192.0.2.1'):
+            tracking.buffer_job_view(self.job.pk, None, ip)
+        tracking.buffer_job_view(self.job.pk, self.owner, '192.0.2.1')
+        self.assertEqual(tracking.flush_job_views(), (5, 5))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views_count, 3)
+
+        # Refreshes in a later batch are not counted again
+        tracking.buffer_job_view(self.job.pk, None, '192.0.2.2')
+        tracking.flush_job_views()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.views_count, 3)
+
+    def test_analytics_without_redis(self):
+        tracking._client = None
+        token = RefreshToken.for_user(self.owner).access_token
+        with override_settings(JOB_VIEW_BUFFER_URL='redis://127.0.0.1:1/0'):
+            response = self.client.get(
+                reverse('job-analytics', kwargs={'slug': self.job.slug}),
+                headers={'Authorization': f'Bearer {token}'},
+            )
+        tracking._client = None
+        self.assertEqual(response.status_code, 503)
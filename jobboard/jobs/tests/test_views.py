@@ -0,0 +1,19 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .base import create_job, isolated_services
+
+
+@isolated_services
+class JobDetailViewTests(TestCase):
+    """Payload of the job detail endpoint"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_tags_keep_order_and_case(self):
+        job = create_job(tags='Django, AWS ,python')
+        response = self.client.get(reverse('job-detail', kwargs={'slug': job.slug}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tags_list'], ['Django', 'AWS', 'python'])
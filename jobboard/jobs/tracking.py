@@ -0,0 +1,277 @@
+"""
+Buffered job view tracking and approximate unique-viewer counting.
+
+``JobDetailView`` only appends a compact event to a Redis list, keeping the
+detail endpoint free of writes and of row locks on popular jobs. The
+``flush_job_views`` management command drains the buffer in batches,
+bulk-inserts ``JobView`` rows and updates ``views_count`` of the batch's jobs
+in a single UPDATE.
+
+Unique viewers are counted with Redis HyperLogLog sketches (~0.8% standard
+error): every view is added to a per-job/per-day sketch and to a per-job
+all-time sketch in the same round trip as the buffer append. Sketches merge
+losslessly, so weekly and monthly numbers are unions of the daily ones and no
+exact (job, ip, user) lookups are needed anywhere. ``views_count`` keeps
+counting distinct viewers rather than page loads: the flusher raises it to the
+all-time sketch count, so refreshes and repeat visits do not move it.
+
+Delivery is at-least-once: events are only trimmed from the buffer after the
+batch has been committed, and a flush lock keeps a single flusher active.
+Events without a valid IP address are not buffered; any event the flusher
+cannot decode or store is moved to a capped dead-letter list instead of
+blocking the buffer.
+"""
+import asyncio
+import ipaddress
+import json
+import logging
+import weakref
+from datetime import timedelta
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from . import counters
+from .metrics import JOB_VIEWS_TRACKED
+from .models import Job, JobView
+
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = 'job_views:buffer'
+FLUSH_LOCK_KEY = 'job_views:flush_lock'
+DEAD_LETTER_KEY = 'job_views:dead_letter'
+
+# Most recent rejected events kept for inspection
+DEAD_LETTER_LIMIT = 10000
+
+_client = None
+# Async connections belong to the event loop that opened them
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def get_redis():
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.JOB_VIEW_BUFFER_URL)
+    return _client
+
+
+def get_async_redis():
+    """Client for the async views (jobs.async_views), one per running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = redis.asyncio.Redis.from_url(settings.JOB_VIEW_BUFFER_URL)
+    return client
+
+
+def clean_ip_address(value):
+    """Normalized IP address for the ``inet`` column, or None if ``value`` is not one"""
+    try:
+        address = ipaddress.ip_address(str(value).strip())
+    except ValueError:
+        return None
+    if getattr(address, 'scope_id', None):
+        # fe80::1%eth0 is valid for Python but not for PostgreSQL
+        return None
+    return str(address)
+
+
+def _viewer_id(user, ip_address):
+    return f'u:{user.pk}' if user else f'ip:{ip_address}'
+
+
+def _day_sketch_key(job_id, day):
+    return f'job_viewers:{job_id}:{day.isoformat()}'
+
+
+def _total_sketch_key(job_id):
+    return f'job_viewers:{job_id}:all'
+
+
+def _queue_view(pipe, job_id, user, ip_address, user_agent):
+    now = timezone.now()
+    event = json.dumps({
+        'job': job_id,
+        'user': user.pk if user else None,
+        'ip': ip_address,
+        'ua': (user_agent or '')[:512],
+        'at': now.isoformat(),
+    }, separators=(',', ':'))
+    viewer = _viewer_id(user, ip_address)
+    day_key = _day_sketch_key(job_id, now.date())
+    pipe.rpush(BUFFER_KEY, event)
+    pipe.pfadd(day_key, viewer)
+    pipe.expire(day_key, timedelta(days=settings.JOB_VIEWER_SKETCH_RETENTION_DAYS))
+    pipe.pfadd(_total_sketch_key(job_id), viewer)
+
+
+def buffer_job_view(job_id, user, ip_address, user_agent=''):
+    """Queue a job view for the flusher and count its viewer; never raises into the request"""
+    ip_address = clean_ip_address(ip_address)
+    if ip_address is None:
+        logger.debug('Not tracking view of job %s without a valid client IP', job_id)
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        _queue_view(pipe, job_id, user, ip_address, user_agent)
+        pipe.execute()
+        JOB_VIEWS_TRACKED.inc()
+    except redis.RedisError:
+        logger.warning('Could not buffer view of job %s', job_id, exc_info=True)
+
+
+async def abuffer_job_view(job_id, user, ip_address, user_agent=''):
+    """Async ``buffer_job_view``"""
+    ip_address = clean_ip_address(ip_address)
+    if ip_address is None:
+        logger.debug('Not tracking view of job %s without a valid client IP', job_id)
+        return
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        _queue_view(pipe, job_id, user, ip_address, user_agent)
+        await pipe.execute()
+        JOB_VIEWS_TRACKED.inc()
+    except redis.RedisError:
+        logger.warning('Could not buffer view of job %s', job_id, exc_info=True)
+
+
+def buffered_view_count():
+    return get_redis().llen(BUFFER_KEY)
+
+
+def _decode(raw):
+    event = json.loads(raw)
+    user = event['user']
+    ip = clean_ip_address(event['ip'])
+    viewed_at = parse_datetime(event['at'])
+    if (user is not None and not isinstance(user, int)) or ip is None or viewed_at is None:
+        raise ValueError('invalid field')
+    return int(event['job']), user, ip, str(event.get('ua') or ''), viewed_at
+
+
+def _total_viewer_counts(client, job_ids):
+    job_ids = list(job_ids)
+    pipe = client.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.pfcount(_total_sketch_key(job_id))
+    return dict(zip(job_ids, pipe.execute()))
+
+
+def flush_job_views(batch_size=5000):
+    """Move up to ``batch_size`` buffered views into the database; returns (read, stored)"""
+    client = get_redis()
+    raw_events = client.lrange(BUFFER_KEY, 0, batch_size - 1)
+    if not raw_events:
+        return 0, 0
+
+    events, rejected = [], []
+    for raw in raw_events:
+        try:
+            events.append(_decode(raw))
+        except (ValueError, KeyError, TypeError):
+            rejected.append(raw)
+    if rejected:
+        logger.warning('Dead-lettering %d malformed job view events', len(rejected))
+
+    job_ids = {event[0] for event in events}
+    existing_jobs = set(Job.objects.filter(pk__in=job_ids).values_list('pk', flat=True))
+    user_ids = {event[1] for event in events if event[1] is not None}
+    existing_users = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+    # Views of deleted users are kept anonymously, as SET_NULL would have done
+    events = [
+        (job_id, user_id if user_id in existing_users else None, ip, ua, viewed_at)
+        for job_id, user_id, ip, ua, viewed_at in events if job_id in existing_jobs
+    ]
+
+    viewers = _total_viewer_counts(client, {event[0] for event in events})
+    try:
+        with transaction.atomic():
+            JobView.objects.bulk_create([
+                JobView(job_id=job_id, user_id=user_id, ip_address=ip, user_agent=ua, viewed_at=viewed_at)
+                for job_id, user_id, ip, ua, viewed_at in events
+            ], batch_size=1000)
+            counters.raise_counts(Job, 'views_count', viewers)
+    except (DataError, IntegrityError):
+        # Something the checks above missed; set the batch aside rather than retry it forever
+        logger.exception('Dead-lettering a batch of %d job views the database rejected', len(raw_events))
+        rejected, events = raw_events, []
+
+    # Only now drop the processed events; views buffered meanwhile sit past them
+    pipe = client.pipeline()
+    if rejected:
+        pipe.rpush(DEAD_LETTER_KEY, *rejected)
+        pipe.ltrim(DEAD_LETTER_KEY, -DEAD_LETTER_LIMIT, -1)
+    pipe.ltrim(BUFFER_KEY, len(raw_events), -1)
+    pipe.execute()
+    return len(raw_events), len(events)
+
+
+def acquire_flush_lock(timeout):
+    return get_redis().set(FLUSH_LOCK_KEY, '1', nx=True, ex=timeout)
+
+
+def release_flush_lock():
+    get_redis().delete(FLUSH_LOCK_KEY)
+
+
+def unique_viewers(job_id):
+    """Approximate number of distinct viewers of a job since tracking began"""
+    return get_redis().pfcount(_total_sketch_key(job_id))
+
+
+async def aunique_viewers(job_id):
+    """Async ``unique_viewers``; None if Redis is unavailable"""
+    try:
+        return await get_async_redis().pfcount(_total_sketch_key(job_id))
+    except redis.RedisError:
+        return None
+
+
+def unique_viewers_between(job_id, start, end):
+    """Approximate distinct viewers over the inclusive date range, merging daily sketches"""
+    keys = [_day_sketch_key(job_id, start + timedelta(days=offset))
+            for offset in range((end - start).days + 1)]
+    return get_redis().pfcount(*keys) if keys else 0
+
+
+def daily_unique_viewers(job_id, start, end):
+    """List of (date, approximate distinct viewers) for each day of the inclusive range"""
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    pipe = get_redis().pipeline(transaction=False)
+    for day in days:
+        pipe.pfcount(_day_sketch_key(job_id, day))
+    return list(zip(days, pipe.execute()))
+
+
+def unique_viewer_rollups(job_id, start, end):
+    """Daily, weekly (ISO, Monday-based) and monthly distinct viewers over the date range"""
+    daily = daily_unique_viewers(job_id, start, end)
+
+    weeks, months = {}, {}
+    for day, _ in daily:
+        weeks.setdefault(day - timedelta(days=day.weekday()), []).append(day)
+        months.setdefault(day.strftime('%Y-%m'), []).append(day)
+
+    pipe = get_redis().pipeline(transaction=False)
+    for days in list(weeks.values()) + list(months.values()):
+        pipe.pfcount(*[_day_sketch_key(job_id, day) for day in days])
+    counts = pipe.execute()
+
+    return {
+        'daily': [{'date': day, 'unique_viewers': count} for day, count in daily],
+        'weekly': [
+            {'week_start': week, 'unique_viewers': count}
+            for week, count in zip(weeks, counts[:len(weeks)])
+        ],
+        'monthly': [
+            {'month': month, 'unique_viewers': count}
+            for month, count in zip(months, counts[len(weeks):])
+        ],
+    }
@@ -4,7 +4,7 @@ from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
-from . import views
+from . import async_views, views
 
 # Create a router for ViewSets (if any)
 router = DefaultRouter()
@@ -26,14 +26,31 @@ urlpatterns = [
     path('job-types/', views.JobTypeListCreateView.as_view(), name='job-type-list'),
     path('job-types/<int:pk>/', views.JobTypeDetailView.as_view(), name='job-type-detail'),
     
+    # Tag endpoints
+    path('tags/', views.TagListView.as_view(), name='tag-list'),
+    
     # Job endpoints
     path('jobs/', views.JobListView.as_view(), name='job-list'),
     path('jobs/create/', views.JobCreateView.as_view(), name='job-create'),
+    path('jobs/bulk/', views.JobBulkCreateView.as_view(), name='job-bulk-create'),
     path('jobs/<slug:slug>/', views.JobDetailView.as_view(), name='job-detail'),
+    path('jobs/<slug:slug>/analytics/', views.JobAnalyticsView.as_view(), name='job-analytics'),
     
     # Application endpoints
     path('applications/', views.ApplicationListCreateView.as_view(), name='application-list'),
     
+    # Export endpoints (admin only)
+    path('export/jobs/', views.JobExportView.as_view(), name='job-export'),
+    path('export/applications/', views.ApplicationExportView.as_view(), name='application-export'),
+    
+    # Search suggestions endpoint
+    path('suggest/', views.search_suggestions, name='search-suggest'),
+    
     # Statistics endpoint
     path('statistics/', views.job_statistics, name='job-statistics'),
+    
+    # Async variants of the job read endpoints (for ASGI deployments)
+    path('async/jobs/', async_views.job_list, name='job-list-async'),
+    path('async/jobs/<slug:slug>/', async_views.job_detail, name='job-detail-async'),
+    path('async/statistics/', async_views.job_statistics, name='job-statistics-async'),
 ]
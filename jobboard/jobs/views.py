@@ -1,21 +1,48 @@
+import redis
 from rest_framework import generics, status, filters, permissions
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound, ParseError
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Count, Avg
+from django.conf import settings
 from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from datetime import timedelta
+from types import GeneratorType
 
-from .models import Category, Company, JobType, Job, Application, JobView, SavedJob, JobAlert
+from .models import Category, Company, JobType, Tag, Job, Application, JobView, SavedJob, JobAlert
 from .serializers import (
-    CategorySerializer, CompanySerializer, JobTypeSerializer,
-    JobListSerializer, JobDetailSerializer, JobCreateUpdateSerializer,
-    ApplicationSerializer, SavedJobSerializer, JobAlertSerializer
+    CategorySerializer, CompanySerializer, JobTypeSerializer, TagSerializer,
+    JobListSerializer, JobDetailSerializer, JobCreateUpdateSerializer, JobBulkCreateSerializer,
+    ApplicationSerializer, SavedJobSerializer, JobAlertSerializer,
+    JobAnalyticsQuerySerializer, JobExportQuerySerializer, ApplicationExportQuerySerializer
+)
+from .bulk import create_jobs
+from .caching import (
+    VOLATILE_FIELDS, cache_job_detail, get_cached_job_detail, get_jobs_generation,
+    invalidate_job_detail, job_list_cache_key, record_cache_lookup
+)
+from .conditional import JobDetailConditionalMixin, JobsVersionConditionalMixin
+from .exports import EXPORTS, export_rows
+from .facets import FACETS_PARAM, get_facet_counts, parse_facets
+from .filters import JobFilter
+from .pagination import PageNumberOrKeysetPagination
+from .parsers import NDJSONParser
+from .permissions import IsOwnerOrAdmin
+from .renderers import CSVRenderer, NDJSONRenderer
+from .search import RelevanceOrderingFilter
+from .suggest import DEFAULT_LIMIT, MAX_LIMIT, MIN_QUERY_LENGTH, get_suggestions
+from .tracking import (
+    buffer_job_view, clean_ip_address, unique_viewer_rollups, unique_viewers, unique_viewers_between,
 )
 
 
-class CategoryListCreateView(generics.ListCreateAPIView):
+class CategoryListCreateView(JobsVersionConditionalMixin, generics.ListCreateAPIView):
     """List and create job categories"""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -33,7 +60,7 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
 
-class CompanyListCreateView(generics.ListCreateAPIView):
+class CompanyListCreateView(JobsVersionConditionalMixin, generics.ListCreateAPIView):
     """List and create companies"""
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
@@ -51,7 +78,7 @@ class CompanyDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
 
-class JobTypeListCreateView(generics.ListCreateAPIView):
+class JobTypeListCreateView(JobsVersionConditionalMixin, generics.ListCreateAPIView):
     """List and create job types"""
     queryset = JobType.objects.all()
     serializer_class = JobTypeSerializer
@@ -69,68 +96,162 @@ class JobTypeDetailView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
 
-class JobListView(generics.ListAPIView):
+class TagListView(generics.ListAPIView):
+    """List tags with their active job counts"""
+    serializer_class = TagSerializer
+    permission_classes = [permissions.AllowAny]
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['name']
+    ordering_fields = ['name', 'jobs_count']
+    ordering = ['-jobs_count', 'name']
+    
+    def get_queryset(self):
+        return Tag.objects.annotate(
+            jobs_count=Count('job_links', filter=Q(job_links__job__status='active'))
+        )
+
+
+class JobListView(JobsVersionConditionalMixin, generics.ListAPIView):
     """List all active jobs with filtering and search"""
     serializer_class = JobListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
-    search_fields = ['title', 'description', 'company__name', 'location', 'tags']
+    pagination_class = PageNumberOrKeysetPagination
+    filter_backends = [DjangoFilterBackend, RelevanceOrderingFilter]
+    filterset_class = JobFilter
     ordering_fields = ['created_at', 'title', 'salary_min', 'views_count']
     ordering = ['-created_at']
     
     def get_queryset(self):
-        return Job.objects.filter(status='active').select_related(
-            'company', 'category', 'job_type', 'posted_by'
-        ).prefetch_related('applications')
+        # Company, category and job type come from the reference data cache (jobs.refdata)
+        return Job.objects.filter(status='active').select_related('posted_by')
+    
+    def list(self, request, *args, **kwargs):
+        facets = parse_facets(request.query_params.get(FACETS_PARAM))
+        if request.user.is_authenticated:
+            return self.list_uncached(request, facets, *args, **kwargs)
+        
+        # Read the generation before querying: a write racing this request
+        # bumps it, so the page stored below is already unreachable
+        generation = getattr(self, 'jobs_generation', None) or get_jobs_generation()
+        cache_key = job_list_cache_key(request, self.get_cache_defaults(request), generation)
+        data = cache.get(cache_key)
+        record_cache_lookup('job_list', data is not None)
+        if data is not None:
+            return Response(data, headers={'X-Cache': 'HIT'})
+        
+        response = self.list_uncached(request, facets, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(cache_key, response.data, settings.JOB_LIST_CACHE_TTL)
+        response['X-Cache'] = 'MISS'
+        return response
+    
+    def list_uncached(self, request, facets, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        
+        if facets:
+            queryset = self.filter_queryset(self.get_queryset())
+            response.data['facets'] = get_facet_counts(queryset, request.query_params, facets)
+        return response
+    
+    def get_cache_defaults(self, request):
+        """Parameter values implied when the client leaves them out"""
+        defaults = {}
+        if 'cursor' not in request.query_params:
+            defaults['page'] = '1'
+        # Searches default to relevance order, so only plain listings imply the default ordering
+        if not request.query_params.get('search'):
+            defaults['ordering'] = ','.join(self.ordering)
+        return defaults
 
 
-class JobDetailView(generics.RetrieveAPIView):
+class JobDetailView(JobDetailConditionalMixin, generics.RetrieveAPIView):
     """Retrieve a specific job"""
-    queryset = Job.objects.all()
+    queryset = Job.objects.select_related('posted_by')
     serializer_class = JobDetailSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = 'slug'
     
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
+        data = get_cached_job_detail(kwargs[self.lookup_field])
+        record_cache_lookup('job_detail', data is not None)
+        
+        if data is None:
+            instance = self.get_object()
+            data = self.get_serializer(instance).data
+            cache_job_detail(instance, data)
+        else:
+            # Merge the counters that change without invalidating the cached body
+            counters = Job.objects.filter(pk=data['id']).values(*VOLATILE_FIELDS).first()
+            if counters is None:
+                invalidate_job_detail(kwargs[self.lookup_field])
+                raise NotFound()
+            data = {**data, **counters, 'unique_viewers': self.get_unique_viewers(data['id'])}
         
         # Track job view
-        self.track_job_view(instance, request)
+        self.track_job_view(data['id'], request)
         
-        serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        return Response(data)
     
-    def track_job_view(self, job, request):
-        """Track job view for analytics"""
+    def not_modified(self, request, response, *args, **kwargs):
+        # The client still displays the job, so it counts as a view
+        self.track_job_view(self.validated_job_id, request)
+        return response
+    
+    def get_unique_viewers(self, job_id):
+        try:
+            return unique_viewers(job_id)
+        except redis.RedisError:
+            return None
+    
+    def track_job_view(self, job_id, request):
+        """Track job view for analytics (buffered, see jobs.tracking)"""
         ip_address = self.get_client_ip(request)
         user = request.user if request.user.is_authenticated else None
-        
-        # Check if this view is already tracked (avoid duplicate tracking)
-        existing_view = JobView.objects.filter(
-            job=job,
-            ip_address=ip_address,
-            user=user
-        ).first()
-        
-        if not existing_view:
-            JobView.objects.create(
-                job=job,
-                user=user,
-                ip_address=ip_address,
-                user_agent=request.META.get('HTTP_USER_AGENT', '')
-            )
-            # Update job views count
-            job.views_count += 1
-            job.save(update_fields=['views_count'])
+        buffer_job_view(job_id, user, ip_address, request.META.get('HTTP_USER_AGENT', ''))
     
     def get_client_ip(self, request):
-        """Get client IP address"""
+        """Get client IP address, ignoring a forwarded value that is not an IP address"""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        ip = clean_ip_address(x_forwarded_for.split(',')[0]) if x_forwarded_for else None
+        return ip or request.META.get('REMOTE_ADDR')
+
+
+class JobAnalyticsView(generics.RetrieveAPIView):
+    """Approximate unique-viewer analytics for a job (owner or admin only)"""
+    queryset = Job.objects.all()
+    permission_classes = [permissions.IsAuthenticated, IsOwnerOrAdmin]
+    lookup_field = 'slug'
+    
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        params = JobAnalyticsQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        
+        end = timezone.now().date()
+        start = end - timedelta(days=params.validated_data['days'] - 1)
+        
+        try:
+            total = unique_viewers(job.pk)
+            in_period = unique_viewers_between(job.pk, start, end)
+            rollups = unique_viewer_rollups(job.pk, start, end)
+        except redis.RedisError:
+            # The viewer sketches live only in Redis
+            return Response(
+                {'detail': 'Viewer analytics are temporarily unavailable.'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        
+        return Response({
+            'job': job.pk,
+            'slug': job.slug,
+            'views_count': job.views_count,
+            'applications_count': job.applications_count,
+            'unique_viewers': total,
+            'unique_viewers_in_period': in_period,
+            'start': start,
+            'end': end,
+            **rollups,
+        })
 
 
 class JobCreateView(generics.CreateAPIView):
@@ -142,18 +263,81 @@ class JobCreateView(generics.CreateAPIView):
         serializer.save(posted_by=self.request.user)
 
 
+class JobBulkCreateView(generics.GenericAPIView):
+    """Create many job postings from a JSON array or an NDJSON stream"""
+    serializer_class = JobBulkCreateSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [JSONParser, NDJSONParser]
+    
+    def post(self, request, *args, **kwargs):
+        items = request.data
+        if not isinstance(items, (list, GeneratorType)):
+            raise ParseError('Expected a JSON array of jobs or one JSON object per line.')
+        if isinstance(items, list) and len(items) > settings.JOB_BULK_MAX_ITEMS:
+            raise ParseError(f'Too many items; at most {settings.JOB_BULK_MAX_ITEMS} are accepted per request.')
+        
+        results = create_jobs(
+            items, request.user,
+            chunk_size=settings.JOB_BULK_CHUNK_SIZE, limit=settings.JOB_BULK_MAX_ITEMS,
+        )
+        created = sum(1 for result in results if result['status'] == 'created')
+        failed = len(results) - created
+        if not failed:
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({'created': created, 'failed': failed, 'results': results}, status=response_status)
+
+
+class ExportView(generics.GenericAPIView):
+    """Stream every row of an export as NDJSON (default) or CSV (``?format=csv``)"""
+    permission_classes = [permissions.IsAdminUser]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+    export_name = None
+    
+    def get(self, request, *args, **kwargs):
+        params = self.get_serializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        
+        renderer = request.accepted_renderer
+        rows = export_rows(self.export_name, **params.validated_data)
+        response = StreamingHttpResponse(
+            renderer.stream(EXPORTS[self.export_name].column_names, rows),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{self.export_name}.{renderer.format}"'
+        return response
+
+
+class JobExportView(ExportView):
+    """Export jobs, optionally filtered by status, creation date and company"""
+    serializer_class = JobExportQuerySerializer
+    export_name = 'jobs'
+
+
+class ApplicationExportView(ExportView):
+    """Export applications, optionally filtered by status, application date and company"""
+    serializer_class = ApplicationExportQuerySerializer
+    export_name = 'applications'
+
+
 class ApplicationListCreateView(generics.ListCreateAPIView):
     """List and create job applications"""
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageNumberOrKeysetPagination
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['applied_at', 'status']
     ordering = ['-applied_at']
     
     def get_queryset(self):
+        # The nested job payload renders posted_by, and applicant is rendered for everyone
+        queryset = Application.objects.select_related('job__posted_by', 'applicant')
         if self.request.user.is_staff:
-            return Application.objects.all().select_related('job', 'applicant')
-        return Application.objects.filter(applicant=self.request.user).select_related('job')
+            return queryset
+        return queryset.filter(applicant=self.request.user)
 
 
 @api_view(['GET'])
@@ -173,3 +357,28 @@ def job_statistics(request):
         cache.set(cache_key, stats, 300)  # Cache for 5 minutes
     
     return Response(stats)
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def search_suggestions(request):
+    """Typeahead suggestions for job titles, companies and locations"""
+    query = ' '.join(request.query_params.get('q', '').split())
+    try:
+        limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        limit = DEFAULT_LIMIT
+    
+    if len(query) < MIN_QUERY_LENGTH:
+        return Response({'query': query, 'suggestions': [], 'partial': False})
+    
+    cache_key = f'suggest:{limit}:{query.lower()}'
+    payload = cache.get(cache_key)
+    
+    if payload is None:
+        suggestions, partial = get_suggestions(query, limit)
+        payload = {'query': query, 'suggestions': suggestions, 'partial': partial}
+        if not partial:
+            cache.set(cache_key, payload, getattr(settings, 'SUGGEST_CACHE_TTL', 60))
+    
+    return Response(payload)